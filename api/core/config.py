@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -19,8 +21,40 @@ class Settings(BaseSettings):
     sender_email: str = "noreply@example.com"
 
     traefik_config_path: str = "/data"
+    # Threads used for blocking config file I/O (0 runs it on the event loop)
+    traefik_io_workers: int = 4
+    # "monolithic": one file per protocol, "sharded": one file per entry
+    traefik_config_layout: Literal["monolithic", "sharded"] = "monolithic"
+    # Seconds between publishes of staged edits to Traefik (0 writes directly)
+    traefik_publish_interval: float = 0.0
 
     traefik_api_url: str = "http://localhost:8080"
+    # Comma-separated API URLs of further Traefik replicas, and how many
+    # replicas the fleet endpoints query at once
+    traefik_api_replica_urls: str = ""
+    traefik_fleet_concurrency: int = 8
+    # Shared Traefik API client: timeouts in seconds and connection pool limits
+    traefik_api_connect_timeout: float = 5.0
+    traefik_api_read_timeout: float = 10.0
+    traefik_api_max_connections: int = 20
+    traefik_api_max_keepalive_connections: int = 10
+    # Deadlines of each health probe and of the whole health check, in seconds
+    traefik_status_probe_timeout: float = 2.0
+    traefik_status_timeout: float = 3.0
+    # Consecutive Traefik API failures that open the circuit breaker, and
+    # seconds it stays open before a trial request is let through
+    traefik_api_breaker_threshold: int = 5
+    traefik_api_breaker_cooldown: float = 15.0
+    # Seconds between background polls of the Traefik status lists (0 proxies
+    # every request live), and how long past that a stale snapshot is served
+    # while it is refreshed
+    traefik_snapshot_interval: float = 10.0
+    traefik_snapshot_stale_ttl: float = 30.0
+    # Seconds between keepalives on the /events stream; config files are also
+    # re-checked for external edits at this interval while anyone listens
+    traefik_events_keepalive: float = 15.0
+    # Negotiate HTTP/2 with the Traefik API (needs the `h2` package)
+    traefik_api_http2: bool = False
     tp_panel_url: str = "http://localhost:8000"
 
     model_config = SettingsConfigDict(env_file=".env")
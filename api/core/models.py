@@ -1,7 +1,7 @@
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Literal, Optional, Union
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 
 class Token(BaseModel):
@@ -74,9 +74,12 @@ class TraefikService(BaseModel):
 
 
 class TraefikTLS(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
     certResolver: Optional[str] = None
     passthrough: Optional[bool] = None
     options: Optional[str] = None
+    domains: Optional[List[Dict[str, Any]]] = None
 
 
 class TraefikRouter(BaseModel):
@@ -120,6 +123,120 @@ class TraefikHttpConfig(BaseModel):
     http: Optional[TraefikHttpBlock] = None
 
 
+class TraefikTcpServer(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    address: str
+
+
+class TraefikTcpLoadBalancer(BaseModel):
+    # Keeps proxyProtocol, serversTransport, terminationDelay...
+    model_config = ConfigDict(extra="allow")
+
+    servers: list[TraefikTcpServer]
+
+
+class TraefikTcpService(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    loadBalancer: Optional[TraefikTcpLoadBalancer] = None
+    weighted: Optional[Dict[str, Any]] = None
+
+
+class TraefikTcpRouter(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    entryPoints: Optional[List[str]] = None
+    rule: str
+    service: str
+    middlewares: Optional[List[str]] = None
+    priority: Optional[int] = None
+    tls: Optional[TraefikTLS] = None
+
+
+class TraefikTcpBlock(BaseModel):
+    # Keeps sections the panel does not manage, e.g. serversTransports
+    model_config = ConfigDict(extra="allow")
+
+    routers: Optional[Dict[str, TraefikTcpRouter]] = None
+    services: Optional[Dict[str, TraefikTcpService]] = None
+    middlewares: Optional[Dict[str, Dict[str, Any]]] = None
+
+
+class TraefikTcpConfig(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    tcp: Optional[TraefikTcpBlock] = None
+
+
+class TraefikUdpServer(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    address: str
+
+
+class TraefikUdpLoadBalancer(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    servers: list[TraefikUdpServer]
+
+
+class TraefikUdpService(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    loadBalancer: Optional[TraefikUdpLoadBalancer] = None
+    weighted: Optional[Dict[str, Any]] = None
+
+
+class TraefikUdpRouter(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    entryPoints: Optional[List[str]] = None
+    service: str
+
+
+class TraefikUdpBlock(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    routers: Optional[Dict[str, TraefikUdpRouter]] = None
+    services: Optional[Dict[str, TraefikUdpService]] = None
+
+
+class TraefikUdpConfig(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    udp: Optional[TraefikUdpBlock] = None
+
+
+class TraefikBatchOperation(BaseModel):
+    op: Literal["upsert", "delete"]
+    kind: Literal["router", "service", "middleware"]
+    name: str
+    data: Optional[Dict[str, Any]] = None  # required for upsert
+
+
+class TraefikBatchRequest(BaseModel):
+    operations: List[TraefikBatchOperation]
+
+
+class TraefikSimulationRequest(BaseModel):
+    host: str
+    path: str = "/"
+    method: str = "GET"
+    headers: Dict[str, str] = {}
+    query: Dict[str, str] = {}
+    client_ip: Optional[str] = None
+    entryPoint: Optional[str] = None  # only routers listening on it
+    tls: Optional[bool] = None  # HTTPS (routers with tls) or HTTP request
+    limit: int = Field(5, ge=0, le=100)  # runners-up to return
+
+
+class TraefikListPage(BaseModel):
+    items: List[Dict[str, Any]]  # entries sorted by name, each with its "name"
+    next_cursor: Optional[str] = None  # pass as `cursor` for the next page
+    total: int  # entries matching the filters, across all pages
+
+
 class TraefikACMEConfig(BaseModel):
     email: Optional[EmailStr] = None
     # storage is controlled by backend, not frontend
@@ -0,0 +1,132 @@
+import hashlib
+import os
+from typing import Any, Awaitable, Callable, List, Optional
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Browsers keep the body but revalidate with If-None-Match on every request
+CACHE_CONTROL = "private, no-cache"
+
+# Mixed into version-based tags so a restart (possibly with a different
+# response format) never matches a tag handed out by the previous process
+_PROCESS_SALT = os.urandom(8).hex()
+
+
+def make_etag(*parts: Any) -> str:
+    """Returns a strong ETag hashing `parts`."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else repr(part).encode())
+        digest.update(b"\0")
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against `etag`."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+def versioned_etag(version: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Route dependency that derives the ETag from a cheap config version (e.g.
+    file signatures) instead of the response body. A matching If-None-Match
+    answers 304 before the handler loads or serializes anything.
+    """
+
+    async def check_etag(request: Request, response: Response) -> None:
+        etag = make_etag(
+            _PROCESS_SALT, request.url.path, request.url.query, await version()
+        )
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+            )
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = CACHE_CONTROL
+
+    return Depends(check_etag)
+
+
+class ETagMiddleware:
+    """
+    Adds a content-hash ETag to successful GET responses under `prefix` that
+    did not set one, and turns them into 304 Not Modified when the client
+    already has that version. Only single-chunk bodies are hashed; streamed
+    responses (SSE, chunked JSON) pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, prefix: str = "/") -> None:
+        self.app = app
+        self.prefix = prefix
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not scope["path"].startswith(self.prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = None
+        for key, value in scope["headers"]:
+            if key == b"if-none-match":
+                if_none_match = value.decode("latin-1")
+
+        start: Optional[Message] = None
+        passthrough = False
+
+        async def send_with_etag(message: Message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                names = {key.lower() for key, _ in message.get("headers", [])}
+                if message["status"] != 200 or b"etag" in names:
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message
+                return
+
+            # First body chunk: hash it unless more chunks follow
+            assert start is not None
+            passthrough = True
+            if message.get("more_body", False):
+                await send(start)
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            etag = make_etag(body)
+            headers: List[Any] = [
+                (key, value)
+                for key, value in start.get("headers", [])
+                if key.lower() != b"cache-control"
+            ]
+            headers += [
+                (b"etag", etag.encode()),
+                (b"cache-control", CACHE_CONTROL.encode()),
+            ]
+            if etag_matches(if_none_match, etag):
+                headers = [
+                    (key, value)
+                    for key, value in headers
+                    if key.lower() not in (b"content-length", b"content-type")
+                ]
+                await send({**start, "status": 304, "headers": headers})
+                await send({"type": "http.response.body", "body": b""})
+                return
+            await send({**start, "headers": headers})
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
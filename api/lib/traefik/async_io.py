@@ -0,0 +1,75 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from core.config import settings
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> Optional[ThreadPoolExecutor]:
+    """
+    Returns the bounded thread pool used for config file I/O.
+    Returns None when `traefik_io_workers` is 0 (run inline on the event loop).
+    """
+    global _executor
+    if settings.traefik_io_workers <= 0:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.traefik_io_workers,
+                thread_name_prefix="traefik-io",
+            )
+        return _executor
+
+
+def shutdown_executor() -> None:
+    """Waits for pending file work and releases the thread pool."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Runs a blocking callable on the I/O thread pool and awaits its result."""
+    executor = get_executor()
+    if executor is None:
+        return func(*args, **kwargs)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, functools.partial(func, *args, **kwargs)
+    )
+
+
+class AsyncManager:
+    """
+    Async facade over a synchronous config manager.
+
+    Every public method of the wrapped manager is exposed as a coroutine that
+    runs on the shared I/O thread pool, so YAML parsing and file writes never
+    block the event loop:
+
+        routers = await manager.aio.get_routers()
+    """
+
+    def __init__(self, manager: Any) -> None:
+        self._manager = manager
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        attr = getattr(self._manager, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return await run_blocking(attr, *args, **kwargs)
+
+        return call
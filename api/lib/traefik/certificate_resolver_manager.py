@@ -1,11 +1,16 @@
+import logging
 import os
+import threading
 from pathlib import Path
 from typing import Any, Dict
 
-import yaml
-
 from core.config import settings
 from core.models import TraefikCertResolver
+from lib.traefik import yaml_io
+from lib.traefik.async_io import AsyncManager
+from lib.traefik.config_cache import file_signature
+
+logger = logging.getLogger(__name__)
 
 
 class CertificatesResolversManager:
@@ -26,13 +31,16 @@ class CertificatesResolversManager:
             with open(self.config_resolver_path, "w") as f:
                 f.write("certificatesResolvers: {}\n")
 
+        self._lock = threading.RLock()
+        self.aio = AsyncManager(self)
+
     # -------------------- INTERNAL I/O --------------------
     def _read_resolver_config(self) -> Dict[str, Any]:
         """Reads the YAML resolver config as a plain dict."""
         if not os.path.exists(self.config_resolver_path):
             return {"certificatesResolvers": {}}
         with open(self.config_resolver_path, "r") as f:
-            return yaml.safe_load(f) or {"certificatesResolvers": {}}
+            return yaml_io.load(f) or {"certificatesResolvers": {}}
 
     def _write_resolver_config(
         self, config: Dict[str, Any] | TraefikCertResolver
@@ -44,9 +52,13 @@ class CertificatesResolversManager:
         else:
             data = config
         with open(self.config_resolver_path, "w") as f:
-            yaml.dump(data, f, default_flow_style=False)
+            yaml_io.dump(data, f)
 
     # -------------------- PUBLIC METHODS --------------------
+    def config_version(self) -> Any:
+        """Returns a cheap token that changes whenever the resolver file does."""
+        return file_signature(self.config_resolver_path)
+
     def get_certificate_resolvers(self) -> Dict[str, Dict[str, Any]]:
         """Returns all certificate resolvers."""
         config = self._read_resolver_config()
@@ -59,33 +71,35 @@ class CertificatesResolversManager:
         Update or create a resolver.
         Enforces backend-controlled ACME storage path.
         """
-        config = self._read_resolver_config()
+        with self._lock:
+            config = self._read_resolver_config()
 
-        # Ensure certificatesResolvers section exists
-        if (
-            "certificatesResolvers" not in config
-            or config["certificatesResolvers"] is None
-        ):
-            config["certificatesResolvers"] = {}
+            # Ensure certificatesResolvers section exists
+            if (
+                "certificatesResolvers" not in config
+                or config["certificatesResolvers"] is None
+            ):
+                config["certificatesResolvers"] = {}
 
-        # Ensure ACME storage is backend-controlled
-        if "acme" in resolver_data:
-            resolver_data["acme"]["storage"] = str(
-                self.config_acme_path / f"{name}.json"
-            )
+            # Ensure ACME storage is backend-controlled
+            if "acme" in resolver_data:
+                resolver_data["acme"]["storage"] = str(
+                    self.config_acme_path / f"{name}.json"
+                )
 
-        # Update resolver
-        print(f"Updating resolver {name} with data: {resolver_data}", config)
-        config["certificatesResolvers"][name] = resolver_data
+            # Update resolver
+            logger.debug("Updating resolver %s", name)
+            config["certificatesResolvers"][name] = resolver_data
 
-        self._write_resolver_config(config)
+            self._write_resolver_config(config)
 
     def delete_certificate_resolver(self, name: str) -> bool:
         """Deletes a certificate resolver by name."""
-        config = self._read_resolver_config()
-        resolvers = config.get("certificatesResolvers", {})
-        if name in resolvers:
-            del resolvers[name]
-            self._write_resolver_config(config)
-            return True
-        return False
+        with self._lock:
+            config = self._read_resolver_config()
+            resolvers = config.get("certificatesResolvers", {})
+            if name in resolvers:
+                del resolvers[name]
+                self._write_resolver_config(config)
+                return True
+            return False
@@ -0,0 +1,39 @@
+import logging
+import threading
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (section, name, data): a None `data` means the entry was deleted
+EntryChange = Tuple[str, str, Optional[Any]]
+# Called with (protocol, version before, version after, changes)
+ChangeListener = Callable[[str, Any, Any, Sequence[EntryChange]], None]
+
+
+class ChangeFeed:
+    """
+    Tells in-memory indexes which entries a manager just wrote, so they can
+    update only those instead of re-reading the whole config.
+
+    The versions before and after the write let a listener check that it was
+    in step with the file. If it was not, something else changed the file
+    too, and the listener should fall back to a full re-read.
+    """
+
+    def __init__(self) -> None:
+        self._listeners: List[ChangeListener] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, listener: ChangeListener) -> None:
+        with self._lock:
+            self._listeners.append(listener)
+
+    def emit(
+        self, protocol: str, before: Any, after: Any, changes: Sequence[EntryChange]
+    ) -> None:
+        """Runs every listener in the writing thread; errors are only logged."""
+        for listener in list(self._listeners):
+            try:
+                listener(protocol, before, after, changes)
+            except Exception:
+                logger.exception("Error in config change listener")
@@ -0,0 +1,83 @@
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(httpx.RequestError):
+    """Raised instead of calling an upstream the breaker considers down."""
+
+
+class CircuitBreaker:
+    """
+    Fails fast after `failure_threshold` consecutive failures.
+
+    closed: calls go through; failures are counted.
+    open: calls are rejected until `cooldown` seconds have passed.
+    half-open: a single trial call goes through. Success closes the circuit,
+    failure opens it for another cooldown.
+    """
+
+    def __init__(self, failure_threshold: int, cooldown: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+        # Metrics
+        self.rejected = 0
+        self.times_opened = 0
+
+    def allow(self) -> bool:
+        """Returns whether a call may go upstream now."""
+        if self.state == OPEN:
+            assert self.opened_at is not None
+            if time.monotonic() - self.opened_at < self.cooldown:
+                self.rejected += 1
+                return False
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN:
+            if self._trial_in_flight:
+                self.rejected += 1
+                return False
+            self._trial_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Frees the half-open trial slot of a call that ended without a result."""
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._trial_in_flight = False
+        if self.state == HALF_OPEN or (
+            self.state == CLOSED and self.consecutive_failures >= self.failure_threshold
+        ):
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+            self.times_opened += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the breaker state and counters."""
+        retry_in = None
+        if self.state == OPEN and self.opened_at is not None:
+            retry_in = max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_in": round(retry_in, 2) if retry_in is not None else None,
+            "rejected": self.rejected,
+            "times_opened": self.times_opened,
+        }
@@ -0,0 +1,63 @@
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# (st_mtime_ns, st_size, st_ino) of a config file
+FileSignature = Tuple[int, int, int]
+
+
+def file_signature(path: str | Path) -> Optional[FileSignature]:
+    """Returns the stat signature of a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+class ParsedFileCache:
+    """
+    In-process cache of parsed config files.
+
+    Entries are keyed on the file path and invalidated whenever the file's
+    (st_mtime_ns, st_size, st_ino) signature changes, so repeated reads of an
+    unchanged file are a stat() plus a dict lookup. Cached values are shared
+    between callers and must be treated as read-only.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, Tuple[FileSignature, Any]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: str | Path, loader: Callable[[], Any]) -> Any:
+        """Returns the cached value for `path`, calling `loader` on a miss."""
+        key = str(path)
+        signature = file_signature(path)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and signature is not None and entry[0] == signature:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        value = loader()
+        if signature is not None:
+            with self._lock:
+                self._entries[key] = (signature, value)
+        return value
+
+    def invalidate(self, path: str | Path | None = None) -> None:
+        """Drops the entry for `path`, or every entry when no path is given."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(path), None)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns hit/miss counters and the number of cached files."""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
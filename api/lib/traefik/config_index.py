@@ -0,0 +1,199 @@
+import abc
+import threading
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+from lib.traefik.certificate_resolver_manager import CertificatesResolversManager
+from lib.traefik.changes import ChangeListener, EntryChange
+from lib.traefik.config_cache import file_signature
+from lib.traefik.http_manager import HttpManager
+from lib.traefik.manual_certificates_manager import ManualCertificatesManager
+from lib.traefik.tcp_udp_manager import TcpUdpManager
+
+# (protocol, section), e.g. ("http", "routers") or ("udp", "services")
+Source = Tuple[str, str]
+
+HTTP_SOURCES: Tuple[Source, ...] = (
+    ("http", "routers"),
+    ("http", "services"),
+    ("http", "middlewares"),
+)
+TCP_UDP_SOURCES: Tuple[Source, ...] = (
+    ("tcp", "routers"),
+    ("tcp", "services"),
+    ("udp", "routers"),
+    ("udp", "services"),
+)
+# Certificate resolvers and manually-provided certificates (by domain)
+TLS_SOURCES: Tuple[Source, ...] = (
+    ("tls", "certResolvers"),
+    ("tls", "certificates"),
+)
+
+# Version of a protocol the index has not (or no longer) synced
+_UNSYNCED = object()
+
+
+class ConfigCatalog:
+    """Uniform read access to the entries and versions of every manager."""
+
+    SOURCES = HTTP_SOURCES + TCP_UDP_SOURCES + TLS_SOURCES
+
+    def __init__(
+        self,
+        http_manager: HttpManager,
+        tcp_udp_manager: TcpUdpManager,
+        resolvers_manager: Optional[CertificatesResolversManager] = None,
+        manual_certs_manager: Optional[ManualCertificatesManager] = None,
+    ):
+        self.http_manager = http_manager
+        self.tcp_udp_manager = tcp_udp_manager
+        self.resolvers_manager = resolvers_manager
+        self.manual_certs_manager = manual_certs_manager
+
+    def version(self, protocol: str) -> Any:
+        """Cheap token that changes whenever a protocol's config does."""
+        if protocol == "http":
+            return self.http_manager.config_version()
+        if protocol == "tls":
+            # The manual certificates file is rewritten on every add/remove
+            return (
+                self.resolvers_manager and self.resolvers_manager.config_version(),
+                self.manual_certs_manager
+                and file_signature(self.manual_certs_manager.dynamic_tls_file),
+            )
+        return self.tcp_udp_manager.config_version(protocol)
+
+    def entries(self, protocol: str, section: str) -> Dict[str, Any]:
+        """Name -> parsed model of one section (shared: do not mutate)."""
+        if protocol == "http":
+            return getattr(self.http_manager, f"get_{section}")()
+        if protocol == "tls":
+            return self._tls_entries(section)
+        return getattr(self.tcp_udp_manager, f"get_{protocol}_{section}")()
+
+    def _tls_entries(self, section: str) -> Dict[str, Any]:
+        if section == "certResolvers":
+            if self.resolvers_manager is None:
+                return {}
+            return self.resolvers_manager.get_certificate_resolvers() or {}
+        if self.manual_certs_manager is None:
+            return {}
+        return {
+            cert.domain: cert for cert in self.manual_certs_manager.list_certificates()
+        }
+
+    def subscribe(self, listener: ChangeListener) -> None:
+        """
+        Registers `listener` for the entries written through the HTTP and
+        TCP/UDP managers. TLS entries are few and only picked up by sync().
+        """
+        self.http_manager.changes.subscribe(listener)
+        self.tcp_udp_manager.changes.subscribe(listener)
+
+
+class ConfigIndex(abc.ABC):
+    """
+    Base of the in-memory indexes over config entries.
+
+    Subclasses list the (protocol, section) SOURCES they cover and implement
+    _add/_remove for a single entry. Writes through the managers are applied
+    entry by entry as they happen. When a protocol's version moved without
+    the index seeing the write (external edit, another process), the next
+    sync() diffs that protocol's entries and re-indexes only those that
+    changed. Queries call sync() first; it is a stat() per protocol when
+    nothing changed.
+    """
+
+    SOURCES: Tuple[Source, ...] = ()
+
+    def __init__(self, catalog: ConfigCatalog) -> None:
+        self.catalog = catalog
+        self._lock = threading.RLock()
+        # Source -> name -> indexed entry
+        self._entries: Dict[Source, Dict[str, Any]] = {s: {} for s in self.SOURCES}
+        self._versions: Dict[str, Any] = {}
+        self._protocols = {protocol for protocol, _ in self.SOURCES}
+
+        # Metrics
+        self.resyncs = 0
+        self.incremental_updates = 0
+        self.reindexed_entries = 0
+
+        catalog.subscribe(self._on_change)
+
+    # -------------------- SUBCLASS HOOKS --------------------
+    @abc.abstractmethod
+    def _add(self, source: Source, name: str, entry: Any) -> None:
+        """Indexes an entry that appeared."""
+
+    @abc.abstractmethod
+    def _remove(self, source: Source, name: str, entry: Any) -> None:
+        """Drops an entry that went away (or is about to be re-added)."""
+
+    # -------------------- SYNC --------------------
+    def sync(self) -> None:
+        """Catches up with changes the index did not see being written."""
+        with self._lock:
+            for protocol in self._protocols:
+                version = self.catalog.version(protocol)
+                if self._versions.get(protocol, _UNSYNCED) == version:
+                    continue
+                for source in self.SOURCES:
+                    if source[0] == protocol:
+                        self._resync(source)
+                self._versions[protocol] = version
+                self.resyncs += 1
+
+    def _resync(self, source: Source) -> None:
+        current = self.catalog.entries(*source)
+        indexed = self._entries[source]
+        for name in [name for name in indexed if name not in current]:
+            self._set(source, name, None)
+        for name, entry in current.items():
+            old = indexed.get(name)
+            if old is None or (old is not entry and old != entry):
+                self._set(source, name, entry)
+
+    def _on_change(
+        self, protocol: str, before: Any, after: Any, changes: Sequence[EntryChange]
+    ) -> None:
+        # Runs in the writing thread, right after the write
+        if protocol not in self._protocols:
+            return
+        with self._lock:
+            if self._versions.get(protocol, _UNSYNCED) != before:
+                # Out of step with the file: re-read it on the next sync()
+                self._versions.pop(protocol, None)
+                return
+            for section, name, data in changes:
+                if (protocol, section) in self._entries:
+                    self._set((protocol, section), name, data)
+            self._versions[protocol] = after
+            self.incremental_updates += 1
+
+    def _set(self, source: Source, name: str, entry: Optional[Any]) -> None:
+        entries = self._entries[source]
+        old = entries.pop(name, None)
+        if old is not None:
+            self._remove(source, name, old)
+        if entry is not None:
+            entries[name] = entry
+            self._add(source, name, entry)
+        self.reindexed_entries += 1
+
+    # -------------------- READ --------------------
+    def entries(self, source: Source) -> Dict[str, Any]:
+        """Name -> entry of one source as indexed (call sync() first)."""
+        return self._entries[source]
+
+    def sources(self, protocol: Optional[str] = None) -> Iterable[Source]:
+        return (s for s in self.SOURCES if protocol is None or s[0] == protocol)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns entry counts and how the index was kept up to date."""
+        return {
+            "entries": sum(len(entries) for entries in self._entries.values()),
+            "resyncs": self.resyncs,
+            "incremental_updates": self.incremental_updates,
+            "reindexed_entries": self.reindexed_entries,
+        }
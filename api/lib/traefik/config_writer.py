@@ -0,0 +1,198 @@
+import fcntl
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional
+
+from lib.traefik.config_cache import file_signature
+
+# Called with the path of every config file written or removed
+_write_listeners: List[Callable[[Path], None]] = []
+# Called with (version before, version after, flush_state) after each flush
+FlushListener = Callable[[Any, Any, Dict[str, Any]], None]
+
+
+def add_write_listener(listener: Callable[[Path], None]) -> None:
+    """Registers a callback run after each config file write or removal."""
+    _write_listeners.append(listener)
+
+
+def notify_write(path: str | Path) -> None:
+    """Tells the write listeners that `path` changed on disk."""
+    for listener in _write_listeners:
+        listener(Path(path))
+
+
+def atomic_write(path: str | Path, write: Callable[[IO[str]], None]) -> None:
+    """
+    Writes a file through a temp file in the same directory, then fsyncs and
+    renames it over `path`. Readers (Traefik included) see either the old or
+    the new content, never a partial write.
+    """
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        # mkstemp creates 0600 files; keep the permissions Traefik can read
+        os.chmod(tmp_path, 0o644)
+        with os.fdopen(fd, "w") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    # Persist the rename itself
+    dir_fd = os.open(path.parent, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+    notify_write(path)
+
+
+class _PendingWrite:
+    def __init__(self, mutate: Callable[[Any], bool]) -> None:
+        self.mutate = mutate
+        self.done = False
+        self.changed = False
+        self.error: Optional[BaseException] = None
+
+
+class ConfigFileWriter:
+    """
+    Serializes read-modify-write cycles on one config file.
+
+    Callers submit a mutator that edits the loaded config in place and
+    returns whether it changed anything. While a flush is in progress, new
+    submissions queue up; the next flush applies all of them to a single
+    fresh load and writes the file once. Flushes hold an fcntl lock on a
+    sidecar lock file so other processes sharing the data directory do not
+    interleave with us, and writes go through `atomic_write`.
+
+    Flush listeners run under the lock after each write, with the file
+    signatures read before the load and after the write, so together they
+    describe exactly what that flush changed.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        load: Callable[[], Any],
+        dump: Callable[[Any, IO[str]], None],
+    ) -> None:
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(f".{self.path.name}.lock")
+        self._load = load
+        self._dump = dump
+        self._cond = threading.Condition()
+        self._pending: List[_PendingWrite] = []
+        self._flushing = False
+        # Scratch space shared by the mutators of the flush in progress
+        self.flush_state: Dict[str, Any] = {}
+        self._flush_listeners: List[FlushListener] = []
+        self.submitted = 0
+        self.flushes = 0
+
+    def submit(self, mutate: Callable[[Any], bool]) -> bool:
+        """
+        Applies `mutate` to the current config and persists the result.
+        Blocks until the write that includes it is on disk and returns what
+        the mutator returned. Mutators must validate their input before
+        touching the config, since a batch is written as a whole.
+        """
+        item = _PendingWrite(mutate)
+        with self._cond:
+            self.submitted += 1
+            self._pending.append(item)
+            while not item.done and self._flushing:
+                self._cond.wait()
+            if item.done:
+                return self._result(item)
+            # Become the flusher for everything queued so far
+            self._flushing = True
+            batch, self._pending = self._pending, []
+
+        try:
+            self._flush(batch)
+        finally:
+            with self._cond:
+                self._flushing = False
+                self._cond.notify_all()
+        return self._result(item)
+
+    def add_flush_listener(self, listener: FlushListener) -> None:
+        """Registers a callback run under the lock after each write."""
+        self._flush_listeners.append(listener)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns submitted updates versus actual file rewrites."""
+        return {
+            "submitted": self.submitted,
+            "flushes": self.flushes,
+            "coalesced": self.submitted - self.flushes,
+        }
+
+    @staticmethod
+    def _result(item: _PendingWrite) -> bool:
+        if item.error is not None:
+            raise item.error
+        return item.changed
+
+    def _flush(self, batch: List[_PendingWrite]) -> None:
+        try:
+            with self._file_lock():
+                before = file_signature(self.path)
+                config = self._load()
+                self.flush_state = {}
+                for item in batch:
+                    try:
+                        item.changed = bool(item.mutate(config))
+                    except Exception as e:
+                        item.error = e
+                if any(item.changed for item in batch):
+                    atomic_write(self.path, lambda f: self._dump(config, f))
+                    self.flushes += 1
+                    after = file_signature(self.path)
+                    for listener in self._flush_listeners:
+                        listener(before, after, self.flush_state)
+        except BaseException as e:
+            for item in batch:
+                if item.error is None:
+                    item.error = e
+        finally:
+            for item in batch:
+                item.done = True
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+_writers: Dict[str, ConfigFileWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(
+    path: str | Path,
+    load: Callable[[], Any],
+    dump: Callable[[Any, IO[str]], None],
+) -> ConfigFileWriter:
+    """Returns the process-wide writer for `path`, creating it on first use."""
+    key = str(Path(path).resolve())
+    with _writers_lock:
+        if key not in _writers:
+            _writers[key] = ConfigFileWriter(path, load, dump)
+        return _writers[key]
@@ -0,0 +1,199 @@
+import heapq
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Set
+
+from lib.traefik.config_index import ConfigCatalog, ConfigIndex, Source
+from lib.traefik.rule_parser import (
+    Predicate,
+    Request,
+    RuleSyntaxError,
+    compile_rule,
+    host_keys,
+    parse_rule,
+    path_prefixes,
+)
+
+
+@dataclass(frozen=True)
+class CompiledRoute:
+    name: str
+    rule: str
+    service: str
+    priority: int
+    entry_points: Optional[FrozenSet[str]]  # None: every default entryPoint
+    tls: bool
+    test: Predicate
+    # Dispatch keys: None when the rule does not confine the host/path
+    hosts: Optional[FrozenSet[str]]
+    prefixes: Optional[FrozenSet[str]]
+
+
+class _PathNode:
+    """Path prefix trie node, one character per level."""
+
+    __slots__ = ("children", "routes")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_PathNode"] = {}
+        # Routers whose rule requires a path starting with this node's prefix
+        self.routes: Set[str] = set()
+
+
+def compile_route(name: str, entry: Any) -> CompiledRoute:
+    """Compiles an HTTP router. Raises RuleSyntaxError."""
+    tree = parse_rule(entry.rule)
+    return CompiledRoute(
+        name=name,
+        rule=entry.rule,
+        service=entry.service,
+        # Traefik's default priority is the length of the rule
+        priority=entry.priority or len(entry.rule),
+        entry_points=frozenset(entry.entryPoints) if entry.entryPoints else None,
+        tls=entry.tls is not None,
+        test=compile_rule(tree),
+        hosts=host_keys(tree),
+        prefixes=path_prefixes(tree),
+    )
+
+
+class RouteDispatcher(ConfigIndex):
+    """
+    Which HTTP router Traefik picks for a request, with compiled rules.
+
+    Every router rule is parsed into an AST and compiled to a predicate.
+    Routers are filed under the exact hosts their rule requires (a dict,
+    or the any-host bucket) and, within it, in a character trie under the
+    literal path prefix it requires. A request is only tested against the
+    routers of its host and of the any-host bucket whose prefix lies on the
+    request path. The matches are ordered like Traefik does: by priority
+    (explicit, else rule length), highest first.
+    """
+
+    SOURCES = (("http", "routers"),)
+
+    def __init__(self, catalog: ConfigCatalog) -> None:
+        self._routes: Dict[str, CompiledRoute] = {}
+        # Host (None: any host) -> path prefix trie
+        self._by_host: Dict[Optional[str], _PathNode] = {}
+        # Routers whose rule cannot be compiled -> why
+        self._invalid: Dict[str, str] = {}
+        super().__init__(catalog)
+
+    # -------------------- INDEXING --------------------
+    @staticmethod
+    def _keys(route: CompiledRoute):
+        for host in route.hosts or (None,):
+            for prefix in route.prefixes or ("",):
+                yield host, prefix
+
+    def _add(self, source: Source, name: str, entry: Any) -> None:
+        try:
+            route = compile_route(name, entry)
+        except RuleSyntaxError as e:
+            self._invalid[name] = str(e)
+            return
+        self._routes[name] = route
+        for host, prefix in self._keys(route):
+            node = self._by_host.setdefault(host, _PathNode())
+            for char in prefix:
+                node = node.children.setdefault(char, _PathNode())
+            node.routes.add(name)
+
+    def _remove(self, source: Source, name: str, entry: Any) -> None:
+        self._invalid.pop(name, None)
+        route = self._routes.pop(name, None)
+        if route is None:
+            return
+        for host, prefix in self._keys(route):
+            root = self._by_host.get(host)
+            if root is None:
+                continue
+            path = [root]
+            for char in prefix:
+                node = path[-1].children.get(char)
+                if node is None:
+                    break
+                path.append(node)
+            else:
+                path[-1].routes.discard(name)
+                # Prune the nodes left empty, deepest first
+                for depth in range(len(prefix), 0, -1):
+                    node = path[depth]
+                    if node.routes or node.children:
+                        break
+                    del path[depth - 1].children[prefix[depth - 1]]
+                if not root.routes and not root.children:
+                    del self._by_host[host]
+
+    # -------------------- QUERY --------------------
+    def _candidates(self, request: Request) -> Set[str]:
+        candidates: Set[str] = set()
+        for host in (request.host, None):
+            node = self._by_host.get(host)
+            if node is None:
+                continue
+            candidates.update(node.routes)
+            for char in request.path:
+                node = node.children.get(char)
+                if node is None:
+                    break
+                candidates.update(node.routes)
+        return candidates
+
+    def simulate(
+        self,
+        request: Request,
+        entry_point: Optional[str] = None,
+        tls: Optional[bool] = None,
+        limit: int = 5,
+    ) -> Dict[str, Any]:
+        """
+        The router that wins `request` and up to `limit` runners-up, on
+        `entry_point` and for HTTPS (`tls`) or HTTP requests when given.
+        """
+        self.sync()
+        with self._lock:
+            candidates = self._candidates(request)
+            matched: List[CompiledRoute] = []
+            for name in candidates:
+                route = self._routes[name]
+                if entry_point and route.entry_points is not None:
+                    if entry_point not in route.entry_points:
+                        continue
+                if tls is not None and route.tls != tls:
+                    continue
+                if route.test(request):
+                    matched.append(route)
+            ranked = heapq.nsmallest(
+                limit + 1, matched, key=lambda route: (-route.priority, route.name)
+            )
+            return {
+                "winner": self._describe(ranked[0]) if ranked else None,
+                "runners_up": [self._describe(route) for route in ranked[1:]],
+                "matched": len(matched),
+                "candidates": len(candidates),
+                "skipped": len(self._invalid),
+            }
+
+    @staticmethod
+    def _describe(route: CompiledRoute) -> Dict[str, Any]:
+        return {
+            "name": route.name,
+            "rule": route.rule,
+            "priority": route.priority,
+            "service": route.service,
+        }
+
+    def invalid(self) -> Dict[str, str]:
+        """Routers left out of simulations, with their rule's error."""
+        self.sync()
+        with self._lock:
+            return dict(self._invalid)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **super().stats(),
+            "routes": len(self._routes),
+            "hosts": len(self._by_host),
+            "invalid": len(self._invalid),
+        }
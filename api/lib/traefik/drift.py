@@ -0,0 +1,180 @@
+import threading
+import time
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from lib.traefik.config_index import ConfigCatalog
+from lib.traefik.rawdata import RawdataSummary
+
+# Drift kind (Traefik rawdata key) -> (config protocol, config section)
+KINDS = {
+    "routers": ("http", "routers"),
+    "services": ("http", "services"),
+    "middlewares": ("http", "middlewares"),
+    "tcpRouters": ("tcp", "routers"),
+    "tcpServices": ("tcp", "services"),
+    "udpRouters": ("udp", "routers"),
+    "udpServices": ("udp", "services"),
+}
+
+# File-provider entries the panel writes outside the managers
+# (scripts/configure_traefik_api.py); never reported as extra
+UNMANAGED = {"routers": frozenset({"traefik-api"})}
+
+MISSING = "missing"
+EXTRA = "extra"
+ERRORING = "erroring"
+DISABLED = "disabled"
+CATEGORIES = (MISSING, EXTRA, ERRORING, DISABLED)
+
+# (status, errors) of a live entry: the part of it a verdict depends on
+Fingerprint = Tuple[str, Tuple[str, ...]]
+
+
+class DriftDetector:
+    """
+    Compares the entries in the panel's config files with the `@file`
+    entries Traefik reports in /api/rawdata:
+
+    - missing: configured, but not loaded by Traefik;
+    - extra: loaded from a file, but not in the panel's config;
+    - erroring: loaded with errors;
+    - disabled: loaded but disabled, without an error.
+
+    Runs are incremental. Config names are re-read only when a protocol's
+    config version changed, each live entry is reduced to a fingerprint of
+    the fields a verdict depends on, and only entries whose presence or
+    fingerprint changed since the previous run are re-evaluated.
+    """
+
+    def __init__(self, catalog: ConfigCatalog) -> None:
+        self.catalog = catalog
+        self._lock = threading.Lock()
+
+        self._versions: Dict[str, Any] = {}
+        self._config_names: Dict[str, FrozenSet[str]] = {}
+        self._live: Dict[str, Dict[str, Fingerprint]] = {}
+        # Kind -> name -> category, for entries that drifted
+        self._verdicts: Dict[str, Dict[str, str]] = {kind: {} for kind in KINDS}
+
+        # Metrics
+        self.runs = 0
+        self.last_rechecked = 0
+        self.last_duration_ms = 0.0
+
+    def detect(self, rawdata: RawdataSummary) -> Dict[str, Any]:
+        """Updates the drift state from a /api/rawdata summary and reports it."""
+        with self._lock:
+            started = time.perf_counter()
+            versions = {
+                protocol: self.catalog.version(protocol)
+                for protocol in {protocol for protocol, _ in KINDS.values()}
+            }
+
+            rechecked = 0
+            for kind, (protocol, section) in KINDS.items():
+                rechecked += self._update_kind(
+                    kind,
+                    protocol,
+                    section,
+                    rawdata.statuses.get(kind, {}),
+                    rawdata.errors.get(kind, {}),
+                    versions[protocol] != self._versions.get(protocol),
+                )
+            self._versions = versions
+
+            self.runs += 1
+            self.last_rechecked = rechecked
+            self.last_duration_ms = round((time.perf_counter() - started) * 1000, 2)
+            return self._report()
+
+    def _update_kind(
+        self,
+        kind: str,
+        protocol: str,
+        section: str,
+        raw_statuses: Dict[str, str],
+        raw_errors: Dict[str, List[str]],
+        config_changed: bool,
+    ) -> int:
+        previous_names = self._config_names.get(kind)
+        names = previous_names
+        if config_changed or names is None:
+            names = frozenset(self.catalog.entries(protocol, section))
+            self._config_names[kind] = names
+
+        live = {
+            key[: -len("@file")]: (status, tuple(raw_errors.get(key, ())))
+            for key, status in raw_statuses.items()
+            if key.endswith("@file")
+        }
+        previous_live = self._live.get(kind)
+        self._live[kind] = live
+
+        if previous_names is None or previous_live is None:
+            dirty = set(names) | live.keys()
+        else:
+            dirty = set() if names is previous_names else set(names ^ previous_names)
+            dirty.update(
+                name
+                for name, fingerprint in live.items()
+                if previous_live.get(name) != fingerprint
+            )
+            dirty.update(previous_live.keys() - live.keys())
+
+        verdicts = self._verdicts[kind]
+        unmanaged = UNMANAGED.get(kind, frozenset())
+        for name in dirty:
+            verdict = self._verdict(name, names, live, unmanaged)
+            if verdict is None:
+                verdicts.pop(name, None)
+            else:
+                verdicts[name] = verdict
+        return len(dirty)
+
+    @staticmethod
+    def _verdict(
+        name: str,
+        names: FrozenSet[str],
+        live: Dict[str, Fingerprint],
+        unmanaged: FrozenSet[str],
+    ) -> Optional[str]:
+        fingerprint = live.get(name)
+        if fingerprint is None:
+            return MISSING if name in names else None
+        if name not in names:
+            return None if name in unmanaged else EXTRA
+        status, errors = fingerprint
+        if errors:
+            return ERRORING
+        if status == "disabled":
+            return DISABLED
+        return None
+
+    def _report(self) -> Dict[str, Any]:
+        report: Dict[str, Any] = {category: {} for category in CATEGORIES}
+        for kind, verdicts in self._verdicts.items():
+            for name, category in verdicts.items():
+                if category == ERRORING:
+                    errors: Any = list(self._live[kind][name][1])
+                    report[category].setdefault(kind, {})[name] = errors
+                else:
+                    report[category].setdefault(kind, []).append(name)
+
+        for category in (MISSING, EXTRA, DISABLED):
+            for names in report[category].values():
+                names.sort()
+        report["counts"] = {
+            category: sum(len(entries) for entries in report[category].values())
+            for category in CATEGORIES
+        }
+        return report
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns run counters of the incremental engine."""
+        return {
+            "runs": self.runs,
+            "entries": sum(len(names) for names in self._config_names.values()),
+            "live_entries": sum(len(live) for live in self._live.values()),
+            "last_rechecked": self.last_rechecked,
+            "last_duration_ms": self.last_duration_ms,
+        }
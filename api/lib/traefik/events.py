@@ -0,0 +1,174 @@
+import asyncio
+import json
+import logging
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Set
+
+from core.config import settings
+from lib.traefik.async_io import run_blocking
+from lib.traefik.config_writer import add_write_listener
+from lib.traefik.snapshot import HEALTH, TraefikSnapshot, diff_snapshots
+
+logger = logging.getLogger(__name__)
+
+# Messages a subscriber may fall behind by before it is told to resync
+QUEUE_SIZE = 256
+KEEPALIVE = b": keepalive\n\n"
+
+
+def encode_event(event: str, data: Any, event_id: Optional[int] = None) -> bytes:
+    """Encodes one Server-Sent Event."""
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return ("\n".join(lines) + "\n\n").encode()
+
+
+class _Subscriber:
+    def __init__(self) -> None:
+        self.queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=QUEUE_SIZE)
+
+    def push(self, message: bytes) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Too slow to keep up: drop its backlog and have it refetch
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(encode_event("resync", {}))
+
+
+class EventBroadcaster:
+    """
+    Fans Server-Sent Events out to every subscriber of /events.
+
+    Each event is encoded once and queued for all subscribers, so the cost
+    of a change does not grow with the number of open tabs. Sources:
+
+    - status: routers/services/... appearing, disappearing or changing status
+      between two Traefik snapshots, and health verdict changes;
+    - config: local config files whose version changed, checked right after
+      every panel write and every keepalive tick (to catch external edits).
+    """
+
+    def __init__(self, keepalive: Optional[float] = None) -> None:
+        self.keepalive = (
+            settings.traefik_events_keepalive if keepalive is None else keepalive
+        )
+        self._subscribers: Set[_Subscriber] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._event_id = 0
+        # Config name -> callable returning its current version
+        self._watched: Dict[str, Callable[[], Any]] = {}
+        self._versions: Dict[str, Any] = {}
+        self._config_check: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.events = 0
+        self.messages = 0
+
+        add_write_listener(self._on_write)
+
+    # -------------------- SOURCES --------------------
+    def watch_config(self, name: str, version: Callable[[], Any]) -> None:
+        """Emits a `config` event whenever `version()` changes."""
+        self._watched[name] = version
+
+    def on_snapshot(
+        self, previous: Optional[TraefikSnapshot], current: TraefikSnapshot
+    ) -> None:
+        """Snapshot poller listener: publishes what changed since the last poll."""
+        if previous is None or not self._subscribers:
+            return
+        changes = diff_snapshots(previous, current)
+        if current.error is not None:
+            # Its lists could not be fetched: only the health verdict is news
+            changes = {kind: diff for kind, diff in changes.items() if kind == HEALTH}
+        if changes:
+            self.publish("status", {"version": current.version, **changes})
+
+    def _on_write(self, path: Path) -> None:
+        # Runs in whichever thread wrote the file
+        if (
+            self._subscribers
+            and self._loop is not None
+            and not self._loop.is_closed()
+        ):
+            self._loop.call_soon_threadsafe(self._schedule_config_check)
+
+    def _schedule_config_check(self) -> None:
+        if self._config_check is None or self._config_check.done():
+            self._config_check = asyncio.create_task(self._check_config())
+
+    async def _check_config(self) -> None:
+        versions = await run_blocking(
+            lambda: {name: version() for name, version in self._watched.items()}
+        )
+        changed = sorted(
+            name
+            for name, version in versions.items()
+            if name in self._versions and self._versions[name] != version
+        )
+        self._versions = versions
+        if changed:
+            self.publish("config", {"changed": changed})
+
+    # -------------------- FAN-OUT --------------------
+    def publish(self, event: str, data: Any) -> None:
+        """Encodes an event once and queues it for every subscriber."""
+        self._event_id += 1
+        self.events += 1
+        message = encode_event(event, data, self._event_id)
+        for subscriber in self._subscribers:
+            subscriber.push(message)
+            self.messages += 1
+
+    async def subscribe(self, hello: Dict[str, Any]) -> AsyncIterator[bytes]:
+        """Yields SSE messages for one client until it disconnects."""
+        if not self._versions:
+            # Baseline, so the first change after subscribing is reported
+            await self._check_config()
+        subscriber = _Subscriber()
+        self._subscribers.add(subscriber)
+        try:
+            yield encode_event("ready", hello)
+            while True:
+                try:
+                    yield await asyncio.wait_for(
+                        subscriber.queue.get(), timeout=self.keepalive
+                    )
+                except asyncio.TimeoutError:
+                    yield KEEPALIVE
+        finally:
+            self._subscribers.discard(subscriber)
+
+    # -------------------- BACKGROUND TASK --------------------
+    def start(self) -> None:
+        """Starts the keepalive/config check loop (call from the app startup)."""
+        if self._task is None:
+            self._loop = asyncio.get_running_loop()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if self._subscribers:
+                    await self._check_config()
+            except Exception:
+                logger.exception("Error checking config versions")
+            await asyncio.sleep(self.keepalive)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns subscriber and fan-out counters."""
+        return {
+            "subscribers": len(self._subscribers),
+            "events": self.events,
+            "messages": self.messages,
+        }
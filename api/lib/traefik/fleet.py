@@ -0,0 +1,157 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from core.config import settings
+from lib.traefik.traefik_api import LIVE_LISTS, JSONDict, TraefikApiService
+
+# (instance, result or None, error or None, milliseconds)
+Outcome = Tuple[str, Any, Optional[str], float]
+
+
+def instance_name(url: str) -> str:
+    """Names a replica by the host:port of its API URL."""
+    return urlsplit(url).netloc or url
+
+
+class TraefikFleet:
+    """
+    Fans requests out to every Traefik replica and aggregates the answers.
+
+    Each replica has its own TraefikApiService (pooled client, request
+    coalescing and circuit breaker). At most `concurrency` replicas are
+    queried at once, so a fleet-wide view costs about one round trip when
+    the fleet fits in that bound, rather than the sum over replicas.
+    """
+
+    def __init__(
+        self,
+        instances: Dict[str, TraefikApiService],
+        concurrency: Optional[int] = None,
+    ) -> None:
+        self.instances = instances
+        self.concurrency = max(
+            1,
+            settings.traefik_fleet_concurrency if concurrency is None else concurrency,
+        )
+
+    @classmethod
+    def from_settings(cls, primary: TraefikApiService) -> "TraefikFleet":
+        """The primary service plus one per TRAEFIK_API_REPLICA_URLS entry."""
+        instances = {instance_name(primary.base_url): primary}
+        for url in settings.traefik_api_replica_urls.split(","):
+            url = url.strip()
+            if url and instance_name(url) not in instances:
+                instances[instance_name(url)] = TraefikApiService(url)
+        return cls(instances)
+
+    # -------------------- CLIENT LIFECYCLE --------------------
+    async def start(self) -> None:
+        for service in self.instances.values():
+            await service.start()
+
+    async def close(self) -> None:
+        for service in self.instances.values():
+            await service.close()
+
+    # -------------------- FAN-OUT --------------------
+    async def _fan_out(
+        self, call: Callable[[TraefikApiService], Awaitable[Any]]
+    ) -> List[Outcome]:
+        """Runs `call` against every replica, `concurrency` at a time."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def one(name: str, service: TraefikApiService) -> Outcome:
+            async with semaphore:
+                started = time.perf_counter()
+                result, error = None, None
+                try:
+                    result = await call(service)
+                except Exception as e:
+                    error = str(e) or repr(e)
+                ms = round((time.perf_counter() - started) * 1000, 2)
+            return name, result, error, ms
+
+        return await asyncio.gather(
+            *(one(name, service) for name, service in self.instances.items())
+        )
+
+    # -------------------- AGGREGATES --------------------
+    async def get_status(self) -> JSONDict:
+        """
+        Health check of every replica. The fleet is RUNNING when all are,
+        DOWN when none is, and DEGRADED otherwise.
+        """
+        instances: Dict[str, JSONDict] = {}
+        for name, result, error, ms in await self._fan_out(
+            lambda service: service.get_status()
+        ):
+            health = result if error is None else {"status": "DOWN", "error": error}
+            instances[name] = {**health, "ms": ms}
+
+        by_status: Dict[str, List[str]] = {}
+        for name, health in instances.items():
+            by_status.setdefault(health["status"], []).append(name)
+
+        running = len(by_status.get("RUNNING", []))
+        if running == len(instances):
+            fleet_status = "RUNNING"
+        elif running == 0:
+            fleet_status = "DOWN"
+        else:
+            fleet_status = "DEGRADED"
+        return {
+            "status": fleet_status,
+            "disagree": len(by_status) > 1,
+            "by_status": by_status,
+            "instances": instances,
+        }
+
+    async def get_list(self, kind: str) -> JSONDict:
+        """
+        One LIVE_LISTS kind from every replica, merged by entry name.
+
+        Each entry lists its status per instance. An entry disagrees when
+        a reachable replica lacks it or reports a different status;
+        unreachable replicas are reported but not counted against entries.
+        """
+        path = LIVE_LISTS[kind]
+        instances: Dict[str, JSONDict] = {}
+        merged: Dict[str, Dict[str, str]] = {}
+        for name, result, error, ms in await self._fan_out(
+            lambda service: service.fetch_list(path)
+        ):
+            if error is not None:
+                instances[name] = {"ok": False, "error": error, "ms": ms}
+                continue
+            instances[name] = {"ok": True, "count": len(result), "ms": ms}
+            for entry in result:
+                merged.setdefault(entry.get("name", ""), {})[name] = entry.get(
+                    "status", ""
+                )
+
+        reachable = [name for name, info in instances.items() if info["ok"]]
+        entries = []
+        disagreements = []
+        for entry_name in sorted(merged):
+            statuses = merged[entry_name]
+            agreed = len(statuses) == len(reachable) and len(
+                set(statuses.values())
+            ) == 1
+            if not agreed:
+                disagreements.append(entry_name)
+            entries.append(
+                {
+                    "name": entry_name,
+                    "status": next(iter(statuses.values())) if agreed else None,
+                    "instances": statuses,
+                }
+            )
+        return {
+            "kind": kind,
+            "consistent": not disagreements,
+            "disagreements": disagreements,
+            "instances": instances,
+            "entries": entries,
+        }
@@ -0,0 +1,149 @@
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from lib.traefik.config_index import ConfigCatalog, ConfigIndex, Source
+from lib.traefik.rules import HostMatcher, extract_hosts, normalize_host
+
+# (protocol, section, router name)
+RouterKey = Tuple[str, str, str]
+
+
+class _SuffixNode:
+    """Suffix trie node; children are keyed by label, from the TLD down."""
+
+    __slots__ = ("children", "matchers")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_SuffixNode"] = {}
+        # Wildcards confined to this node's domain
+        self.matchers: Dict[RouterKey, List[HostMatcher]] = {}
+
+
+class HostIndex(ConfigIndex):
+    """
+    Which HTTP and TCP routers serve a host, from the Host, HostRegexp and
+    HostSNI matchers of their rules.
+
+    Exact hosts live in a dict (O(1) lookups). Wildcards and regexps whose
+    matches share a literal domain suffix sit in a suffix trie keyed by
+    label from the TLD down, so a lookup only tests the wildcards along the
+    host's own path. The rest (unanchored regexps) are tested one by one.
+    """
+
+    SOURCES = (("http", "routers"), ("tcp", "routers"))
+
+    def __init__(self, catalog: ConfigCatalog) -> None:
+        self._exact: Dict[str, Set[RouterKey]] = {}
+        self._root = _SuffixNode()
+        self._unanchored: Dict[RouterKey, List[HostMatcher]] = {}
+        # What each router added, to remove exactly that
+        self._indexed: Dict[RouterKey, List[HostMatcher]] = {}
+        super().__init__(catalog)
+
+    # -------------------- INDEXING --------------------
+    @staticmethod
+    def _labels(domain: str) -> List[str]:
+        return list(reversed(domain.split("."))) if domain else []
+
+    def _add(self, source: Source, name: str, entry: Any) -> None:
+        key = (*source, name)
+        hosts = extract_hosts(getattr(entry, "rule", None) or "")
+        self._indexed[key] = hosts
+        for host in hosts:
+            if host.host is not None:
+                self._exact.setdefault(host.host, set()).add(key)
+            elif host.suffix is not None:
+                node = self._root
+                for label in self._labels(host.suffix):
+                    node = node.children.setdefault(label, _SuffixNode())
+                node.matchers.setdefault(key, []).append(host)
+            else:
+                self._unanchored.setdefault(key, []).append(host)
+
+    def _remove(self, source: Source, name: str, entry: Any) -> None:
+        key = (*source, name)
+        for host in self._indexed.pop(key, []):
+            if host.host is not None:
+                keys = self._exact.get(host.host)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._exact[host.host]
+            elif host.suffix is not None:
+                self._remove_wildcard(self._root, self._labels(host.suffix), key)
+            else:
+                self._unanchored.pop(key, None)
+
+    def _remove_wildcard(
+        self, node: _SuffixNode, labels: List[str], key: RouterKey
+    ) -> bool:
+        """Removes `key` under `labels`; returns whether `node` became empty."""
+        if labels:
+            child = node.children.get(labels[0])
+            if child is not None and self._remove_wildcard(child, labels[1:], key):
+                del node.children[labels[0]]
+        else:
+            node.matchers.pop(key, None)
+        return not node.children and not node.matchers
+
+    # -------------------- QUERY --------------------
+    def lookup(self, host: str) -> Dict[str, Any]:
+        """Routers whose rule matches `host`, exact matches first."""
+        host = normalize_host(host)
+        self.sync()
+        with self._lock:
+            exact = sorted(self._exact.get(host, ()))
+            wildcard: Dict[RouterKey, HostMatcher] = {}
+            node: Optional[_SuffixNode] = self._root
+            candidates = [self._root]
+            for label in self._labels(host):
+                node = node.children.get(label)
+                if node is None:
+                    break
+                candidates.append(node)
+            for node in reversed(candidates):  # most specific suffix first
+                self._collect(node.matchers, host, exact, wildcard)
+            self._collect(self._unanchored, host, exact, wildcard)
+
+            return {
+                "host": host,
+                "exact": [self._describe(key, None) for key in exact],
+                "wildcard": [
+                    self._describe(key, matcher) for key, matcher in wildcard.items()
+                ],
+            }
+
+    @staticmethod
+    def _collect(
+        matchers: Dict[RouterKey, List[HostMatcher]],
+        host: str,
+        exact: List[RouterKey],
+        found: Dict[RouterKey, HostMatcher],
+    ) -> None:
+        for key, hosts in matchers.items():
+            if key in found or key in exact:
+                continue
+            for matcher in hosts:
+                if matcher.matches(host):
+                    found[key] = matcher
+                    break
+
+    def _describe(
+        self, key: RouterKey, matcher: Optional[HostMatcher]
+    ) -> Dict[str, Any]:
+        protocol, section, name = key
+        entry = self._entries[(protocol, section)].get(name)
+        described = {
+            "protocol": protocol,
+            "name": name,
+            "rule": getattr(entry, "rule", None),
+        }
+        if matcher is not None:
+            described["matcher"] = f"{matcher.matcher}(`{matcher.value}`)"
+        return described
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **super().stats(),
+            "exact_hosts": len(self._exact),
+            "unanchored": len(self._unanchored),
+        }
@@ -1,33 +1,109 @@
+import logging
 import os
-from pathlib import Path
-from typing import Dict
+import threading
+from typing import IO, Any, Callable, Dict, List, Optional, Sequence, Tuple
 
-import yaml
+from pydantic import ValidationError
 
 from core.config import settings
 from core.models import (
+    TraefikBatchOperation,
     TraefikHttpBlock,
     TraefikHttpConfig,
     TraefikMiddleware,
     TraefikRouter,
     TraefikService,
 )
+from lib.traefik import yaml_io
+from lib.traefik.async_io import AsyncManager
+from lib.traefik.changes import ChangeFeed
+from lib.traefik.config_cache import ParsedFileCache, file_signature
+from lib.traefik.config_writer import atomic_write, get_writer
+from lib.traefik.publisher import publisher
+from lib.traefik.sharded_store import ShardedConfigStore
+
+logger = logging.getLogger(__name__)
+
+# (section, name, data): a None `data` deletes the entry
+HttpChange = Tuple[str, str, Any]
+# Run inside a write, before it is applied, with the changes of earlier
+# writes that are not on disk yet; raises to cancel the write
+ChangeCheck = Callable[[Sequence[HttpChange]], None]
 
 
 class HttpManager:
+    # Batch operation kind -> (TraefikHttpBlock field, entry model)
+    SECTIONS = {
+        "router": ("routers", TraefikRouter),
+        "service": ("services", TraefikService),
+        "middleware": ("middlewares", TraefikMiddleware),
+    }
+
     def __init__(self):
         # Initialize config file path
-        self.config_file = Path(
-            settings.traefik_config_path, "dynamic/traefik-http-configs.yaml"
-        )
+        self.dynamic_dir = publisher.dynamic_dir
+        self.config_file = self.dynamic_dir / "traefik-http-configs.yaml"
+        self.sharded = settings.traefik_config_layout == "sharded"
+        self.aio = AsyncManager(self)
+        # Entries written through this manager, for the in-memory indexes
+        self.changes = ChangeFeed()
+
+        if self.sharded:
+            # One file per entry under dynamic/http/<section>/<name>.yaml
+            publisher.path("http")
+            self._store = ShardedConfigStore(self.dynamic_dir, "http")
+            # Serializes checked writes with every other shard write
+            self._store_lock = threading.Lock()
+            if self.config_file.exists():
+                logger.warning(
+                    "%s still exists in sharded layout, "
+                    "run scripts/migrate_sharded_layout.py to split it",
+                    self.config_file,
+                )
+            return
 
         # Ensure the config file and directory exist
+        publisher.path(self.config_file.name)
         if not self.config_file.exists():
             self.config_file.parent.mkdir(parents=True, exist_ok=True)
             with open(self.config_file, "w") as f:
                 f.write("\n")
 
+        # Validated config, re-parsed only when the file changes on disk
+        self._cache = ParsedFileCache()
+        # Entry counts read from the raw YAML, for callers that need no models
+        self._counts = ParsedFileCache()
+        # Locked, atomic, coalescing writes of the config file
+        self._writer = get_writer(
+            self.config_file, self._read_config_for_update, self._dump_config
+        )
+        self._writer.add_flush_listener(self._on_flush)
+
     def _read_config(self) -> TraefikHttpConfig:
+        """
+        Returns the parsed configuration, served from the in-process cache
+        while the file is unchanged. The result is shared: do not mutate it.
+        """
+        if self.sharded:
+            return self._read_sharded_config()
+        return self._cache.get(self.config_file, self._load_config)
+
+    def _read_sharded_config(self) -> TraefikHttpConfig:
+        """Assembles the configuration from the per-entry shard files."""
+        sections = {
+            section: self._store.read_section(section, model.model_validate)
+            for section, model in self.SECTIONS.values()
+        }
+        # Entries are validated per shard; skip re-validating the whole tree
+        return TraefikHttpConfig.model_construct(
+            http=TraefikHttpBlock.model_construct(**sections)
+        )
+
+    def _read_config_for_update(self) -> TraefikHttpConfig:
+        """Returns a private copy of the configuration that may be mutated."""
+        return self._read_config().model_copy(deep=True)
+
+    def _load_config(self) -> TraefikHttpConfig:
         """Reads the YAML configuration file and returns a Pydantic model."""
         if not os.path.exists(self.config_file):
             # Return empty config as a model
@@ -36,7 +112,7 @@ class HttpManager:
             )
         try:
             with open(self.config_file, "r") as f:
-                data = yaml.safe_load(f) or {}
+                data = yaml_io.load(f) or {}
 
             # Ensure the top-level http block exists
             http_data = data.get("http", {})
@@ -47,16 +123,61 @@ class HttpManager:
                     middlewares=http_data.get("middlewares", {}),
                 )
             )
-        except Exception as e:
-            print(f"Error reading {self.config_file}: {e}")
-            raise (e)
+        except Exception:
+            logger.exception("Error reading %s", self.config_file)
+            raise
+
+    def _load_counts(self) -> Dict[str, int]:
+        """Counts the entries of each section without validating them."""
+        http = {}
+        if os.path.exists(self.config_file):
+            with open(self.config_file, "r") as f:
+                http = (yaml_io.load(f) or {}).get("http") or {}
+        return {
+            section: len(http.get(section) or {})
+            for section, _ in self.SECTIONS.values()
+        }
 
     def _write_config(self, config: TraefikHttpConfig):
-        """Writes the configuration to the YAML file."""
-        with open(self.config_file, "w") as f:
-            yaml.dump(config.model_dump(exclude_none=True), f, default_flow_style=False)
+        """Atomically replaces the YAML file with the given configuration."""
+        atomic_write(self.config_file, lambda f: self._dump_config(config, f))
+
+    @staticmethod
+    def _dump_config(config: TraefikHttpConfig, stream: IO[str]):
+        yaml_io.dump(config.model_dump(exclude_none=True), stream)
+
+    def config_version(self) -> Any:
+        """Returns a cheap token that changes whenever the config on disk does."""
+        if self.sharded:
+            return self._store.signature()
+        return file_signature(self.config_file)
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Returns hit/miss counters of the parsed-config cache."""
+        if self.sharded:
+            return self._store.cache_stats()
+        return self._cache.stats()
+
+    def writer_stats(self) -> Dict[str, int]:
+        """Returns submitted updates versus actual rewrites of the config file."""
+        if self.sharded:
+            return self._store.stats()
+        return self._writer.stats()
 
     # -------------------- GET METHODS --------------------
+    def get_config(self) -> TraefikHttpConfig:
+        """Retrieves the whole HTTP configuration."""
+        return self._read_config()
+
+    def count_entries(self) -> Dict[str, int]:
+        """Returns the number of routers, services and middlewares."""
+        if self.sharded:
+            return {
+                section: self._store.count_section(section)
+                for section, _ in self.SECTIONS.values()
+            }
+        return self._counts.get(self.config_file, self._load_counts)
+
     def get_routers(self) -> Dict[str, TraefikRouter]:
         """Retrieves all HTTP routers."""
         config = self._read_config()
@@ -79,78 +200,143 @@ class HttpManager:
         return config.http.middlewares
 
     # -------------------- UPDATE METHODS --------------------
-    def update_router(self, name: str, router_data: TraefikRouter | None):
+    def update_router(
+        self,
+        name: str,
+        router_data: TraefikRouter | None,
+        check: Optional[ChangeCheck] = None,
+    ):
         """Add/update or delete a router. Removes the routers block if empty."""
-        config = self._read_config()
-        http = config.http or TraefikHttpBlock()
-        routers = http.routers or {}
+        self._apply([("routers", name, router_data)], check)
 
-        if router_data:
-            routers[name] = router_data
-        else:
-            routers.pop(name, None)
+    def update_service(
+        self,
+        name: str,
+        service_data: TraefikService | None,
+        check: Optional[ChangeCheck] = None,
+    ):
+        """Add/update or delete a service. Removes the services block if empty."""
+        self._apply([("services", name, service_data)], check)
 
-        http.routers = routers or None
-        config.http = (
-            http if any([http.routers, http.services, http.middlewares]) else None
-        )
+    def update_middleware(
+        self,
+        name: str,
+        middleware_data: TraefikMiddleware | None,
+        check: Optional[ChangeCheck] = None,
+    ):
+        """Add/update or delete a middleware. Removes the middlewares block if empty."""
+        self._apply([("middlewares", name, middleware_data)], check)
+
+    def apply_batch(
+        self,
+        operations: List[TraefikBatchOperation],
+        check: Optional[ChangeCheck] = None,
+    ) -> Dict[str, int]:
+        """
+        Applies upserts/deletes across routers, services and middlewares to one
+        copy of the config and writes the file once. Every operation is
+        validated before anything is written, so the batch is all-or-nothing.
+        In the sharded layout all shards are written to temp files first and
+        renamed into place together; without a publish interval Traefik may
+        still reload between two of those renames.
+        """
+        changes: List[HttpChange] = []
+        for index, operation in enumerate(operations):
+            section, model = self.SECTIONS[operation.kind]
+            if operation.op == "delete":
+                changes.append((section, operation.name, None))
+                continue
+            if operation.data is None:
+                raise ValueError(f"operations[{index}]: 'data' is required for upsert")
+            try:
+                changes.append(
+                    (section, operation.name, model.model_validate(operation.data))
+                )
+            except ValidationError as e:
+                raise ValueError(f"operations[{index}] ({operation.name}): {e}")
 
-        self._write_config(config)
+        self._apply(changes, check)
+        return {
+            "upserted": sum(1 for _, _, data in changes if data is not None),
+            "deleted": sum(1 for _, _, data in changes if data is None),
+        }
 
-    def update_service(self, name: str, service_data: TraefikService | None):
-        """Add/update or delete a service. Removes the services block if empty."""
-        config = self._read_config()
-        http = config.http or TraefikHttpBlock()
-        services = http.services or {}
+    def _apply(
+        self, changes: List[HttpChange], check: Optional[ChangeCheck] = None
+    ) -> bool:
+        """
+        Applies (section, name, data) changes in order through the file writer.
+        A None `data` deletes the entry; empty blocks are removed. `check`
+        runs under the writer's lock first and may cancel the write by
+        raising. Returns whether anything changed.
+        """
+        if not changes:
+            return False
+        if self.sharded:
+            return self._apply_sharded(changes, check)
+        return self._apply_monolithic(changes, check)
 
-        if service_data:
-            services[name] = service_data
-        else:
-            services.pop(name, None)
+    def _on_flush(self, before: Any, after: Any, state: Dict[str, Any]) -> None:
+        """Reports every change of a flush, with the versions it went between."""
+        self.changes.emit("http", before, after, state.get("changes", []))
 
-        http.services = services or None
-        config.http = (
-            http if any([http.routers, http.services, http.middlewares]) else None
-        )
+    def _apply_monolithic(
+        self, changes: List[HttpChange], check: Optional[ChangeCheck]
+    ) -> bool:
+        """Applies all changes to one copy of the config file."""
 
-        self._write_config(config)
+        def mutate(config: TraefikHttpConfig) -> bool:
+            # Changes of the writes before this one in the same flush
+            applied = self._writer.flush_state.setdefault("changes", [])
+            if check is not None:
+                check(applied)
+            http = config.http or TraefikHttpBlock()
+            changed = False
 
-    def update_middleware(self, name: str, middleware_data: TraefikMiddleware | None):
-        """Add/update or delete a middleware. Removes the middlewares block if empty."""
-        config = self._read_config()
-        http = config.http or TraefikHttpBlock()
-        middlewares = http.middlewares or {}
+            for section, name, data in changes:
+                entries = getattr(http, section) or {}
+                if data:
+                    entries[name] = data
+                    changed = True
+                elif entries.pop(name, None) is not None:
+                    changed = True
+                setattr(http, section, entries or None)
 
-        if middleware_data:
-            middlewares[name] = middleware_data
-        else:
-            middlewares.pop(name, None)
+            config.http = (
+                http if any([http.routers, http.services, http.middlewares]) else None
+            )
+            applied.extend(changes)
+            return changed
 
-        http.middlewares = middlewares or None
-        config.http = (
-            http if any([http.routers, http.services, http.middlewares]) else None
-        )
+        return self._writer.submit(mutate)
 
-        self._write_config(config)
+    def _apply_sharded(
+        self, changes: List[HttpChange], check: Optional[ChangeCheck]
+    ) -> bool:
+        """Writes or removes one shard file per change, all together."""
+        shards = [
+            (section, name, data.model_dump(exclude_none=True) if data else None)
+            for section, name, data in changes
+        ]
+        with self._store_lock:
+            if check is not None:
+                check(())
+            before = self.config_version()
+            with publisher.hold():
+                changed = self._store.apply(shards)
+            if changed:
+                self.changes.emit("http", before, self.config_version(), changes)
+            return changed
 
     # -------------------- DELETE METHODS --------------------
-    def delete_router(self, name: str) -> bool:
+    def delete_router(self, name: str, check: Optional[ChangeCheck] = None) -> bool:
         """Deletes an HTTP router by name."""
-        if name in self.get_routers():
-            self.update_router(name, None)
-            return True
-        return False
+        return self._apply([("routers", name, None)], check)
 
-    def delete_service(self, name: str) -> bool:
+    def delete_service(self, name: str, check: Optional[ChangeCheck] = None) -> bool:
         """Deletes an HTTP service by name."""
-        if name in self.get_services():
-            self.update_service(name, None)
-            return True
-        return False
+        return self._apply([("services", name, None)], check)
 
-    def delete_middleware(self, name: str) -> bool:
+    def delete_middleware(self, name: str, check: Optional[ChangeCheck] = None) -> bool:
         """Deletes an HTTP middleware by name."""
-        if name in self.get_middlewares():
-            self.update_middleware(name, None)
-            return True
-        return False
+        return self._apply([("middlewares", name, None)], check)
@@ -0,0 +1,190 @@
+import base64
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from lib.traefik.config_index import (
+    HTTP_SOURCES,
+    TCP_UDP_SOURCES,
+    ConfigCatalog,
+    ConfigIndex,
+    Source,
+)
+
+# Filter name -> values of a router it can match
+FACETS: Dict[str, Callable[[Any], List[str]]] = {
+    "entryPoint": lambda entry: list(getattr(entry, "entryPoints", None) or []),
+    "service": lambda entry: (
+        [entry.service] if getattr(entry, "service", None) else []
+    ),
+    "middleware": lambda entry: list(getattr(entry, "middlewares", None) or []),
+    "tlsResolver": lambda entry: (
+        [entry.tls.certResolver]
+        if getattr(entry, "tls", None) and entry.tls.certResolver
+        else []
+    ),
+}
+
+# Sorts after every character a name can continue a prefix with
+_PREFIX_END = "\U0010ffff"
+
+
+def encode_cursor(name: str) -> str:
+    return base64.urlsafe_b64encode(name.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return base64.b64decode(padded, altchars=b"-_", validate=True).decode()
+    except ValueError:
+        raise ValueError("Invalid cursor")
+
+
+class ListIndex(ConfigIndex):
+    """
+    Sorted names and filter postings of every config list, for paginated
+    and filtered list endpoints.
+
+    Names are kept sorted (a stable order for cursors) and routers are
+    indexed by entryPoint, service, middleware and TLS resolver, so a page
+    costs a bisect for unfiltered lists and a set intersection of the
+    postings for filtered ones, instead of a scan over every entry.
+    """
+
+    SOURCES = HTTP_SOURCES + TCP_UDP_SOURCES
+
+    def __init__(self, catalog: ConfigCatalog) -> None:
+        # Source -> sorted names; None while a resync rebuilds it lazily
+        self._sorted: Dict[Source, Optional[List[str]]] = {}
+        # Source -> facet -> value -> names
+        self._postings: Dict[Source, Dict[str, Dict[str, Set[str]]]] = {}
+        super().__init__(catalog)
+
+    # -------------------- INDEXING --------------------
+    def _resync(self, source: Source) -> None:
+        # Bulk changes: sort once afterwards instead of inserting one by one
+        self._sorted[source] = None
+        super()._resync(source)
+
+    def _add(self, source: Source, name: str, entry: Any) -> None:
+        names = self._sorted.get(source)
+        if names is not None:
+            insort(names, name)
+        if source[1] == "routers":
+            postings = self._postings.setdefault(source, {})
+            for facet, values_of in FACETS.items():
+                for value in values_of(entry):
+                    postings.setdefault(facet, {}).setdefault(value, set()).add(name)
+
+    def _remove(self, source: Source, name: str, entry: Any) -> None:
+        names = self._sorted.get(source)
+        if names is not None:
+            del names[bisect_left(names, name)]
+        if source[1] == "routers":
+            postings = self._postings.get(source, {})
+            for facet, values_of in FACETS.items():
+                for value in values_of(entry):
+                    matches = postings.get(facet, {}).get(value)
+                    if matches is not None:
+                        matches.discard(name)
+                        if not matches:
+                            del postings[facet][value]
+
+    def _sorted_names(self, source: Source) -> List[str]:
+        names = self._sorted.get(source)
+        if names is None:
+            names = self._sorted[source] = sorted(self._entries[source])
+        return names
+
+    # -------------------- QUERY --------------------
+    def page(
+        self,
+        source: Source,
+        limit: int,
+        cursor: Optional[str] = None,
+        prefix: Optional[str] = None,
+        filters: Optional[Dict[str, str]] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Returns up to `limit` entries sorted by name, after `cursor`, whose
+        name starts with `prefix` and that match every facet filter.
+        `fields` limits each item to those fields (plus its name).
+        Raises ValueError on an invalid cursor or filter.
+        """
+        filters = {facet: value for facet, value in (filters or {}).items() if value}
+        unknown = set(filters) - set(FACETS)
+        if unknown:
+            raise ValueError(f"Unknown filter(s): {', '.join(sorted(unknown))}")
+        if filters and source[1] != "routers":
+            raise ValueError("Filters other than the name prefix apply to routers")
+        after = decode_cursor(cursor) if cursor else None
+
+        self.sync()
+        with self._lock:
+            if filters:
+                names, total, more = self._page_filtered(
+                    source, limit, after, prefix, filters
+                )
+            else:
+                names, total, more = self._page_sorted(source, limit, after, prefix)
+            entries = self._entries[source]
+            include = set(fields) if fields else None
+            items = [
+                {
+                    "name": name,
+                    **entries[name].model_dump(exclude_none=True, include=include),
+                }
+                for name in names
+            ]
+        return {
+            "items": items,
+            "next_cursor": encode_cursor(names[-1]) if more and names else None,
+            "total": total,
+        }
+
+    def _page_sorted(
+        self, source: Source, limit: int, after: Optional[str], prefix: Optional[str]
+    ):
+        names = self._sorted_names(source)
+        low, high = 0, len(names)
+        if prefix:
+            low = bisect_left(names, prefix)
+            high = bisect_left(names, prefix + _PREFIX_END, low)
+        start = max(low, bisect_right(names, after, low, high)) if after else low
+        end = min(high, start + limit)
+        return names[start:end], high - low, end < high
+
+    def _page_filtered(
+        self,
+        source: Source,
+        limit: int,
+        after: Optional[str],
+        prefix: Optional[str],
+        filters: Dict[str, str],
+    ):
+        postings = self._postings.get(source, {})
+        matches = sorted(
+            (
+                postings.get(facet, {}).get(value, set())
+                for facet, value in filters.items()
+            ),
+            key=len,
+        )
+        matched = matches[0].intersection(*matches[1:])
+        if prefix:
+            matched = {name for name in matched if name.startswith(prefix)}
+        remaining = [name for name in matched if name > after] if after else matched
+        names = heapq.nsmallest(limit + 1, remaining)
+        return names[:limit], len(matched), len(names) > limit
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **super().stats(),
+            "postings": sum(
+                len(values)
+                for facets in self._postings.values()
+                for values in facets.values()
+            ),
+        }
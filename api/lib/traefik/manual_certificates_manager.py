@@ -1,12 +1,16 @@
 import os
 import shutil
+import threading
 from typing import Dict, List
 
-import yaml
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 from core.config import settings
+from lib.traefik import yaml_io
+from lib.traefik.async_io import AsyncManager
+from lib.traefik.config_writer import atomic_write
+from lib.traefik.publisher import publisher
 
 router = APIRouter()
 
@@ -38,34 +42,37 @@ class ManualCertificatesManager:
 
     def __init__(self) -> None:
         self.config_certs_path = os.path.join(settings.traefik_config_path, "certs")
-        self.dynamic_tls_file = os.path.join(
-            settings.traefik_config_path, "dynamic", "tls-manual.yml"
-        )
+        self.dynamic_tls_file = str(publisher.path("tls-manual.yml"))
 
         os.makedirs(self.config_certs_path, exist_ok=True)
         os.makedirs(os.path.dirname(self.dynamic_tls_file), exist_ok=True)
 
+        self._lock = threading.RLock()
+        self.aio = AsyncManager(self)
+
     # -------------------------
     # Public API
     # -------------------------
 
     def add_certificate(self, domain: str, cert_pem: bytes, key_pem: bytes) -> None:
-        cert_dir = self._perspective_domain_dir(domain)
-        os.makedirs(cert_dir, exist_ok=True)
+        with self._lock:
+            cert_dir = self._perspective_domain_dir(domain)
+            os.makedirs(cert_dir, exist_ok=True)
 
-        cert_path = os.path.join(cert_dir, "fullchain.pem")
-        key_path = os.path.join(cert_dir, "privkey.pem")
+            cert_path = os.path.join(cert_dir, "fullchain.pem")
+            key_path = os.path.join(cert_dir, "privkey.pem")
 
-        self._write_file(cert_path, cert_pem)
-        self._write_file(key_path, key_pem)
+            self._write_file(cert_path, cert_pem)
+            self._write_file(key_path, key_pem)
 
-        self._sync_dynamic_tls()
+            self._sync_dynamic_tls()
 
     def remove_certificate(self, domain: str) -> None:
-        cert_dir = self._perspective_domain_dir(domain)
-        if os.path.isdir(cert_dir):
-            shutil.rmtree(cert_dir)
-            self._sync_dynamic_tls()
+        with self._lock:
+            cert_dir = self._perspective_domain_dir(domain)
+            if os.path.isdir(cert_dir):
+                shutil.rmtree(cert_dir)
+                self._sync_dynamic_tls()
 
     def list_certificates(self) -> List[ManualCertificate]:
         certs: List[ManualCertificate] = []
@@ -128,8 +135,9 @@ class ManualCertificatesManager:
         ]
         data: Dict = {"tls": {"certificates": certificates}}
 
-        with open(self.dynamic_tls_file, "w") as f:
-            yaml.safe_dump(data, f, sort_keys=False)
+        atomic_write(
+            self.dynamic_tls_file, lambda f: yaml_io.dump(data, f, sort_keys=False)
+        )
 
     def _domain_dir(self, domain: str) -> str:
         return os.path.join("/certs", domain)
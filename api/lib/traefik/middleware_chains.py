@@ -0,0 +1,203 @@
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from lib.traefik.config_index import ConfigCatalog, ConfigIndex, Source
+from lib.traefik.ref_graph import FILE_PROVIDER
+
+
+@dataclass(frozen=True)
+class ResolvedChain:
+    # Middlewares a request goes through, in order, chains expanded
+    middlewares: Tuple[str, ...]
+    # Every middleware looked up on the way, defined or not
+    includes: FrozenSet[str]
+    errors: Tuple[str, ...]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"middlewares": list(self.middlewares), "errors": list(self.errors)}
+
+
+def _local_name(reference: str) -> Optional[str]:
+    """The panel's middleware a reference names, None for other providers."""
+    name, _, provider = reference.partition("@")
+    return name if not provider or provider == FILE_PROVIDER else None
+
+
+class MiddlewareChains(ConfigIndex):
+    """
+    The effective middleware list of every HTTP router, with `chain`
+    middlewares expanded recursively and cycles reported.
+
+    Expansions are memoized per middleware and per router. Each memoized
+    chain is registered under every middleware it includes (missing ones
+    too, so defining them later counts), and a write only drops the chains
+    that include the written middleware, or the written router's own.
+    """
+
+    SOURCES = (("http", "routers"), ("http", "middlewares"))
+
+    def __init__(self, catalog: ConfigCatalog) -> None:
+        self._middleware_chains: Dict[str, ResolvedChain] = {}
+        self._router_chains: Dict[str, ResolvedChain] = {}
+        # Middleware -> memoized middleware/router chains that include it
+        self._middleware_users: Dict[str, Set[str]] = {}
+        self._router_users: Dict[str, Set[str]] = {}
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        super().__init__(catalog)
+
+    # -------------------- INDEXING --------------------
+    def _add(self, source: Source, name: str, entry: Any) -> None:
+        self._invalidate(source, name)
+
+    def _remove(self, source: Source, name: str, entry: Any) -> None:
+        self._invalidate(source, name)
+
+    def _invalidate(self, source: Source, name: str) -> None:
+        if source[1] == "routers":
+            self._forget(self._router_chains, self._router_users, name)
+            return
+        for key in list(self._middleware_users.get(name, ())):
+            self._forget(self._middleware_chains, self._middleware_users, key)
+        for key in list(self._router_users.get(name, ())):
+            self._forget(self._router_chains, self._router_users, key)
+        self._forget(self._middleware_chains, self._middleware_users, name)
+
+    def _forget(
+        self,
+        memo: Dict[str, ResolvedChain],
+        users: Dict[str, Set[str]],
+        key: str,
+    ) -> None:
+        chain = memo.pop(key, None)
+        if chain is None:
+            return
+        self.invalidations += 1
+        for included in chain.includes:
+            keys = users.get(included)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del users[included]
+
+    @staticmethod
+    def _remember(
+        memo: Dict[str, ResolvedChain],
+        users: Dict[str, Set[str]],
+        key: str,
+        chain: ResolvedChain,
+    ) -> None:
+        memo[key] = chain
+        for included in chain.includes:
+            users.setdefault(included, set()).add(key)
+
+    # -------------------- RESOLUTION --------------------
+    def _expand(self, name: str, stack: List[str]) -> Tuple[ResolvedChain, bool]:
+        """
+        Resolves middleware `name` reached through `stack`. Also returns
+        whether a cycle through `stack` was cut short, in which case the
+        result depends on the path taken and is not memoized.
+        """
+        memoized = self._middleware_chains.get(name)
+        if memoized is not None:
+            self.hits += 1
+            return memoized, False
+        self.misses += 1
+
+        if name in stack:
+            cycle = " -> ".join(stack[stack.index(name) :] + [name])
+            return ResolvedChain((), frozenset([name]), (f"Cycle: {cycle}",)), True
+        entry = self._entries[("http", "middlewares")].get(name)
+        if entry is None:
+            error = f"Middleware '{name}' is not defined"
+            return ResolvedChain((), frozenset([name]), (error,)), False
+        chain = getattr(entry, "chain", None)
+        if chain is None:
+            resolved = ResolvedChain((name,), frozenset([name]), ())
+            self._remember(
+                self._middleware_chains, self._middleware_users, name, resolved
+            )
+            return resolved, False
+
+        resolved, cyclic = self._concat(chain.get("middlewares") or [], stack + [name])
+        resolved = ResolvedChain(
+            resolved.middlewares, resolved.includes | {name}, resolved.errors
+        )
+        if not cyclic:
+            self._remember(
+                self._middleware_chains, self._middleware_users, name, resolved
+            )
+        return resolved, cyclic
+
+    def _concat(
+        self, references: List[str], stack: List[str]
+    ) -> Tuple[ResolvedChain, bool]:
+        middlewares: List[str] = []
+        includes: Set[str] = set()
+        errors: List[str] = []
+        cyclic = False
+        for reference in references:
+            name = _local_name(reference)
+            if name is None:
+                # Another provider's middleware: applied, but not expandable here
+                middlewares.append(reference)
+                continue
+            resolved, cut = self._expand(name, stack)
+            middlewares.extend(resolved.middlewares)
+            includes |= resolved.includes
+            errors.extend(error for error in resolved.errors if error not in errors)
+            cyclic = cyclic or cut
+        resolved = ResolvedChain(tuple(middlewares), frozenset(includes), tuple(errors))
+        return resolved, cyclic
+
+    def _router_chain(self, name: str) -> Optional[ResolvedChain]:
+        memoized = self._router_chains.get(name)
+        if memoized is not None:
+            self.hits += 1
+            return memoized
+        router = self._entries[("http", "routers")].get(name)
+        if router is None:
+            return None
+        self.misses += 1
+        resolved, _ = self._concat(list(router.middlewares or []), [])
+        self._remember(self._router_chains, self._router_users, name, resolved)
+        return resolved
+
+    # -------------------- QUERY --------------------
+    def router(self, name: str) -> Optional[Dict[str, Any]]:
+        """A router's effective middlewares, or None if it does not exist."""
+        self.sync()
+        with self._lock:
+            resolved = self._router_chain(name)
+            return resolved.to_dict() if resolved is not None else None
+
+    def routers(self) -> Dict[str, Dict[str, Any]]:
+        """Every router's effective middlewares, by router name."""
+        self.sync()
+        with self._lock:
+            return {
+                name: self._router_chain(name).to_dict()
+                for name in sorted(self._entries[("http", "routers")])
+            }
+
+    def middleware(self, name: str) -> Optional[Dict[str, Any]]:
+        """What a middleware expands to, or None if it does not exist."""
+        self.sync()
+        with self._lock:
+            if name not in self._entries[("http", "middlewares")]:
+                return None
+            resolved, _ = self._expand(name, [])
+            return resolved.to_dict()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **super().stats(),
+            "memoized_routers": len(self._router_chains),
+            "memoized_middlewares": len(self._middleware_chains),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,243 @@
+import asyncio
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from core.config import settings
+from lib.traefik.async_io import run_blocking
+from lib.traefik.config_cache import FileSignature, file_signature
+from lib.traefik.config_writer import add_write_listener, atomic_write
+
+logger = logging.getLogger(__name__)
+
+# File types Traefik's file provider loads
+CONFIG_SUFFIXES = (".yaml", ".yml", ".toml")
+
+
+class ConfigPublisher:
+    """
+    Debounces config edits before they reach Traefik's watched directory.
+
+    When `traefik_publish_interval` is > 0, the managers write to a staging
+    copy of dynamic/ (<config>/staging/dynamic). A background task copies the
+    staged files that changed into the live dynamic/ directory at most once
+    per interval, so a burst of edits costs Traefik a single reload.
+    `publish()` pushes pending edits immediately. With an interval of 0 the
+    managers write straight into dynamic/ and publishing is a no-op.
+    """
+
+    def __init__(self) -> None:
+        self.interval = settings.traefik_publish_interval
+        self.enabled = self.interval > 0
+        self.live_dir = Path(settings.traefik_config_path, "dynamic")
+        self.staging_dir = Path(settings.traefik_config_path, "staging", "dynamic")
+        self.manifest_file = self.staging_dir.parent / "published.json"
+
+        self._lock = threading.Lock()
+        self._publish_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._dirty_since: Optional[float] = None
+        # Staged file (relative path) -> signature at its last publish
+        self._published: Dict[str, Optional[FileSignature]] = {}
+
+        # Metrics
+        self.edits = 0
+        self.pending_edits = 0
+        self.publishes = 0
+        self.reloads = 0
+        self.files_copied = 0
+        self.files_removed = 0
+        self.last_publish_at: Optional[float] = None
+        self.last_latency_ms = 0.0
+        self.total_latency_ms = 0.0
+        self.last_duration_ms = 0.0
+
+        if self.enabled:
+            self.staging_dir.mkdir(parents=True, exist_ok=True)
+            self._published = dict.fromkeys(self._load_manifest())
+            add_write_listener(self._on_write)
+
+    # -------------------- PATHS --------------------
+    @property
+    def dynamic_dir(self) -> Path:
+        """Directory the managers write to: staging when enabled, else live."""
+        return self.staging_dir if self.enabled else self.live_dir
+
+    def path(self, relative: str) -> Path:
+        """
+        Returns where a manager should keep `relative` (a file or directory
+        under dynamic/). The first time staging is used, the live copy is
+        seeded into it so no existing config is lost.
+        """
+        if not self.enabled:
+            return self.live_dir / relative
+
+        staged = self.staging_dir / relative
+        live = self.live_dir / relative
+        if not staged.exists() and live.exists():
+            staged.parent.mkdir(parents=True, exist_ok=True)
+            if live.is_dir():
+                shutil.copytree(live, staged)
+            else:
+                shutil.copy2(live, staged)
+        return staged
+
+    # -------------------- STAGING --------------------
+    def _on_write(self, path: Path) -> None:
+        if self.staging_dir not in path.parents:
+            return
+        with self._lock:
+            self.edits += 1
+            self.pending_edits += 1
+            if self._dirty_since is None:
+                self._dirty_since = time.monotonic()
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty_since is not None
+
+    @contextmanager
+    def hold(self) -> Iterator[None]:
+        """
+        Keeps publishes out while an edit spanning several files is written,
+        so the live directory gets all of it or none of it.
+        """
+        with self._publish_lock:
+            yield
+
+    # -------------------- PUBLISH --------------------
+    def publish(self) -> Dict[str, Any]:
+        """Copies changed staged files into the live directory right away."""
+        if not self.enabled:
+            return {"published": False, "reason": "staging disabled"}
+
+        with self._publish_lock:
+            started = time.monotonic()
+            with self._lock:
+                dirty_since = self._dirty_since
+                self._dirty_since = None
+                self.pending_edits = 0
+
+            staged = self._scan_staging()
+            copied = 0
+            for relative, signature in staged.items():
+                if self._published.get(relative) != signature:
+                    if self._copy_to_live(relative):
+                        copied += 1
+
+            removed = 0
+            for relative in self._published.keys() - staged.keys():
+                try:
+                    os.unlink(self.live_dir / relative)
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+
+            self._published = staged
+            self._save_manifest()
+
+            finished = time.monotonic()
+            self.publishes += 1
+            if copied or removed:
+                self.reloads += 1
+            self.files_copied += copied
+            self.files_removed += removed
+            self.last_publish_at = time.time()
+            self.last_duration_ms = (finished - started) * 1000
+            if dirty_since is not None:
+                self.last_latency_ms = (finished - dirty_since) * 1000
+                self.total_latency_ms += self.last_latency_ms
+
+        return {"published": True, "copied": copied, "removed": removed}
+
+    def _scan_staging(self) -> Dict[str, Optional[FileSignature]]:
+        staged: Dict[str, Optional[FileSignature]] = {}
+        for root, _, files in os.walk(self.staging_dir):
+            for file_name in files:
+                if file_name.startswith(".") or not file_name.endswith(
+                    CONFIG_SUFFIXES
+                ):
+                    continue
+                path = Path(root, file_name)
+                staged[str(path.relative_to(self.staging_dir))] = file_signature(path)
+        return staged
+
+    def _copy_to_live(self, relative: str) -> bool:
+        """Atomically copies one staged file to live; skips identical content."""
+        source = self.staging_dir / relative
+        target = self.live_dir / relative
+        try:
+            content = source.read_text()
+        except FileNotFoundError:
+            return False
+        if target.exists() and target.read_text() == content:
+            return False
+        target.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(target, lambda f: f.write(content))
+        return True
+
+    def _load_manifest(self) -> list:
+        try:
+            with open(self.manifest_file, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return []
+
+    def _save_manifest(self) -> None:
+        published = sorted(self._published)
+        atomic_write(self.manifest_file, lambda f: json.dump(published, f))
+
+    # -------------------- BACKGROUND TASK --------------------
+    def start(self) -> None:
+        """Starts the periodic publish loop (call from the app startup)."""
+        if self.enabled and self._task is None:
+            # Push anything staged while the panel was down
+            self._dirty_since = time.monotonic()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stops the loop and publishes any pending edits."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+            if self.dirty:
+                await run_blocking(self.publish)
+
+    async def _run(self) -> None:
+        while True:
+            if self.dirty:
+                try:
+                    await run_blocking(self.publish)
+                except Exception:
+                    logger.exception("Error publishing staged config")
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns reloads avoided and publish latency metrics."""
+        avg_latency_ms = self.total_latency_ms / self.publishes if self.publishes else 0
+        return {
+            "enabled": self.enabled,
+            "interval": self.interval,
+            "pending": self.dirty,
+            "pending_edits": self.pending_edits,
+            "edits": self.edits,
+            "publishes": self.publishes,
+            # Each edit would have been one Traefik reload without staging
+            "reloads": self.reloads,
+            "reloads_avoided": max(0, self.edits - self.reloads),
+            "files_copied": self.files_copied,
+            "files_removed": self.files_removed,
+            "last_publish_at": self.last_publish_at,
+            "last_latency_ms": round(self.last_latency_ms, 2),
+            "avg_latency_ms": round(avg_latency_ms, 2),
+            "last_duration_ms": round(self.last_duration_ms, 2),
+        }
+
+
+publisher = ConfigPublisher()
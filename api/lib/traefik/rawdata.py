@@ -0,0 +1,177 @@
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+    logger.warning(
+        "ijson is not installed: /api/rawdata is buffered and parsed whole "
+        "instead of streamed (pip install -r requirements.txt)"
+    )
+
+# Whether /api/rawdata can be projected while it streams in
+STREAMING = ijson is not None
+
+
+@dataclass
+class RawdataSummary:
+    """
+    The parts of a Traefik /api/rawdata document the panel uses: per-entry
+    status and errors of every section ("routers", "tcpServices", ...), and
+    the provider errors. Everything else in the document is never kept.
+    """
+
+    # Section -> entry name -> status ("enabled", "disabled", "warning")
+    statuses: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    # Section -> entry name -> error messages, for entries that have any
+    errors: Dict[str, Dict[str, List[str]]] = field(default_factory=dict)
+
+    @property
+    def provider_errors(self) -> Dict[str, List[str]]:
+        return self.errors.get("providers", {})
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        return {
+            section: len(entries)
+            for section, entries in self.statuses.items()
+            if section != "providers"
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "counts": self.counts,
+            "provider_errors": self.provider_errors,
+            "statuses": {
+                section: entries
+                for section, entries in self.statuses.items()
+                if section != "providers"
+            },
+            "errors": {
+                section: entries
+                for section, entries in self.errors.items()
+                if section != "providers"
+            },
+        }
+
+
+def _json_error(error: Exception) -> ValueError:
+    # yajl messages span several lines, pointing at the offending byte
+    lines = str(error).strip().splitlines()
+    return ValueError(f"Invalid JSON: {lines[0] if lines else 'parse error'}")
+
+
+def _error_list(value: Any) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, list):
+        return [str(item) for item in value]
+    return [str(value)]
+
+
+def summarize(data: Dict[str, Any]) -> RawdataSummary:
+    """Builds the summary of an already parsed rawdata document."""
+    summary = RawdataSummary()
+    for section, entries in data.items():
+        if not isinstance(entries, dict):
+            continue
+        statuses = summary.statuses.setdefault(section, {})
+        for name, entry in entries.items():
+            if not isinstance(entry, dict):
+                continue
+            statuses[name] = entry.get("status", "")
+            errors = _error_list(entry.get("error"))
+            if errors:
+                summary.errors.setdefault(section, {})[name] = errors
+    return summary
+
+
+class RawdataProjector:
+    """
+    Builds a RawdataSummary from rawdata chunks as they arrive.
+
+    With ijson installed the document is parsed incrementally. Only the
+    `status` and `error` fields at section.entry level are kept, so memory
+    stays flat however large the document is. Without ijson, chunks are
+    buffered and parsed at the end.
+    """
+
+    def __init__(self) -> None:
+        self.summary = RawdataSummary()
+        self._buffer: List[bytes] = []
+        self._events: Any = None
+        self._parser: Any = None
+        if STREAMING:
+            self._events = ijson.sendable_list()
+            self._parser = ijson.basic_parse_coro(self._events)
+
+        # Parser state: nesting depth and the keys on the path at depth 1-3
+        self._depth = 0
+        self._section = ""
+        self._entry = ""
+        self._field = ""
+
+    def feed(self, chunk: bytes) -> None:
+        """Parses the next chunk; raises ValueError on malformed JSON."""
+        if self._parser is None:
+            self._buffer.append(chunk)
+            return
+        try:
+            self._parser.send(chunk)
+        except ijson.JSONError as e:
+            raise _json_error(e) from e
+        self._consume()
+
+    def close(self) -> RawdataSummary:
+        """Finishes parsing; raises ValueError on malformed JSON."""
+        if self._parser is None:
+            data = json.loads(b"".join(self._buffer))
+            self._buffer = []
+            self.summary = summarize(data if isinstance(data, dict) else {})
+            return self.summary
+        try:
+            self._parser.close()
+        except ijson.JSONError as e:
+            raise _json_error(e) from e
+        self._consume()
+        return self.summary
+
+    def _consume(self) -> None:
+        summary = self.summary
+        depth = self._depth
+        for event, value in self._events:
+            if event == "map_key":
+                if depth == 1:
+                    self._section = value
+                elif depth == 2:
+                    self._entry = value
+                elif depth == 3:
+                    self._field = value
+                continue
+            if event in ("start_map", "start_array"):
+                if event == "start_map" and depth == 1:
+                    summary.statuses.setdefault(self._section, {})
+                elif event == "start_map" and depth == 2 and self._section:
+                    # An entry: counted even if it has no status
+                    summary.statuses[self._section][self._entry] = ""
+                elif event == "start_array" and depth == 1:
+                    self._section = ""  # not a section of named entries
+                depth += 1
+            elif event in ("end_map", "end_array"):
+                depth -= 1
+            elif not self._section:
+                continue
+            elif depth == 3 and self._field == "status":
+                summary.statuses[self._section][self._entry] = value
+            elif (depth == 3 or depth == 4) and self._field == "error":
+                if event == "string":
+                    summary.errors.setdefault(self._section, {}).setdefault(
+                        self._entry, []
+                    ).append(value)
+        self._depth = depth
+        self._events.clear()
@@ -0,0 +1,291 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from lib.traefik.changes import EntryChange
+from lib.traefik.config_index import ConfigCatalog, ConfigIndex, Source
+
+# (protocol, section, name) of a config entry
+Node = Tuple[str, str, str]
+
+# Provider suffix of the entries the panel writes (`name@file`)
+FILE_PROVIDER = "file"
+
+
+def _target(protocol: str, section: str, reference: str) -> Optional[Node]:
+    """
+    The entry a reference names, or None for entries of other providers
+    (`api@internal`, `auth@docker`), which cannot be checked here.
+    """
+    name, _, provider = reference.partition("@")
+    if provider and provider != FILE_PROVIDER:
+        return None
+    return (protocol, section, name)
+
+
+def references(source: Source, entry: Any) -> Iterator[Node]:
+    """The services and middlewares an entry uses."""
+    protocol, section = source
+    if section == "routers":
+        if getattr(entry, "service", None):
+            target = _target(protocol, "services", entry.service)
+            if target is not None:
+                yield target
+        # TCP middlewares are not managed by the panel
+        if protocol == "http":
+            for middleware in getattr(entry, "middlewares", None) or []:
+                target = _target(protocol, "middlewares", middleware)
+                if target is not None:
+                    yield target
+    elif section == "middlewares":
+        chain = getattr(entry, "chain", None) or {}
+        for middleware in chain.get("middlewares") or []:
+            target = _target(protocol, "middlewares", middleware)
+            if target is not None:
+                yield target
+
+
+def describe(node: Node) -> str:
+    protocol, section, name = node
+    return f"{protocol} {section[:-1]} '{name}'"
+
+
+@dataclass
+class WriteCheck:
+    """What a write would do to references, before it is applied."""
+
+    # Entries deleted while others still use them
+    breaks: List[str] = field(default_factory=list)
+    # Services and middlewares used by the written entries that do not exist
+    missing: List[str] = field(default_factory=list)
+
+
+class ReferenceConflict(Exception):
+    """A write that would delete services or middlewares still in use."""
+
+    def __init__(self, breaks: List[str]) -> None:
+        super().__init__("; ".join(breaks))
+        self.breaks = breaks
+
+
+class ReferenceCheck:
+    """
+    A reference check for the managers to run inside their write, under
+    the writer's lock, so no other write can add a reference between the
+    check and the delete. Raises ReferenceConflict for broken references
+    unless `force`, and keeps what to warn about in `warnings`.
+    """
+
+    def __init__(
+        self,
+        graph: "ReferenceGraph",
+        protocol: str,
+        changes: Sequence[EntryChange],
+        force: bool = False,
+    ) -> None:
+        self.graph = graph
+        self.protocol = protocol
+        self.changes = changes
+        self.force = force
+        self.warnings: List[str] = []
+
+    def __call__(self, applied: Sequence[EntryChange] = ()) -> None:
+        """`applied`: changes of earlier writes that are not indexed yet."""
+        result = self.graph.check(self.protocol, self.changes, applied)
+        if result.breaks and not self.force:
+            raise ReferenceConflict(result.breaks)
+        self.warnings = result.breaks + result.missing
+
+
+class ReferenceGraph(ConfigIndex):
+    """
+    Which services and middlewares every HTTP/TCP/UDP router (and every
+    chain middleware) uses, indexed in both directions.
+
+    Each edge is kept under its source entry and its target, so "what uses
+    X" is a lookup of X's dependents and re-indexing one entry only touches
+    its own edges. Targets that do not exist (dangling references) and
+    services and middlewares nothing uses (orphans) are kept up to date as
+    entries come and go.
+    """
+
+    SOURCES = (
+        ("http", "routers"),
+        ("http", "services"),
+        ("http", "middlewares"),
+        ("tcp", "routers"),
+        ("tcp", "services"),
+        ("udp", "routers"),
+        ("udp", "services"),
+    )
+
+    def __init__(self, catalog: ConfigCatalog) -> None:
+        # Target -> entries using it
+        self._dependents: Dict[Node, Set[Node]] = {}
+        # Entry -> targets it uses
+        self._references: Dict[Node, Set[Node]] = {}
+        # Targets used but not defined
+        self._missing: Set[Node] = set()
+        # Services and middlewares defined but unused
+        self._orphans: Set[Node] = set()
+        super().__init__(catalog)
+
+    # -------------------- INDEXING --------------------
+    def _exists(self, node: Node) -> bool:
+        entries = self._entries.get(node[:2])
+        return entries is not None and node[2] in entries
+
+    def _add(self, source: Source, name: str, entry: Any) -> None:
+        node = (*source, name)
+        if source[1] != "routers":
+            self._missing.discard(node)
+            if not self._dependents.get(node):
+                self._orphans.add(node)
+        targets = set(references(source, entry))
+        self._references[node] = targets
+        for target in targets:
+            self._dependents.setdefault(target, set()).add(node)
+            self._orphans.discard(target)
+            if not self._exists(target):
+                self._missing.add(target)
+
+    def _remove(self, source: Source, name: str, entry: Any) -> None:
+        node = (*source, name)
+        for target in self._references.pop(node, ()):
+            dependents = self._dependents.get(target)
+            if dependents is None:
+                continue
+            dependents.discard(node)
+            if not dependents:
+                del self._dependents[target]
+                self._missing.discard(target)
+                if self._exists(target):
+                    self._orphans.add(target)
+        self._orphans.discard(node)
+        if self._dependents.get(node):
+            self._missing.add(node)
+
+    # -------------------- QUERY --------------------
+    def dependents(self, protocol: str, section: str, name: str) -> List[Node]:
+        """Entries that use an entry, whether or not it exists."""
+        self.sync()
+        with self._lock:
+            return sorted(self._dependents.get((protocol, section, name), ()))
+
+    def node(self, protocol: str, section: str, name: str) -> Dict[str, Any]:
+        """An entry with what it uses and what uses it."""
+        node = (protocol, section, name)
+        self.sync()
+        with self._lock:
+            return {
+                **self._node(node),
+                "exists": self._exists(node),
+                "references": [
+                    {**self._node(target), "exists": self._exists(target)}
+                    for target in sorted(self._references.get(node, ()))
+                ],
+                "dependents": [
+                    self._node(dependent)
+                    for dependent in sorted(self._dependents.get(node, ()))
+                ],
+            }
+
+    def dangling(self) -> List[Dict[str, Any]]:
+        """Services and middlewares used but not defined, with their users."""
+        self.sync()
+        with self._lock:
+            return [
+                {
+                    **self._node(target),
+                    "dependents": [
+                        self._node(dependent)
+                        for dependent in sorted(self._dependents[target])
+                    ],
+                }
+                for target in sorted(self._missing)
+            ]
+
+    def orphans(self) -> List[Dict[str, Any]]:
+        """Services and middlewares that nothing uses."""
+        self.sync()
+        with self._lock:
+            return [self._node(node) for node in sorted(self._orphans)]
+
+    def check(
+        self,
+        protocol: str,
+        changes: Sequence[EntryChange],
+        applied: Sequence[EntryChange] = (),
+    ) -> WriteCheck:
+        """
+        Reports the references a write would break or leave unresolved.
+        Changes within the same write see each other: a batch deleting a
+        router and its service breaks nothing, and a router re-pointed away
+        from a deleted service no longer uses it. `applied` are changes
+        written just before (earlier writes of the same file flush) that the
+        index has not seen yet; they count as the state the write starts from.
+        """
+        self.sync()
+        with self._lock:
+            before = {
+                (protocol, section, name): data for section, name, data in applied
+            }
+            written = {
+                (protocol, section, name): data for section, name, data in changes
+            }
+            after = {**before, **written}
+
+            def existed(node: Node) -> bool:
+                if node in before:
+                    return before[node] is not None
+                return self._exists(node)
+
+            def exists(node: Node) -> bool:
+                if node in after:
+                    return after[node] is not None
+                return self._exists(node)
+
+            # Entries written here or just before use what their new data does
+            uses = {
+                node: set(references(node[:2], data))
+                for node, data in after.items()
+                if data is not None
+            }
+
+            result = WriteCheck()
+            for node, data in written.items():
+                if data is None:
+                    if not existed(node):
+                        continue
+                    users = {
+                        user
+                        for user in self._dependents.get(node, ())
+                        if user not in after
+                    }
+                    users.update(
+                        user for user, targets in uses.items() if node in targets
+                    )
+                    if users:
+                        result.breaks.append(
+                            f"{describe(node)} is used by "
+                            + ", ".join(describe(user) for user in sorted(users))
+                        )
+                    continue
+                for target in sorted(uses[node]):
+                    if not exists(target):
+                        result.missing.append(
+                            f"{describe(node)} uses undefined {describe(target)}"
+                        )
+            return result
+
+    @staticmethod
+    def _node(node: Node) -> Dict[str, str]:
+        protocol, section, name = node
+        return {"protocol": protocol, "section": section, "name": name}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **super().stats(),
+            "edges": sum(len(targets) for targets in self._references.values()),
+            "dangling": len(self._missing),
+            "orphans": len(self._orphans),
+        }
@@ -0,0 +1,362 @@
+from bisect import bisect_left
+from dataclasses import dataclass
+from itertools import chain, product
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
+
+from lib.traefik.rule_parser import (
+    And,
+    Matcher,
+    Node,
+    Not,
+    Or,
+    RuleSyntaxError,
+    host_keys,
+    parse_rule,
+    path_prefixes,
+)
+from lib.traefik.rules import normalize_host
+
+# (negated, matcher); a rule in DNF is a set of conjunctions of literals
+Literal = Tuple[bool, Matcher]
+Conjunction = FrozenSet[Literal]
+
+# Rules whose disjunctive normal form grows past this are not analyzed
+MAX_CONJUNCTIONS = 64
+
+# Sorts after every character a path can continue a prefix with
+_PREFIX_END = "\U0010ffff"
+
+# entryPoint of routers that do not list any (Traefik's default ones)
+DEFAULT_ENTRY_POINTS = "*"
+
+
+class _TooComplex(Exception):
+    pass
+
+
+def _dnf(node: Node, negated: bool = False) -> List[Conjunction]:
+    """The rule as an OR of ANDs of (possibly negated) matchers."""
+    if isinstance(node, Matcher):
+        if node.name == "PathPrefix" and "/" in node.args:
+            # Every path starts with "/": always true (never, when negated)
+            return [] if negated else [frozenset()]
+        return [frozenset([(negated, _normalized(node))])]
+    if isinstance(node, Not):
+        return _dnf(node.operand, not negated)
+    # De Morgan: a negated AND is an OR of negations, and vice versa
+    disjunction = isinstance(node, Or) != negated
+    parts = [_dnf(operand, negated) for operand in node.operands]
+    if disjunction:
+        terms = [term for part in parts for term in part]
+    else:
+        terms = [frozenset().union(*combination) for combination in product(*parts)]
+    if len(terms) > MAX_CONJUNCTIONS:
+        raise _TooComplex()
+    return terms
+
+
+def _normalized(matcher: Matcher) -> Matcher:
+    """Argument order and host/method case do not change what matches."""
+    if matcher.name in ("Host", "HostHeader"):
+        args = (normalize_host(arg) for arg in matcher.args)
+    elif matcher.name == "Method":
+        args = (arg.upper() for arg in matcher.args)
+    elif matcher.name in ("Path", "PathPrefix", "ClientIP"):
+        args = matcher.args
+    else:
+        return matcher
+    return Matcher(matcher.name, tuple(sorted(set(args))))
+
+
+def _literal(args: Tuple[str, ...]) -> bool:
+    return not any("{" in arg or arg.startswith("*") for arg in args)
+
+
+# -------------------- LITERAL RELATIONS --------------------
+def _implies(literal: Literal, other: Literal) -> bool:
+    """Whether every request matching `literal` matches `other`."""
+    if literal == other:
+        return True
+    (negated, a), (other_negated, b) = literal, other
+    if negated or other_negated or not (_literal(a.args) and _literal(b.args)):
+        return False
+    if a.name in ("Host", "HostHeader") and b.name == a.name:
+        return set(a.args) <= set(b.args)
+    if a.name == "Method" and b.name == "Method":
+        return set(a.args) <= set(b.args)
+    if a.name in ("Path", "PathPrefix") and b.name in ("Path", "PathPrefix"):
+        if b.name == "Path":
+            return a.name == "Path" and set(a.args) <= set(b.args)
+        return all(any(x.startswith(y) for y in b.args) for x in a.args)
+    return False
+
+
+def _disjoint(literal: Literal, other: Literal) -> bool:
+    """Whether no request can match both literals."""
+    (negated, a), (other_negated, b) = literal, other
+    if a == b:
+        return negated != other_negated
+    if negated or other_negated or not (_literal(a.args) and _literal(b.args)):
+        return False
+    if a.name in ("Host", "HostHeader", "Method") and b.name == a.name:
+        return not set(a.args) & set(b.args)
+    if a.name in ("Path", "PathPrefix") and b.name in ("Path", "PathPrefix"):
+        return not any(
+            _paths_overlap(a.name, x, b.name, y) for x in a.args for y in b.args
+        )
+    return False
+
+
+def _paths_overlap(kind: str, path: str, other_kind: str, other: str) -> bool:
+    if kind == "Path" and other_kind == "Path":
+        return path == other
+    if kind == "Path":
+        return path.startswith(other)
+    if other_kind == "Path":
+        return other.startswith(path)
+    return path.startswith(other) or other.startswith(path)
+
+
+def _covers(rule: FrozenSet[Conjunction], other: FrozenSet[Conjunction]) -> bool:
+    """Whether `rule` matches every request `other` matches."""
+    return all(
+        any(
+            all(any(_implies(b, a) for b in theirs) for a in ours) for ours in rule
+        )
+        for theirs in other
+    )
+
+
+def _overlaps(rule: FrozenSet[Conjunction], other: FrozenSet[Conjunction]) -> bool:
+    """Whether some request could match both rules."""
+    return any(
+        not any(_disjoint(a, b) for a in ours for b in theirs)
+        for ours in rule
+        for theirs in other
+    )
+
+
+# -------------------- ANALYSIS --------------------
+@dataclass(frozen=True)
+class _Route:
+    name: str
+    rule: str
+    priority: int
+    entry_points: Optional[FrozenSet[str]]
+    tls: bool
+    dnf: FrozenSet[Conjunction]
+    # Dispatch keys, for quick rejects before comparing rules
+    hosts: Optional[FrozenSet[str]]
+    prefixes: Optional[FrozenSet[str]]
+
+    def listens_on_all_of(self, other: "_Route") -> bool:
+        # Default entryPoints only cover routers on the default entryPoints
+        if self.entry_points is None or other.entry_points is None:
+            return self.entry_points == other.entry_points
+        return other.entry_points <= self.entry_points
+
+
+def _route(name: str, entry: Any) -> _Route:
+    tree = parse_rule(entry.rule)
+    return _Route(
+        name=name,
+        rule=entry.rule,
+        priority=entry.priority or len(entry.rule),
+        entry_points=frozenset(entry.entryPoints) if entry.entryPoints else None,
+        tls=entry.tls is not None,
+        dnf=frozenset(_dnf(tree)),
+        hosts=host_keys(tree),
+        prefixes=path_prefixes(tree),
+    )
+
+
+class _PrefixIndex:
+    """Routes by path prefix, to find those whose prefix can overlap."""
+
+    def __init__(self, routes: List[_Route]) -> None:
+        # Routes without a path prefix overlap any other
+        self.unconfined: List[_Route] = []
+        self.by_prefix: Dict[str, List[_Route]] = {}
+        for route in routes:
+            if route.prefixes is None:
+                self.unconfined.append(route)
+            for prefix in route.prefixes or ():
+                self.by_prefix.setdefault(prefix, []).append(route)
+        self.sorted = sorted(self.by_prefix)
+
+    def overlapping(self, route: _Route) -> List[_Route]:
+        found = list(self.unconfined)
+        for prefix in route.prefixes or ():
+            # Shorter prefixes of this one...
+            for end in range(1, len(prefix)):
+                found.extend(self.by_prefix.get(prefix[:end], ()))
+            # ...and the prefixes starting with it
+            start = bisect_left(self.sorted, prefix)
+            end = bisect_left(self.sorted, prefix + _PREFIX_END, start)
+            for other in self.sorted[start:end]:
+                found.extend(self.by_prefix[other])
+        return found
+
+
+def _rank(route: _Route) -> Tuple[int, str]:
+    """Traefik's order: highest priority first, then by name."""
+    return (-route.priority, route.name)
+
+
+def _may_cover(high: _Route, low: _Route) -> bool:
+    """Whether the hosts and path prefixes the rules require allow coverage."""
+    if high.hosts is not None:
+        if low.hosts is None or not low.hosts <= high.hosts:
+            return False
+    if high.prefixes is not None:
+        if low.prefixes is None or not all(
+            any(path.startswith(prefix) for prefix in high.prefixes)
+            for path in low.prefixes
+        ):
+            return False
+    return True
+
+
+def _may_overlap(route: _Route, other: _Route) -> bool:
+    """Whether the hosts and path prefixes the rules require allow overlap."""
+    if route.hosts is not None and other.hosts is not None:
+        if not route.hosts & other.hosts:
+            return False
+    if route.prefixes is not None and other.prefixes is not None:
+        return any(
+            path.startswith(prefix) or prefix.startswith(path)
+            for path in route.prefixes
+            for prefix in other.prefixes
+        )
+    return True
+
+
+def _partitions(
+    routes: List[_Route],
+) -> Iterator[Tuple[List[_Route], List[_Route]]]:
+    """
+    Groups of routers that could see the same request: same TLS mode, a
+    shared host and a shared entryPoint. Each group comes with the routers
+    without a host or an entryPoint that could overlap with it, which are
+    compared among themselves in their own groups.
+    """
+    groups: Dict[Tuple[bool, Optional[str], str], List[_Route]] = {}
+    for route in routes:
+        for host in route.hosts or (None,):
+            for entry_point in route.entry_points or (DEFAULT_ENTRY_POINTS,):
+                groups.setdefault((route.tls, host, entry_point), []).append(route)
+
+    for (tls, host, entry_point), members in groups.items():
+        wider = {
+            (tls, None, entry_point),
+            (tls, host, DEFAULT_ENTRY_POINTS),
+            (tls, None, DEFAULT_ENTRY_POINTS),
+        }
+        wider.discard((tls, host, entry_point))
+        yield members, [route for key in wider for route in groups.get(key, ())]
+
+
+def analyze_routers(routers: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reports HTTP routers that can never match (shadowed by a router of
+    higher priority whose rule covers theirs), routers with the same rule
+    (duplicates), and routers of equal priority whose rules overlap
+    (ambiguous: which one wins depends on their names).
+
+    Coverage and overlap are decided on each rule's disjunctive normal
+    form, literal by literal: Host, Method, Path and PathPrefix values are
+    compared, other matchers only when identical. Findings are
+    conservative: a router is reported shadowed only when that is certain.
+    """
+    routes: List[_Route] = []
+    skipped: Dict[str, str] = {}
+    for name, entry in routers.items():
+        try:
+            routes.append(_route(name, entry))
+        except RuleSyntaxError as e:
+            skipped[name] = str(e)
+        except _TooComplex:
+            skipped[name] = f"More than {MAX_CONJUNCTIONS} alternatives"
+
+    shadowed: Dict[str, Dict[str, Any]] = {}
+    duplicates: List[Dict[str, Any]] = []
+    ambiguous: List[Dict[str, Any]] = []
+    seen: Set[Tuple[str, str]] = set()
+    partitions = comparisons = 0
+
+    for members, wider in _partitions(routes):
+        partitions += 1
+        index_of_members = _PrefixIndex(members)
+        index_of_wider = _PrefixIndex(wider)
+        for route in members:
+            if route.prefixes is None:
+                candidates = chain(members, wider)
+            else:
+                candidates = chain(
+                    index_of_members.overlapping(route),
+                    index_of_wider.overlapping(route),
+                )
+            for other in candidates:
+                high, low = (route, other)
+                if _rank(other) < _rank(route):
+                    high, low = other, route
+                pair = (high.name, low.name)
+                if high.name == low.name or pair in seen:
+                    continue
+                seen.add(pair)
+                comparisons += 1
+                _compare(high, low, shadowed, duplicates, ambiguous)
+
+    return {
+        "routers": len(routers),
+        "analyzed": len(routes),
+        "skipped": skipped,
+        "partitions": partitions,
+        "comparisons": comparisons,
+        "shadowed": sorted(shadowed.values(), key=lambda item: item["router"]),
+        "duplicates": duplicates,
+        "ambiguous": ambiguous,
+    }
+
+
+def _compare(
+    high: _Route,
+    low: _Route,
+    shadowed: Dict[str, Dict[str, Any]],
+    duplicates: List[Dict[str, Any]],
+    ambiguous: List[Dict[str, Any]],
+) -> None:
+    """`high` sorts before `low`: higher priority, or same and lower name."""
+    if high.dnf == low.dnf and high.entry_points == low.entry_points:
+        duplicates.append({"routers": [high.name, low.name], "rule": high.rule})
+        return
+    if high.priority > low.priority:
+        # Report the router that wins, whatever order pairs come in
+        current = shadowed.get(low.name)
+        if (
+            (
+                current is None
+                or _rank(high)
+                < (-current["shadowed_by_priority"], current["shadowed_by"])
+            )
+            and high.listens_on_all_of(low)
+            and _may_cover(high, low)
+            and _covers(high.dnf, low.dnf)
+        ):
+            shadowed[low.name] = {
+                "router": low.name,
+                "rule": low.rule,
+                "priority": low.priority,
+                "shadowed_by": high.name,
+                "shadowed_by_rule": high.rule,
+                "shadowed_by_priority": high.priority,
+            }
+        return
+    if _may_overlap(high, low) and _overlaps(high.dnf, low.dnf):
+        ambiguous.append(
+            {
+                "routers": [high.name, low.name],
+                "priority": high.priority,
+                "rules": [high.rule, low.rule],
+            }
+        )
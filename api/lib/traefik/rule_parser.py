@@ -0,0 +1,335 @@
+import ipaddress
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple, Union
+
+from lib.traefik.rules import host_matcher, normalize_host
+
+_TOKEN = re.compile(
+    r"\s*(?:(?P<op>&&|\|\||[!(),])"
+    r"|(?P<ident>[A-Za-z_]\w*)"
+    r"|`(?P<raw>[^`]*)`"
+    r'|"(?P<quoted>(?:[^"\\]|\\.)*)")'
+)
+# Traefik v2 placeholders in HostRegexp/Path/PathPrefix: {name} or {name:regexp}
+_V2_PLACEHOLDER = re.compile(r"\{[A-Za-z_]\w*(?::((?:[^{}]|\{[^{}]*\})*))?\}")
+_REGEXP_LITERAL = re.compile(r"[^\\.^$*+?()\[\]{}|]*")
+_QUANTIFIERS = "?*{"
+
+
+class RuleSyntaxError(ValueError):
+    """A router rule that cannot be parsed or evaluated."""
+
+
+# -------------------- AST --------------------
+@dataclass(frozen=True)
+class Matcher:
+    name: str
+    args: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class Not:
+    operand: "Node"
+
+
+@dataclass(frozen=True)
+class And:
+    operands: Tuple["Node", ...]
+
+
+@dataclass(frozen=True)
+class Or:
+    operands: Tuple["Node", ...]
+
+
+Node = Union[Matcher, Not, And, Or]
+
+
+# -------------------- PARSER --------------------
+def _tokenize(rule: str) -> List[Tuple[str, str]]:
+    tokens: List[Tuple[str, str]] = []
+    position = 0
+    rule = rule.rstrip()
+    while position < len(rule):
+        token = _TOKEN.match(rule, position)
+        if token is None or token.end() == position:
+            raise RuleSyntaxError(f"Unexpected character at {position}: {rule!r}")
+        position = token.end()
+        if token.group("op"):
+            tokens.append(("op", token.group("op")))
+        elif token.group("ident"):
+            tokens.append(("ident", token.group("ident")))
+        elif token.group("raw") is not None:
+            tokens.append(("string", token.group("raw")))
+        else:
+            tokens.append(("string", re.sub(r"\\(.)", r"\1", token.group("quoted"))))
+    return tokens
+
+
+class _Parser:
+    """Recursive descent: `!` binds tighter than `&&`, `&&` than `||`."""
+
+    def __init__(self, rule: str) -> None:
+        self.rule = rule
+        self.tokens = _tokenize(rule)
+        self.index = 0
+
+    def parse(self) -> Node:
+        if not self.tokens:
+            raise RuleSyntaxError("Empty rule")
+        node = self._or()
+        if self.index != len(self.tokens):
+            raise RuleSyntaxError(f"Unexpected {self.tokens[self.index][1]!r}")
+        return node
+
+    def _peek(self) -> Optional[Tuple[str, str]]:
+        return self.tokens[self.index] if self.index < len(self.tokens) else None
+
+    def _expect(self, kind: str, value: Optional[str] = None) -> str:
+        token = self._peek()
+        if token is None or token[0] != kind or (value and token[1] != value):
+            found = repr(token[1]) if token else "end of rule"
+            raise RuleSyntaxError(f"Expected {value or kind}, found {found}")
+        self.index += 1
+        return token[1]
+
+    def _or(self) -> Node:
+        operands = [self._and()]
+        while self._peek() == ("op", "||"):
+            self.index += 1
+            operands.append(self._and())
+        return operands[0] if len(operands) == 1 else Or(tuple(operands))
+
+    def _and(self) -> Node:
+        operands = [self._unary()]
+        while self._peek() == ("op", "&&"):
+            self.index += 1
+            operands.append(self._unary())
+        return operands[0] if len(operands) == 1 else And(tuple(operands))
+
+    def _unary(self) -> Node:
+        token = self._peek()
+        if token == ("op", "!"):
+            self.index += 1
+            return Not(self._unary())
+        if token == ("op", "("):
+            self.index += 1
+            node = self._or()
+            self._expect("op", ")")
+            return node
+        name = self._expect("ident")
+        self._expect("op", "(")
+        args: List[str] = []
+        if self._peek() != ("op", ")"):
+            args.append(self._expect("string"))
+            while self._peek() == ("op", ","):
+                self.index += 1
+                args.append(self._expect("string"))
+        self._expect("op", ")")
+        return Matcher(name, tuple(args))
+
+
+def parse_rule(rule: str) -> Node:
+    """Parses a router rule into its AST. Raises RuleSyntaxError."""
+    return _Parser(rule or "").parse()
+
+
+def matchers(node: Node, negated: bool = False):
+    """Yields (matcher, negated) for every matcher of a rule."""
+    if isinstance(node, Matcher):
+        yield node, negated
+    elif isinstance(node, Not):
+        yield from matchers(node.operand, not negated)
+    else:
+        for operand in node.operands:
+            yield from matchers(operand, negated)
+
+
+# -------------------- EVALUATION --------------------
+@dataclass
+class Request:
+    """The parts of an HTTP request rules match on."""
+
+    host: str
+    path: str = "/"
+    method: str = "GET"
+    headers: Dict[str, str] = field(default_factory=dict)
+    query: Dict[str, str] = field(default_factory=dict)
+    client_ip: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        self.host = normalize_host(self.host)
+        self.headers = {name.lower(): value for name, value in self.headers.items()}
+
+
+Predicate = Callable[[Request], bool]
+
+
+def _v2_pattern(value: str, whole: bool) -> re.Pattern:
+    """Regexp of a v2 `/users/{id:[0-9]+}` path (or host) template."""
+    parts: List[str] = []
+    position = 0
+    for placeholder in _V2_PLACEHOLDER.finditer(value):
+        parts.append(re.escape(value[position : placeholder.start()]))
+        parts.append(f"(?:{placeholder.group(1) or '[^/]+'})")
+        position = placeholder.end()
+    parts.append(re.escape(value[position:]))
+    return re.compile("^" + "".join(parts) + ("$" if whole else ""))
+
+
+def _any(tests: List[Predicate]) -> Predicate:
+    if len(tests) == 1:
+        return tests[0]
+    return lambda request: any(test(request) for test in tests)
+
+
+def _path_test(value: str, prefix: bool) -> Predicate:
+    if _V2_PLACEHOLDER.search(value):
+        pattern = _v2_pattern(value, whole=not prefix)
+        return lambda request: pattern.match(request.path) is not None
+    if prefix:
+        return lambda request: request.path.startswith(value)
+    return lambda request: request.path == value
+
+
+def _client_ip_test(value: str) -> Predicate:
+    network = ipaddress.ip_network(value, strict=False)
+
+    def test(request: Request) -> bool:
+        try:
+            return ipaddress.ip_address(request.client_ip or "") in network
+        except ValueError:
+            return False
+
+    return test
+
+
+# Header/HeaderRegexp in v3, Headers/HeadersRegexp in v2
+_PAIR_MATCHERS = (
+    "Header",
+    "HeaderRegexp",
+    "Headers",
+    "HeadersRegexp",
+    "Query",
+    "QueryRegexp",
+)
+
+
+def _compile_matcher(matcher: Matcher) -> Predicate:
+    name, args = matcher.name, matcher.args
+    if not args:
+        raise RuleSyntaxError(f"{name}() needs an argument")
+
+    if name in ("Host", "HostHeader", "HostRegexp"):
+        hosts = [host_matcher(name, arg) for arg in args]
+        if any(host is None for host in hosts):
+            raise RuleSyntaxError(f"Invalid {name} regexp in {args!r}")
+        return lambda request: any(host.matches(request.host) for host in hosts)
+    if name in ("Path", "PathPrefix"):
+        return _any([_path_test(arg, name == "PathPrefix") for arg in args])
+    if name == "PathRegexp":
+        pattern = re.compile(args[0])
+        return lambda request: pattern.search(request.path) is not None
+    if name == "Method":
+        methods = {arg.upper() for arg in args}
+        return lambda request: request.method.upper() in methods
+    if name in _PAIR_MATCHERS:
+        return _pair_test(name, args)
+    if name == "ClientIP":
+        return _any([_client_ip_test(arg) for arg in args])
+    raise RuleSyntaxError(f"Unsupported matcher {name}")
+
+
+def _pair_test(name: str, args: Tuple[str, ...]) -> Predicate:
+    """Header/Query(`key`, `value`) and their Regexp forms."""
+    if name.startswith("Query") and len(args) == 1 and "=" in args[0]:
+        args = tuple(args[0].split("=", 1))  # v2 Query(`key=value`)
+    key = args[0].lower() if name.startswith("Header") else args[0]
+    field_of = (
+        (lambda request: request.headers)
+        if name.startswith("Header")
+        else (lambda request: request.query)
+    )
+    if len(args) == 1:
+        return lambda request: key in field_of(request)
+    if name.endswith("Regexp"):
+        pattern = re.compile(args[1])
+        return lambda request: (
+            pattern.search(field_of(request).get(key, "")) is not None
+        )
+    value = args[1]
+    return lambda request: field_of(request).get(key) == value
+
+
+def compile_rule(node: Node) -> Predicate:
+    """Compiles a rule AST to a predicate. Raises RuleSyntaxError."""
+    if isinstance(node, Matcher):
+        try:
+            return _compile_matcher(node)
+        except RuleSyntaxError:
+            raise
+        except (re.error, ValueError) as e:
+            raise RuleSyntaxError(f"Invalid {node.name} argument: {e}")
+    if isinstance(node, Not):
+        operand = compile_rule(node.operand)
+        return lambda request: not operand(request)
+    operands = [compile_rule(operand) for operand in node.operands]
+    if isinstance(node, And):
+        return lambda request: all(test(request) for test in operands)
+    return lambda request: any(test(request) for test in operands)
+
+
+# -------------------- DISPATCH KEYS --------------------
+def host_keys(node: Node) -> Optional[FrozenSet[str]]:
+    """
+    Exact hosts one of which a request must have for the rule to match,
+    or None when the rule does not confine the host to a known set.
+    """
+    if isinstance(node, Matcher):
+        if node.name in ("Host", "HostHeader") and node.args:
+            hosts = frozenset(normalize_host(arg) for arg in node.args)
+            if not any(host.startswith("*") or "{" in host for host in hosts):
+                return hosts
+        return None
+    return _combine(node, host_keys, key=len)
+
+
+def path_prefixes(node: Node) -> Optional[FrozenSet[str]]:
+    """
+    Literal prefixes one of which the request path must start with for the
+    rule to match, or None when the rule does not confine the path.
+    """
+    if isinstance(node, Matcher):
+        if node.name in ("Path", "PathPrefix"):
+            prefixes = frozenset(_V2_PLACEHOLDER.split(arg)[0] for arg in node.args)
+        elif node.name == "PathRegexp" and node.args:
+            prefixes = frozenset([_regexp_prefix(node.args[0])])
+        else:
+            return None
+        # Every path starts with "/": that prefix does not confine it
+        return prefixes if prefixes and not prefixes & {"", "/"} else None
+    # Under &&, the most selective constraint: the longest shortest prefix
+    return _combine(node, path_prefixes, key=lambda keys: -min(map(len, keys)))
+
+
+def _regexp_prefix(pattern: str) -> str:
+    """Literal text every match of a `^`-anchored regexp starts with."""
+    if not pattern.startswith("^") or "|" in pattern:
+        return ""
+    literal = _REGEXP_LITERAL.match(pattern, 1).group()
+    if pattern[1 + len(literal) : 2 + len(literal)] in tuple(_QUANTIFIERS):
+        literal = literal[:-1]  # the last character is optional or repeated
+    return literal
+
+
+def _combine(node: Node, keys_of, key) -> Optional[FrozenSet[str]]:
+    if isinstance(node, Not):
+        return None
+    found = [keys_of(operand) for operand in node.operands]
+    if isinstance(node, And):
+        constrained = [keys for keys in found if keys is not None]
+        return min(constrained, key=key) if constrained else None
+    if any(keys is None for keys in found):
+        return None
+    return frozenset().union(*found)
@@ -0,0 +1,181 @@
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Pattern, Tuple
+
+# Rule matchers that select on the request host (HTTP) or TLS SNI (TCP)
+HOST_MATCHERS = ("Host", "HostHeader", "HostRegexp", "HostSNI", "HostSNIRegexp")
+
+_MATCHER_CALL = re.compile(
+    r"(!\s*)?\b(" + "|".join(sorted(HOST_MATCHERS, key=len, reverse=True)) + r")\s*\("
+)
+_ARGUMENT = re.compile(r'\s*(?:`([^`]*)`|"((?:[^"\\]|\\.)*)")\s*(,|\))')
+# Traefik v2 HostRegexp placeholders: {name} or {name:regexp}
+_V2_PLACEHOLDER = re.compile(r"\{[A-Za-z_]\w*(?::((?:[^{}]|\{[^{}]*\})*))?\}")
+_LITERAL = re.compile(r"[A-Za-z0-9-]")
+
+
+@dataclass(frozen=True)
+class HostMatcher:
+    """
+    One host a rule selects on. Exact hosts carry `host`. Wildcards and
+    regexps carry `regex`, plus the literal domain `suffix` every match
+    ends with when one can be derived ("" for HostSNI(`*`)).
+    """
+
+    matcher: str
+    value: str
+    host: Optional[str] = None
+    suffix: Optional[str] = None
+    regex: Optional[Pattern[str]] = None
+
+    def matches(self, host: str) -> bool:
+        if self.host is not None:
+            return self.host == host
+        return self.regex is not None and self.regex.search(host) is not None
+
+
+def normalize_host(host: str) -> str:
+    """Lowercases a host and strips a trailing dot and port."""
+    host = host.strip().lower().rstrip(".")
+    if host.startswith("["):  # IPv6 literal
+        return host.split("]", 1)[0] + "]"
+    return host.rsplit(":", 1)[0] if host.count(":") == 1 else host
+
+
+def _aligned_suffix(tail: str) -> Optional[str]:
+    """The whole labels at the end of a literal tail ("-x.example.com")."""
+    if tail.startswith("."):
+        return tail[1:] or None
+    if "." not in tail:
+        return None
+    return tail.split(".", 1)[1] or None
+
+
+def _regexp_suffix(pattern: str) -> Optional[str]:
+    """
+    Literal suffix of an end-anchored regexp (`^[a-z]+\\.example\\.com$`
+    gives "example.com"), or None when matches are not confined to one.
+    """
+    if not pattern.endswith("$") or pattern.endswith("\\$"):
+        return None
+    if _has_top_level_alternation(pattern):
+        return None
+    tail: List[str] = []
+    index = len(pattern) - 2
+    while index >= 0:
+        char = pattern[index]
+        escaped = index > 0 and pattern[index - 1] == "\\"
+        if escaped and char == ".":
+            tail.append(".")
+            index -= 2
+        elif not escaped and _LITERAL.fullmatch(char):
+            tail.append(char)
+            index -= 1
+        else:
+            break
+    return _aligned_suffix("".join(reversed(tail)).lower())
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    depth, index, in_class = 0, 0, False
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\":
+            index += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return True
+        index += 1
+    return False
+
+
+def _v2_regexp(pattern: str) -> Tuple[Pattern[str], Optional[str]]:
+    """Compiles a v2 `{sub:[a-z]+}.example.com` pattern (matched whole)."""
+    parts: List[str] = []
+    position = 0
+    for placeholder in _V2_PLACEHOLDER.finditer(pattern):
+        parts.append(re.escape(pattern[position : placeholder.start()]))
+        parts.append(f"(?:{placeholder.group(1) or '[^.]+'})")
+        position = placeholder.end()
+    tail = pattern[position:]
+    parts.append(re.escape(tail))
+    regex = re.compile("^" + "".join(parts) + "$", re.IGNORECASE)
+    return regex, _aligned_suffix(tail.lower())
+
+
+def host_matcher(matcher: str, value: str) -> Optional[HostMatcher]:
+    if matcher in ("Host", "HostHeader", "HostSNI"):
+        host = normalize_host(value)
+        if host == "*":
+            # HostSNI(`*`): every TLS connection (and non-TLS ones)
+            return HostMatcher(matcher, value, suffix="", regex=re.compile(""))
+        if host.startswith("*."):
+            suffix = host[2:]
+            regex = re.compile(r"^[^.]+\." + re.escape(suffix) + "$")
+            return HostMatcher(matcher, value, suffix=suffix, regex=regex)
+        return HostMatcher(matcher, value, host=host)
+
+    try:
+        if not value.startswith("^") and _V2_PLACEHOLDER.search(value):
+            regex, suffix = _v2_regexp(value)
+        else:
+            regex, suffix = re.compile(value, re.IGNORECASE), _regexp_suffix(value)
+    except re.error:
+        return None
+    return HostMatcher(matcher, value, suffix=suffix, regex=regex)
+
+
+def extract_hosts(rule: str) -> List[HostMatcher]:
+    """
+    Returns the hosts a router rule selects on, from its Host, HostHeader,
+    HostRegexp, HostSNI and HostSNIRegexp matchers (v2 multi-argument forms
+    included). Matchers under a negation, including a negated group like
+    `!(Host(...) || ...)`, are skipped, and so are invalid regexps.
+    """
+    # rule_parser builds on this module's host matchers
+    from lib.traefik.rule_parser import RuleSyntaxError, matchers, parse_rule
+
+    try:
+        tree = parse_rule(rule)
+    except RuleSyntaxError:
+        return _scan_hosts(rule)
+    hosts: List[HostMatcher] = []
+    for matcher, negated in matchers(tree):
+        if negated or matcher.name not in HOST_MATCHERS:
+            continue
+        for value in matcher.args:
+            host = host_matcher(matcher.name, value)
+            if host is not None:
+                hosts.append(host)
+    return hosts
+
+
+def _scan_hosts(rule: str) -> List[HostMatcher]:
+    """Host matchers found by scanning a rule the parser cannot read."""
+    hosts: List[HostMatcher] = []
+    for call in _MATCHER_CALL.finditer(rule or ""):
+        if call.group(1):
+            continue
+        position = call.end()
+        while True:
+            argument = _ARGUMENT.match(rule, position)
+            if argument is None:
+                break
+            position = argument.end()
+            value = argument.group(1)
+            if value is None:
+                value = re.sub(r"\\(.)", r"\1", argument.group(2))
+            host = host_matcher(call.group(2), value)
+            if host is not None:
+                hosts.append(host)
+            if argument.group(3) == ")":
+                break
+    return hosts
@@ -0,0 +1,256 @@
+import heapq
+import re
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from lib.traefik.config_index import (
+    HTTP_SOURCES,
+    TCP_UDP_SOURCES,
+    TLS_SOURCES,
+    ConfigCatalog,
+    ConfigIndex,
+    Source,
+)
+from lib.traefik.rules import extract_hosts
+
+# (protocol, section, name)
+DocKey = Tuple[str, str, str]
+
+# Term weights: an entry's own name ranks above what it references
+NAME = 4
+NAME_PART = 3
+REFERENCE = 2
+REFERENCE_PART = 1
+
+_WORD_SPLIT = re.compile(r"[^a-z0-9]+")
+# Sorts after every character a term can continue a prefix with
+_PREFIX_END = "\U0010ffff"
+# Entries a query looks at, at most: bounds the cost of words matching
+# most of the config (a single letter while typing)
+MAX_CANDIDATES = 5000
+
+
+def _get(entry: Any, field: str) -> Any:
+    """Reads a field of a pydantic model or a plain dict."""
+    if isinstance(entry, dict):
+        return entry.get(field)
+    return getattr(entry, field, None)
+
+
+def _strings(value: Any) -> Iterator[str]:
+    """Every string inside a nested dict/list value (dict keys excluded)."""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _strings(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _strings(item)
+
+
+def _references(source: Source, entry: Any) -> Iterator[str]:
+    """The values an entry is searchable by, besides its name."""
+    section = source[1]
+    if section == "routers":
+        if _get(entry, "service"):
+            yield _get(entry, "service")
+        yield from _get(entry, "middlewares") or []
+        yield from _get(entry, "entryPoints") or []
+        for host in extract_hosts(_get(entry, "rule") or ""):
+            yield host.host if host.host is not None else host.value
+        tls = _get(entry, "tls")
+        if tls is not None and _get(tls, "certResolver"):
+            yield _get(tls, "certResolver")
+    elif section == "services":
+        # Server URLs and addresses
+        yield from _strings(entry.model_dump(exclude_none=True))
+    elif section == "middlewares":
+        data = entry.model_dump(exclude_none=True)
+        yield from data  # the middleware type, e.g. "basicAuth"
+        yield from _strings(_get(entry, "chain"))
+    elif section == "certResolvers":
+        acme = _get(entry, "acme") or {}
+        if _get(acme, "email"):
+            yield _get(acme, "email")
+        dns = _get(acme, "dnsChallenge") or {}
+        if _get(dns, "provider"):
+            yield _get(dns, "provider")
+    elif section == "certificates":
+        yield _get(entry, "domain")
+
+
+def _terms(value: str, whole: int, part: int) -> Iterator[Tuple[str, int]]:
+    value = value.lower()
+    yield value, whole
+    if "://" in value:  # URLs are also found by their address
+        yield value.split("://", 1)[1], whole
+    for word in _WORD_SPLIT.split(value):
+        if word and word != value:
+            yield word, part
+
+
+class SearchIndex(ConfigIndex):
+    """
+    Inverted index over the names and references of every router, service,
+    middleware, certificate resolver and manual certificate.
+
+    Each entry is indexed under its lowercased name and the services,
+    middlewares, entryPoints, hosts, URLs and resolvers it references, both
+    whole and split into words. Terms are kept sorted, so every query word
+    is a prefix range found by bisection, and an entry must match them all.
+    """
+
+    SOURCES = HTTP_SOURCES + TCP_UDP_SOURCES + TLS_SOURCES
+
+    def __init__(self, catalog: ConfigCatalog) -> None:
+        # Term -> entry -> best weight of the term for that entry
+        self._postings: Dict[str, Dict[DocKey, int]] = {}
+        # Sorted terms; None while a resync rebuilds it lazily
+        self._terms: Optional[List[str]] = []
+        # What each entry added, to remove exactly that
+        self._indexed: Dict[DocKey, Dict[str, int]] = {}
+        super().__init__(catalog)
+
+    # -------------------- INDEXING --------------------
+    def _resync(self, source: Source) -> None:
+        # Bulk changes: sort once afterwards instead of inserting one by one
+        self._terms = None
+        super()._resync(source)
+
+    def _add(self, source: Source, name: str, entry: Any) -> None:
+        key = (*source, name)
+        weights: Dict[str, int] = {}
+        terms = list(_terms(name, NAME, NAME_PART))
+        for value in _references(source, entry):
+            if isinstance(value, str) and value:
+                terms.extend(_terms(value, REFERENCE, REFERENCE_PART))
+        for term, weight in terms:
+            if weight > weights.get(term, 0):
+                weights[term] = weight
+        self._indexed[key] = weights
+        for term, weight in weights.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                if self._terms is not None:
+                    insort(self._terms, term)
+            postings[key] = weight
+
+    def _remove(self, source: Source, name: str, entry: Any) -> None:
+        key = (*source, name)
+        for term in self._indexed.pop(key, {}):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(key, None)
+            if not postings:
+                del self._postings[term]
+                if self._terms is not None:
+                    del self._terms[bisect_left(self._terms, term)]
+
+    def _sorted_terms(self) -> List[str]:
+        if self._terms is None:
+            self._terms = sorted(self._postings)
+        return self._terms
+
+    # -------------------- QUERY --------------------
+    def search(
+        self, query: str, limit: int = 20, protocol: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Entries matching every word of `query` (as a prefix of a term),
+        best first: name matches rank above references, and whole-term
+        matches above prefix ones. When the rarest word still matches more
+        than MAX_CANDIDATES entries, only that many are ranked (whole-term
+        matches first) and the result is flagged `truncated`.
+        """
+        words = [word for word in query.lower().split() if word]
+        if not words:
+            return {"query": query, "items": [], "total": 0, "truncated": False}
+
+        self.sync()
+        with self._lock:
+            terms = self._sorted_terms()
+            ranges = {word: self._range(terms, word) for word in set(words)}
+            # Collect the rarest word's entries, then check the others
+            # against the few terms of each of those entries
+            rarest, smallest = None, MAX_CANDIDATES
+            by_width = sorted(ranges.items(), key=lambda item: item[1][1] - item[1][0])
+            for word, bounds in by_width:
+                size = self._size(terms, bounds, smallest)
+                if rarest is None or size < smallest:
+                    rarest, smallest = word, size
+            scores = self._match(terms, rarest, ranges[rarest], protocol)
+            truncated = len(scores) >= MAX_CANDIDATES
+            for word in ranges:
+                if word != rarest:
+                    scores = self._rescore(scores, word)
+            best = heapq.nsmallest(
+                limit, scores.items(), key=lambda item: (-item[1], item[0])
+            )
+            items = [
+                {"protocol": p, "section": section, "name": name, "score": score}
+                for (p, section, name), score in best
+            ]
+        return {
+            "query": query,
+            "items": items,
+            "total": len(scores),
+            "truncated": truncated,
+        }
+
+    @staticmethod
+    def _range(terms: List[str], word: str) -> Tuple[int, int]:
+        """Slice of the sorted terms starting with `word`."""
+        start = bisect_left(terms, word)
+        return start, bisect_left(terms, word + _PREFIX_END, start)
+
+    def _size(self, terms: List[str], bounds: Tuple[int, int], cap: int) -> int:
+        """Postings in a term slice, counted no further than past `cap`."""
+        size = 0
+        for index in range(*bounds):
+            size += len(self._postings[terms[index]])
+            if size >= cap:
+                break
+        return size
+
+    def _match(
+        self,
+        terms: List[str],
+        word: str,
+        bounds: Tuple[int, int],
+        protocol: Optional[str],
+    ) -> Dict[DocKey, int]:
+        """Entry -> score of its best term starting with `word`."""
+        found: Dict[DocKey, int] = {}
+        for index in range(*bounds):  # the whole term `word`, if any, is first
+            term = terms[index]
+            factor = 2 if term == word else 1
+            for key, weight in self._postings[term].items():
+                if protocol is not None and key[0] != protocol:
+                    continue
+                if weight * factor > found.get(key, 0):
+                    found[key] = weight * factor
+                    if len(found) >= MAX_CANDIDATES:
+                        return found
+        return found
+
+    def _rescore(self, scores: Dict[DocKey, int], word: str) -> Dict[DocKey, int]:
+        """Keeps the entries that also have a term starting with `word`."""
+        rescored: Dict[DocKey, int] = {}
+        for key, score in scores.items():
+            best = max(
+                (
+                    weight * 2 if term == word else weight
+                    for term, weight in self._indexed[key].items()
+                    if term.startswith(word)
+                ),
+                default=0,
+            )
+            if best:
+                rescored[key] = score + best
+        return rescored
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "terms": len(self._postings)}
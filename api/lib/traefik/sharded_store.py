@@ -0,0 +1,209 @@
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from lib.traefik import yaml_io
+from lib.traefik.config_cache import FileSignature, ParsedFileCache, file_signature
+from lib.traefik.config_writer import atomic_write, notify_write
+
+# (section, name, data): a None `data` deletes the entry
+ShardChange = Tuple[str, str, Optional[Dict[str, Any]]]
+
+
+class ShardedConfigStore:
+    """
+    Stores every dynamic config entry of one protocol in its own file:
+
+        <dynamic>/<protocol>/<section>/<name>.yaml
+
+    Each file is a complete Traefik dynamic config holding a single entry
+    ({protocol: {section: {name: data}}}), so changing one router rewrites
+    and reloads one small file. Sections are assembled by a directory scan,
+    with every file parsed once per change through a ParsedFileCache.
+    """
+
+    def __init__(self, dynamic_dir: str | Path, protocol: str) -> None:
+        self.protocol = protocol
+        self.root = Path(dynamic_dir, protocol)
+        self._cache = ParsedFileCache()
+        self.writes = 0
+        self.deletes = 0
+
+    # -------------------- PATHS --------------------
+    def section_dir(self, section: str) -> Path:
+        return self.root / section
+
+    def entry_path(self, section: str, name: str) -> Path:
+        """Returns the shard file of an entry, rejecting unsafe names."""
+        if not name or name.startswith(".") or "/" in name or "\0" in name:
+            raise ValueError(f"Invalid {self.protocol} {section} name: {name!r}")
+        return self.section_dir(section) / f"{name}.yaml"
+
+    # -------------------- READ --------------------
+    def read_section(
+        self, section: str, parse: Callable[[Any], Any] = lambda data: data
+    ) -> Dict[str, Any]:
+        """
+        Returns {name: parse(data)} for every shard of a section, sorted by
+        name. Parsed values are cached per file and shared between callers.
+        """
+        directory = self.section_dir(section)
+        if not directory.is_dir():
+            return {}
+
+        entries: Dict[str, Any] = {}
+        for file_name in sorted(os.listdir(directory)):
+            if file_name.startswith(".") or not file_name.endswith(".yaml"):
+                continue
+            name = file_name[: -len(".yaml")]
+            path = directory / file_name
+            value = self._cache.get(
+                path, lambda: self._load_entry(path, section, name, parse)
+            )
+            if value is not None:
+                entries[name] = value
+        return entries
+
+    def count_section(self, section: str) -> int:
+        """Returns the number of shards in a section without parsing them."""
+        directory = self.section_dir(section)
+        if not directory.is_dir():
+            return 0
+        return sum(
+            1
+            for file_name in os.listdir(directory)
+            if file_name.endswith(".yaml") and not file_name.startswith(".")
+        )
+
+    def _load_entry(
+        self, path: Path, section: str, name: str, parse: Callable[[Any], Any]
+    ) -> Any:
+        try:
+            with open(path, "r") as f:
+                data = yaml_io.load(f) or {}
+        except FileNotFoundError:
+            return None
+        entries = (data.get(self.protocol) or {}).get(section) or {}
+        if name not in entries:
+            return None
+        return parse(entries[name])
+
+    def signature(self) -> Tuple[Tuple[str, str, Optional[FileSignature]], ...]:
+        """
+        Returns (section, file, signature) for every shard. Costs one stat per
+        file, which is far cheaper than parsing, so it makes a good version.
+        """
+        if not self.root.is_dir():
+            return ()
+        shards = []
+        for section in sorted(os.listdir(self.root)):
+            directory = self.section_dir(section)
+            if not directory.is_dir():
+                continue
+            for file_name in sorted(os.listdir(directory)):
+                if file_name.endswith(".yaml") and not file_name.startswith("."):
+                    signature = file_signature(directory / file_name)
+                    shards.append((section, file_name, signature))
+        return tuple(shards)
+
+    # -------------------- WRITE --------------------
+    def write_entry(self, section: str, name: str, data: Dict[str, Any]) -> None:
+        """Atomically writes a single entry to its shard file."""
+        path = self.entry_path(section, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        document = {self.protocol: {section: {name: data}}}
+        atomic_write(path, lambda f: yaml_io.dump(document, f))
+        self.writes += 1
+
+    def delete_entry(self, section: str, name: str) -> bool:
+        """Removes the shard file of an entry. Returns False if it did not exist."""
+        path = self.entry_path(section, name)
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            return False
+        self._cache.invalidate(path)
+        notify_write(path)
+        self.deletes += 1
+        return True
+
+    def apply(self, changes: List[ShardChange]) -> bool:
+        """
+        Writes and removes several shards as one unit. Every new shard is
+        written to a temp file and fsynced first; only once all of them are
+        on disk are they renamed into place and the deleted shards removed,
+        so an error while preparing leaves every shard as it was. Returns
+        whether anything changed.
+        """
+        paths = [self.entry_path(section, name) for section, name, _ in changes]
+
+        staged: Dict[Path, str] = {}
+        try:
+            for path, (section, name, data) in zip(paths, changes):
+                # Only the last change of each entry is kept
+                replaced = staged.pop(path, None)
+                if replaced is not None:
+                    os.unlink(replaced)
+                if data is not None:
+                    staged[path] = self._stage(path, {section: {name: data}})
+        except BaseException:
+            for tmp_path in staged.values():
+                os.unlink(tmp_path)
+            raise
+
+        changed = False
+        for path, (section, name, data) in zip(paths, changes):
+            if data is not None:
+                tmp_path = staged.pop(path, None)
+                if tmp_path is None:
+                    continue  # a later change of the batch replaced this one
+                os.replace(tmp_path, path)
+                self.writes += 1
+            else:
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    continue
+                self.deletes += 1
+            self._cache.invalidate(path)
+            notify_write(path)
+            changed = True
+        for directory in {path.parent for path in paths}:
+            if directory.is_dir():
+                _fsync_dir(directory)
+        return changed
+
+    def _stage(self, path: Path, sections: Dict[str, Any]) -> str:
+        """Writes a shard to a fsynced temp file next to it; returns its path."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+        )
+        try:
+            os.chmod(tmp_path, 0o644)
+            with os.fdopen(fd, "w") as f:
+                yaml_io.dump({self.protocol: sections}, f)
+                f.flush()
+                os.fsync(f.fileno())
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return tmp_path
+
+    def stats(self) -> Dict[str, int]:
+        """Returns shard write/delete counters."""
+        return {"writes": self.writes, "deletes": self.deletes}
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Returns hit/miss counters of the per-file parse cache."""
+        return self._cache.stats()
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Persists the renames and removals made in a directory."""
+    dir_fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
@@ -0,0 +1,310 @@
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from fastapi import Response
+
+from core.config import settings
+from lib.etag import etag_matches, make_etag
+from lib.traefik.traefik_api import LIVE_LISTS, TraefikApiService
+
+logger = logging.getLogger(__name__)
+
+# Called with (previous, current) after each poll
+SnapshotListener = Callable[[Optional["TraefikSnapshot"], "TraefikSnapshot"], None]
+
+# Snapshot key of the health check result, next to the LIVE_LISTS keys
+# ("routers", "tcpServices", ...)
+HEALTH = "healthy"
+
+# Health check fields that change on every poll (client counters); probe
+# timings ("ms") are left out too. They are served, but not part of the ETag.
+VOLATILE_HEALTH = ("circuit", "upstream_requests", "coalesced_requests", "in_flight")
+
+
+def health_etag(health: Mapping[str, Any]) -> str:
+    """ETag of a health check body that only changes with its outcome."""
+    stable = {key: value for key, value in health.items() if key not in VOLATILE_HEALTH}
+    if isinstance(stable.get("probes"), dict):
+        stable["probes"] = {
+            name: {key: value for key, value in probe.items() if key != "ms"}
+            for name, probe in stable["probes"].items()
+        }
+    return make_etag(json.dumps(stable, separators=(",", ":"), sort_keys=True).encode())
+
+
+@dataclass(frozen=True)
+class TraefikSnapshot:
+    """
+    One poll of the Traefik API. Bodies are pre-encoded JSON, so serving a
+    snapshot costs no serialization, and every field is read-only.
+    """
+
+    version: int
+    fetched_at: float
+    fetched_monotonic: float
+    duration_ms: float
+    # Kind ("healthy", "routers", "tcpServices", ...) -> JSON body and its ETag
+    bodies: Mapping[str, bytes]
+    etags: Mapping[str, str]
+    health: Mapping[str, Any]
+    counts: Mapping[str, int]
+    # List kind -> entry name -> entry status ("enabled", "disabled", ...)
+    statuses: Mapping[str, Mapping[str, str]]
+    # Set when the lists could not be fetched: they are the previous poll's
+    error: Optional[str] = None
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_monotonic
+
+
+def diff_snapshots(
+    previous: TraefikSnapshot, current: TraefikSnapshot
+) -> Dict[str, Any]:
+    """
+    Returns the entries that appeared, disappeared or changed status between
+    two snapshots, plus the health verdict if it changed. Kinds whose body
+    is unchanged (same ETag) are skipped without comparing entries.
+    """
+    changes: Dict[str, Any] = {}
+    for kind, statuses in current.statuses.items():
+        if previous.etags.get(kind) == current.etags.get(kind):
+            continue
+        before = previous.statuses.get(kind, {})
+        added = {
+            name: status for name, status in statuses.items() if name not in before
+        }
+        removed = [name for name in before if name not in statuses]
+        changed = {
+            name: status
+            for name, status in statuses.items()
+            if name in before and before[name] != status
+        }
+        if added or removed or changed:
+            changes[kind] = {"added": added, "removed": removed, "status": changed}
+
+    if previous.health.get("status") != current.health.get("status"):
+        changes[HEALTH] = current.health.get("status")
+    return changes
+
+
+class SnapshotPoller:
+    """
+    Polls the Traefik status lists and health check on a fixed interval and
+    keeps the latest result as an immutable TraefikSnapshot, so upstream load
+    no longer grows with the number of viewers.
+
+    A snapshot younger than `interval` is fresh. Up to `stale_ttl` seconds
+    past that it is still served, while a refresh runs in the background
+    (stale-while-revalidate). Older snapshots are refreshed before serving.
+    With an interval of 0 polling is off and callers proxy live.
+    """
+
+    def __init__(
+        self,
+        api_service: TraefikApiService,
+        interval: Optional[float] = None,
+        stale_ttl: Optional[float] = None,
+    ) -> None:
+        self.api_service = api_service
+        self.interval = (
+            settings.traefik_snapshot_interval if interval is None else interval
+        )
+        self.stale_ttl = (
+            settings.traefik_snapshot_stale_ttl if stale_ttl is None else stale_ttl
+        )
+        self.enabled = self.interval > 0
+        self.snapshot: Optional[TraefikSnapshot] = None
+        self._refreshing: Optional[asyncio.Task] = None
+        self._task: Optional[asyncio.Task] = None
+        self._listeners: List[SnapshotListener] = []
+
+        # Metrics
+        self.polls = 0
+        self.failures = 0
+        self.served_fresh = 0
+        self.served_stale = 0
+        self.served_after_refresh = 0
+
+    def add_listener(self, listener: SnapshotListener) -> None:
+        """Registers a callback run with (previous, current) after each poll."""
+        self._listeners.append(listener)
+
+    # -------------------- BACKGROUND TASK --------------------
+    def start(self) -> None:
+        """Starts the poll loop (call from the app startup)."""
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        for task in (self._task, self._refreshing):
+            if task is not None:
+                task.cancel()
+        self._task = None
+        self._refreshing = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                pass  # counted and logged by _on_refreshed
+            await asyncio.sleep(self.interval)
+
+    # -------------------- REFRESH --------------------
+    async def refresh(self) -> TraefikSnapshot:
+        """Polls Traefik now; concurrent callers share one in-flight poll."""
+        # Shielded: one caller giving up must not cancel the shared poll
+        return await asyncio.shield(self._start_refresh())
+
+    def _start_refresh(self) -> asyncio.Task:
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.create_task(self._poll())
+            self._refreshing.add_done_callback(self._on_refreshed)
+        return self._refreshing
+
+    def _on_refreshed(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            self.failures += 1
+            logger.error("Error polling the Traefik API: %s", task.exception())
+
+    async def _poll(self) -> TraefikSnapshot:
+        """
+        Fetches health and every list. When a list cannot be fetched, the
+        previous snapshot's lists are kept (with `error` set) rather than
+        replaced by empty ones, or empty lists served if there is none yet.
+        The health verdict is always fresh.
+        """
+        started = time.monotonic()
+        health, *results = await asyncio.gather(
+            self.api_service.get_status(),
+            *(self.api_service.fetch_list(path) for path in LIVE_LISTS.values()),
+            return_exceptions=True,
+        )
+        if isinstance(health, BaseException):
+            raise health
+
+        previous = self.snapshot
+        failed = [result for result in results if isinstance(result, BaseException)]
+        error = None
+        if failed:
+            self.failures += 1
+            error = str(failed[0]) or repr(failed[0])
+        if failed and previous is not None:
+            logger.warning("Keeping the last Traefik lists, polling failed: %s", error)
+            bodies = {kind: previous.bodies[kind] for kind in LIVE_LISTS}
+            etags = {kind: previous.etags[kind] for kind in LIVE_LISTS}
+            counts = previous.counts
+            statuses = previous.statuses
+        else:
+            if failed:
+                logger.warning("Serving empty Traefik lists, polling failed: %s", error)
+                results = [[] for _ in LIVE_LISTS]
+            lists = dict(zip(LIVE_LISTS, results))
+            bodies = {
+                kind: json.dumps(entries, separators=(",", ":")).encode()
+                for kind, entries in lists.items()
+            }
+            etags = {kind: make_etag(body) for kind, body in bodies.items()}
+            counts = MappingProxyType(
+                {kind: len(entries) for kind, entries in lists.items()}
+            )
+            statuses = MappingProxyType(
+                {
+                    kind: MappingProxyType(
+                        {
+                            entry.get("name", ""): entry.get("status", "")
+                            for entry in entries
+                        }
+                    )
+                    for kind, entries in lists.items()
+                }
+            )
+
+        bodies[HEALTH] = json.dumps(health, separators=(",", ":")).encode()
+        etags[HEALTH] = health_etag(health)
+        self.polls += 1
+        self.snapshot = TraefikSnapshot(
+            version=self.polls,
+            fetched_at=time.time(),
+            fetched_monotonic=time.monotonic(),
+            duration_ms=round((time.monotonic() - started) * 1000, 2),
+            bodies=MappingProxyType(bodies),
+            etags=MappingProxyType(etags),
+            health=MappingProxyType(health),
+            counts=counts,
+            statuses=statuses,
+            error=error,
+        )
+        for listener in self._listeners:
+            try:
+                listener(previous, self.snapshot)
+            except Exception:
+                logger.exception("Error in snapshot listener")
+        return self.snapshot
+
+    # -------------------- READ --------------------
+    async def get(self) -> Optional[TraefikSnapshot]:
+        """
+        Returns a snapshot to serve, or None when polling is disabled.
+        Stale snapshots within the window trigger a background refresh.
+        """
+        if not self.enabled:
+            return None
+
+        snapshot = self.snapshot
+        if snapshot is not None:
+            age = snapshot.age
+            if age <= self.interval:
+                self.served_fresh += 1
+                return snapshot
+            if age <= self.interval + self.stale_ttl:
+                self.served_stale += 1
+                self._start_refresh()
+                return snapshot
+
+        self.served_after_refresh += 1
+        return await self.refresh()
+
+    def response(
+        self, snapshot: TraefikSnapshot, kind: str, if_none_match: Optional[str]
+    ) -> Response:
+        """Serves one kind of a snapshot with ETag, Age and caching headers."""
+        age = snapshot.age
+        headers = {
+            "ETag": snapshot.etags[kind],
+            "Age": str(int(age)),
+            "Cache-Control": (
+                f"private, max-age={max(0, int(self.interval - age))}, "
+                f"stale-while-revalidate={int(self.stale_ttl)}"
+            ),
+        }
+        if etag_matches(if_none_match, snapshot.etags[kind]):
+            return Response(status_code=304, headers=headers)
+        return Response(
+            content=snapshot.bodies[kind],
+            media_type="application/json",
+            headers=headers,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns poll counters and how requests were served."""
+        snapshot = self.snapshot
+        return {
+            "enabled": self.enabled,
+            "interval": self.interval,
+            "stale_ttl": self.stale_ttl,
+            "polls": self.polls,
+            "failures": self.failures,
+            "error": snapshot.error if snapshot else None,
+            "age": round(snapshot.age, 2) if snapshot else None,
+            "last_poll_ms": snapshot.duration_ms if snapshot else None,
+            "served_fresh": self.served_fresh,
+            "served_stale": self.served_stale,
+            "served_after_refresh": self.served_after_refresh,
+        }
@@ -1,113 +1,344 @@
+import logging
 import os
-import yaml
-from core.config import settings
+import threading
+from functools import partial
 from pathlib import Path
+from typing import IO, Any, Callable, Dict, Optional, Sequence
+
+from pydantic import BaseModel
+
+from core.config import settings
+from core.models import (
+    TraefikTcpBlock,
+    TraefikTcpConfig,
+    TraefikTcpRouter,
+    TraefikTcpService,
+    TraefikUdpBlock,
+    TraefikUdpConfig,
+    TraefikUdpRouter,
+    TraefikUdpService,
+)
+from lib.traefik import yaml_io
+from lib.traefik.async_io import AsyncManager
+from lib.traefik.changes import ChangeFeed, EntryChange
+from lib.traefik.config_cache import ParsedFileCache, file_signature
+from lib.traefik.config_writer import atomic_write, get_writer
+from lib.traefik.publisher import publisher
+from lib.traefik.sharded_store import ShardedConfigStore
+
+logger = logging.getLogger(__name__)
+
+# Run inside a write, before it is applied, with the changes of earlier
+# writes that are not on disk yet; raises to cancel the write
+ChangeCheck = Callable[[Sequence[EntryChange]], None]
+
+# Before TCP and UDP were split, both lived in this file
+LEGACY_CONFIG_FILE = "traefik-tcp-udp-configs.yaml"
+
 
 class TcpUdpManager:
+    # protocol -> (backing file, config model, block model)
+    PROTOCOLS = {
+        "tcp": ("traefik-tcp-configs.yaml", TraefikTcpConfig, TraefikTcpBlock),
+        "udp": ("traefik-udp-configs.yaml", TraefikUdpConfig, TraefikUdpBlock),
+    }
+    # protocol -> section -> entry model
+    MODELS = {
+        "tcp": {"routers": TraefikTcpRouter, "services": TraefikTcpService},
+        "udp": {"routers": TraefikUdpRouter, "services": TraefikUdpService},
+    }
+
     def __init__(self):
-        self.config_file = Path(settings.traefik_config_path, "dynamic/traefik-tcp-udp-configs.yaml") 
-        if not self.config_file.exists():
-            self.config_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.config_file, "w") as f:
-                f.write("")
-
-       
-
-
-    def _read_config(self):
-        if not os.path.exists(self.config_file):
-            return {}
-        with open(self.config_file, "r") as f:
-            return yaml.safe_load(f) or {}
-
-    def _write_config(self, config):
-        with open(self.config_file, "w") as f:
-            yaml.dump(config, f, default_flow_style=False)
-
-    # TCP Routers
-    def get_tcp_routers(self):
-        config = self._read_config()
-        return config.get("tcp", {}).get("routers", {})
-
-    def update_tcp_router(self, name: str, router_data: dict):
-        config = self._read_config()
-        if "tcp" not in config:
-            config["tcp"] = {}
-        if "routers" not in config["tcp"]:
-            config["tcp"]["routers"] = {}
-        config["tcp"]["routers"][name] = router_data
-        self._write_config(config)
-
-    def delete_tcp_router(self, name: str):
-        config = self._read_config()
-        if "tcp" in config and "routers" in config["tcp"] and name in config["tcp"]["routers"]:
-            del config["tcp"]["routers"][name]
-            self._write_config(config)
-            return True
-        return False
-
-    # TCP Services
-    def get_tcp_services(self):
-        config = self._read_config()
-        return config.get("tcp", {}).get("services", {})
-
-    def update_tcp_service(self, name: str, service_data: dict):
-        config = self._read_config()
-        if "tcp" not in config:
-            config["tcp"] = {}
-        if "services" not in config["tcp"]:
-            config["tcp"]["services"] = {}
-        config["tcp"]["services"][name] = service_data
-        self._write_config(config)
-
-    def delete_tcp_service(self, name: str):
-        config = self._read_config()
-        if "tcp" in config and "services" in config["tcp"] and name in config["tcp"]["services"]:
-            del config["tcp"]["services"][name]
-            self._write_config(config)
-            return True
-        return False
-
-    # UDP Routers
-    def get_udp_routers(self):
-        config = self._read_config()
-        return config.get("udp", {}).get("routers", {})
-
-    def update_udp_router(self, name: str, router_data: dict):
-        config = self._read_config()
-        if "udp" not in config:
-            config["udp"] = {}
-        if "routers" not in config["udp"]:
-            config["udp"]["routers"] = {}
-        config["udp"]["routers"][name] = router_data
-        self._write_config(config)
-
-    def delete_udp_router(self, name: str):
-        config = self._read_config()
-        if "udp" in config and "routers" in config["udp"] and name in config["udp"]["routers"]:
-            del config["udp"]["routers"][name]
-            self._write_config(config)
-            return True
-        return False
-
-    # UDP Services
-    def get_udp_services(self):
-        config = self._read_config()
-        return config.get("udp", {}).get("services", {})
-
-    def update_udp_service(self, name: str, service_data: dict):
-        config = self._read_config()
-        if "udp" not in config:
-            config["udp"] = {}
-        if "services" not in config["udp"]:
-            config["udp"]["services"] = {}
-        config["udp"]["services"][name] = service_data
-        self._write_config(config)
-
-    def delete_udp_service(self, name: str):
-        config = self._read_config()
-        if "udp" in config and "services" in config["udp"] and name in config["udp"]["services"]:
-            del config["udp"]["services"][name]
-            self._write_config(config)
-            return True
-        return False
\ No newline at end of file
+        self.dynamic_dir = publisher.dynamic_dir
+        self.config_files = {
+            protocol: self.dynamic_dir / file_name
+            for protocol, (file_name, _, _) in self.PROTOCOLS.items()
+        }
+        self.sharded = settings.traefik_config_layout == "sharded"
+        self.aio = AsyncManager(self)
+        # Entries written through this manager, for the in-memory indexes
+        self.changes = ChangeFeed()
+
+        if self.sharded:
+            # One file per entry under dynamic/<tcp|udp>/<section>/<name>.yaml
+            self._stores = {}
+            for protocol in self.PROTOCOLS:
+                publisher.path(protocol)
+                self._stores[protocol] = ShardedConfigStore(self.dynamic_dir, protocol)
+            # Serializes checked writes with every other shard write
+            self._store_lock = threading.Lock()
+            return
+
+        for dynamic_dir in {publisher.live_dir, self.dynamic_dir}:
+            self._split_legacy_file(dynamic_dir)
+
+        for config_file in self.config_files.values():
+            publisher.path(config_file.name)
+            if not config_file.exists():
+                config_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(config_file, "w") as f:
+                    f.write("")
+
+        # Validated configs, re-parsed only when a file changes on disk
+        self._cache = ParsedFileCache()
+        # Entry counts read from the raw YAML, for callers that need no models
+        self._counts = ParsedFileCache()
+        # Locked, atomic, coalescing writes, one writer per protocol file
+        self._writers = {
+            protocol: get_writer(
+                config_file,
+                partial(self._read_config_for_update, protocol),
+                self._dump_config,
+            )
+            for protocol, config_file in self.config_files.items()
+        }
+        for protocol, writer in self._writers.items():
+            writer.add_flush_listener(partial(self._on_flush, protocol))
+
+    # -------------------- INTERNAL I/O --------------------
+    def _split_legacy_file(self, dynamic_dir: Path):
+        """Moves the old shared TCP/UDP file into one file per protocol."""
+        legacy_file = dynamic_dir / LEGACY_CONFIG_FILE
+        if not legacy_file.exists():
+            return
+
+        with open(legacy_file, "r") as f:
+            data = yaml_io.load(f) or {}
+        for protocol, (file_name, _, _) in self.PROTOCOLS.items():
+            config_file = dynamic_dir / file_name
+            if data.get(protocol) and not config_file.exists():
+                block = {protocol: data[protocol]}
+                atomic_write(config_file, lambda f: yaml_io.dump(block, f))
+        os.replace(legacy_file, legacy_file.with_name(legacy_file.name + ".bak"))
+
+    def _read_config(self, protocol: str) -> BaseModel:
+        """
+        Returns the parsed config of one protocol, served from the in-process
+        cache while its file is unchanged. The result is shared: do not mutate it.
+        """
+        return self._cache.get(
+            self.config_files[protocol], partial(self._load_config, protocol)
+        )
+
+    def _read_config_for_update(self, protocol: str) -> BaseModel:
+        """Returns a private copy of a protocol config that may be mutated."""
+        return self._read_config(protocol).model_copy(deep=True)
+
+    def _load_config(self, protocol: str) -> BaseModel:
+        """Reads one protocol's YAML file and returns a Pydantic model."""
+        _, config_model, _ = self.PROTOCOLS[protocol]
+        config_file = self.config_files[protocol]
+        if not os.path.exists(config_file):
+            return config_model()
+        try:
+            with open(config_file, "r") as f:
+                data = yaml_io.load(f) or {}
+            return config_model.model_validate({protocol: data.get(protocol)})
+        except Exception:
+            logger.exception("Error reading %s", config_file)
+            raise
+
+    def _load_counts(self, protocol: str) -> Dict[str, int]:
+        """Counts one protocol's entries per section without validating them."""
+        block = {}
+        config_file = self.config_files[protocol]
+        if os.path.exists(config_file):
+            with open(config_file, "r") as f:
+                block = (yaml_io.load(f) or {}).get(protocol) or {}
+        return {
+            section: len(block.get(section) or {}) for section in self.MODELS[protocol]
+        }
+
+    @staticmethod
+    def _dump_config(config: BaseModel, stream: IO[str]):
+        yaml_io.dump(config.model_dump(exclude_none=True), stream)
+
+    def _get_entries(self, protocol: str, section: str) -> Dict[str, Any]:
+        if self.sharded:
+            model = self.MODELS[protocol][section]
+            return self._stores[protocol].read_section(section, model.model_validate)
+        block = getattr(self._read_config(protocol), protocol)
+        return (getattr(block, section) if block else None) or {}
+
+    def _update_entry(
+        self,
+        protocol: str,
+        section: str,
+        name: str,
+        data: Optional[BaseModel],
+        check: Optional[ChangeCheck] = None,
+    ) -> bool:
+        """
+        Adds/updates an entry, or deletes it when `data` is None. `check` runs
+        under the writer's lock first and may cancel the write by raising.
+        """
+        if not self.sharded:
+            return self._update_file_entry(protocol, section, name, data, check)
+        store = self._stores[protocol]
+        with self._store_lock:
+            if check is not None:
+                check(())
+            before = self.config_version(protocol)
+            if data is None:
+                changed = store.delete_entry(section, name)
+            else:
+                store.write_entry(section, name, data.model_dump(exclude_none=True))
+                changed = True
+            if changed:
+                self.changes.emit(
+                    protocol,
+                    before,
+                    self.config_version(protocol),
+                    [(section, name, data)],
+                )
+            return changed
+
+    def _on_flush(
+        self, protocol: str, before: Any, after: Any, state: Dict[str, Any]
+    ) -> None:
+        """Reports every change of a flush, with the versions it went between."""
+        self.changes.emit(protocol, before, after, state.get("changes", []))
+
+    def _update_file_entry(
+        self,
+        protocol: str,
+        section: str,
+        name: str,
+        data: Optional[BaseModel],
+        check: Optional[ChangeCheck],
+    ) -> bool:
+        """Applies one change to the protocol's config file."""
+        _, _, block_model = self.PROTOCOLS[protocol]
+        writer = self._writers[protocol]
+
+        def mutate(config: BaseModel) -> bool:
+            # Changes of the writes before this one in the same flush
+            applied = writer.flush_state.setdefault("changes", [])
+            if check is not None:
+                check(applied)
+            block = getattr(config, protocol) or block_model()
+            entries = getattr(block, section) or {}
+            if data is not None:
+                entries[name] = data
+                changed = True
+            else:
+                changed = entries.pop(name, None) is not None
+            setattr(block, section, entries or None)
+            # Sections the panel does not manage count too
+            has_entries = any(value for _, value in block)
+            setattr(config, protocol, block if has_entries else None)
+            applied.append((section, name, data))
+            return changed
+
+        return writer.submit(mutate)
+
+    def config_version(self, protocol: str) -> Any:
+        """Returns a cheap token that changes whenever a protocol's config does."""
+        if self.sharded:
+            return self._stores[protocol].signature()
+        return file_signature(self.config_files[protocol])
+
+    def count_entries(self) -> Dict[str, Dict[str, int]]:
+        """Returns {protocol: {section: number of entries}}."""
+        if self.sharded:
+            return {
+                protocol: {
+                    section: self._stores[protocol].count_section(section)
+                    for section in sections
+                }
+                for protocol, sections in self.MODELS.items()
+            }
+        return {
+            protocol: self._counts.get(
+                self.config_files[protocol], partial(self._load_counts, protocol)
+            )
+            for protocol in self.PROTOCOLS
+        }
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters of the parsed-config cache."""
+        if self.sharded:
+            return {p: store.cache_stats() for p, store in self._stores.items()}
+        return self._cache.stats()
+
+    def writer_stats(self) -> Dict[str, Any]:
+        """Returns submitted updates versus actual rewrites, per protocol."""
+        if self.sharded:
+            return {p: store.stats() for p, store in self._stores.items()}
+        return {p: writer.stats() for p, writer in self._writers.items()}
+
+    # -------------------- TCP ROUTERS --------------------
+    def get_tcp_routers(self) -> Dict[str, TraefikTcpRouter]:
+        """Retrieves all TCP routers."""
+        return self._get_entries("tcp", "routers")
+
+    def update_tcp_router(
+        self,
+        name: str,
+        router_data: TraefikTcpRouter,
+        check: Optional[ChangeCheck] = None,
+    ):
+        """Adds or updates a TCP router."""
+        self._update_entry("tcp", "routers", name, router_data, check)
+
+    def delete_tcp_router(self, name: str, check: Optional[ChangeCheck] = None) -> bool:
+        """Deletes a TCP router by name."""
+        return self._update_entry("tcp", "routers", name, None, check)
+
+    # -------------------- TCP SERVICES --------------------
+    def get_tcp_services(self) -> Dict[str, TraefikTcpService]:
+        """Retrieves all TCP services."""
+        return self._get_entries("tcp", "services")
+
+    def update_tcp_service(
+        self,
+        name: str,
+        service_data: TraefikTcpService,
+        check: Optional[ChangeCheck] = None,
+    ):
+        """Adds or updates a TCP service."""
+        self._update_entry("tcp", "services", name, service_data, check)
+
+    def delete_tcp_service(
+        self, name: str, check: Optional[ChangeCheck] = None
+    ) -> bool:
+        """Deletes a TCP service by name."""
+        return self._update_entry("tcp", "services", name, None, check)
+
+    # -------------------- UDP ROUTERS --------------------
+    def get_udp_routers(self) -> Dict[str, TraefikUdpRouter]:
+        """Retrieves all UDP routers."""
+        return self._get_entries("udp", "routers")
+
+    def update_udp_router(
+        self,
+        name: str,
+        router_data: TraefikUdpRouter,
+        check: Optional[ChangeCheck] = None,
+    ):
+        """Adds or updates a UDP router."""
+        self._update_entry("udp", "routers", name, router_data, check)
+
+    def delete_udp_router(self, name: str, check: Optional[ChangeCheck] = None) -> bool:
+        """Deletes a UDP router by name."""
+        return self._update_entry("udp", "routers", name, None, check)
+
+    # -------------------- UDP SERVICES --------------------
+    def get_udp_services(self) -> Dict[str, TraefikUdpService]:
+        """Retrieves all UDP services."""
+        return self._get_entries("udp", "services")
+
+    def update_udp_service(
+        self,
+        name: str,
+        service_data: TraefikUdpService,
+        check: Optional[ChangeCheck] = None,
+    ):
+        """Adds or updates a UDP service."""
+        self._update_entry("udp", "services", name, service_data, check)
+
+    def delete_udp_service(
+        self, name: str, check: Optional[ChangeCheck] = None
+    ) -> bool:
+        """Deletes a UDP service by name."""
+        return self._update_entry("udp", "services", name, None, check)
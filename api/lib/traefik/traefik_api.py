@@ -1,98 +1,379 @@
-from typing import Any, Dict, List
+import asyncio
+import logging
+import time
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 import httpx
 
 from core.config import settings
+from lib.traefik.circuit_breaker import CircuitBreaker, CircuitOpenError
+from lib.traefik.rawdata import RawdataProjector, RawdataSummary
+
+logger = logging.getLogger(__name__)
 
 JSONDict = Dict[str, Any]
 
+# Dashboard count key -> Traefik API list path
+LIVE_LISTS = {
+    "routers": "/http/routers",
+    "services": "/http/services",
+    "middlewares": "/http/middlewares",
+    "tcpRouters": "/tcp/routers",
+    "tcpServices": "/tcp/services",
+    "udpRouters": "/udp/routers",
+    "udpServices": "/udp/services",
+}
+
+
+# Health probe name -> path, probed concurrently by get_status()
+STATUS_PROBES = {
+    "ping": "/ping",
+    "rawdata": "/api/rawdata",
+    "overview": "/api/overview",
+}
+
+
+def _json_body(response: Optional[httpx.Response]) -> JSONDict:
+    """Returns a probe's JSON object body, or {} if it failed or is not one."""
+    if response is None or response.status_code != 200:
+        return {}
+    try:
+        data = response.json()
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
 
 class TraefikApiService:
-    def __init__(self) -> None:
-        self.base_url: str = settings.traefik_api_url.rstrip("/")
+    def __init__(self, base_url: Optional[str] = None) -> None:
+        self.base_url: str = (base_url or settings.traefik_api_url).rstrip("/")
+        self._client: Optional[httpx.AsyncClient] = None
+        # Path -> in-flight upstream GET shared by identical concurrent requests
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.breaker = CircuitBreaker(
+            settings.traefik_api_breaker_threshold,
+            settings.traefik_api_breaker_cooldown,
+        )
+
+        # Metrics
+        self.upstream_requests = 0
+        self.coalesced_requests = 0
+
+    # -------------------- CLIENT LIFECYCLE --------------------
+    async def start(self) -> None:
+        """Opens the shared, keep-alive client (call from the app startup)."""
+        if self._client is None:
+            self._client = self._create_client()
+
+    async def close(self) -> None:
+        """Closes the shared client and its pooled connections."""
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Created lazily too, for callers that run outside the app lifecycle
+        if self._client is None:
+            self._client = self._create_client()
+        return self._client
+
+    @staticmethod
+    def _create_client() -> httpx.AsyncClient:
+        http2 = settings.traefik_api_http2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning(
+                    "TRAEFIK_API_HTTP2 needs the h2 package, using HTTP/1.1"
+                )
+                http2 = False
+
+        return httpx.AsyncClient(
+            http2=http2,
+            timeout=httpx.Timeout(
+                settings.traefik_api_read_timeout,
+                connect=settings.traefik_api_connect_timeout,
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.traefik_api_max_connections,
+                max_keepalive_connections=(
+                    settings.traefik_api_max_keepalive_connections
+                ),
+            ),
+        )
 
     # -------------------- INTERNAL --------------------
+    async def _request(self, path: str) -> httpx.Response:
+        """
+        GETs `path` (relative to the API base URL). Identical concurrent GETs
+        share one upstream request, and while the circuit breaker is open
+        calls fail fast with CircuitOpenError instead of waiting on Traefik.
+        """
+        return await self._single_flight(path, partial(self._send, path))
+
+    async def _request_summary(self, path: str) -> RawdataSummary:
+        """
+        GETs a rawdata document and projects it into a RawdataSummary while
+        it streams in, without holding the whole body. Shared and guarded
+        like _request; non-200 responses raise httpx.HTTPStatusError.
+        """
+        return await self._single_flight(
+            f"{path}#summary", partial(self._send_projected, path)
+        )
+
+    async def _single_flight(
+        self, key: str, send: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(send())
+            self._inflight[key] = task
+            task.add_done_callback(partial(self._request_done, key))
+        else:
+            self.coalesced_requests += 1
+        # Shielded: a caller timing out must not cancel the shared request
+        return await asyncio.shield(task)
+
+    def _request_done(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # retrieved here in case every caller gave up
+
+    async def _send(self, path: str) -> httpx.Response:
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"Circuit open, not calling {path}")
+        self.upstream_requests += 1
+        try:
+            response = await self.client.get(f"{self.base_url}{path}")
+        except httpx.RequestError:
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            self.breaker.release_trial()
+            raise
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
+
+    async def _send_projected(self, path: str) -> RawdataSummary:
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"Circuit open, not calling {path}")
+        self.upstream_requests += 1
+        try:
+            async with self.client.stream("GET", f"{self.base_url}{path}") as response:
+                if response.status_code >= 500:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+                response.raise_for_status()
+                projector = RawdataProjector()
+                async for chunk in response.aiter_bytes():
+                    projector.feed(chunk)
+                return projector.close()
+        except httpx.RequestError:
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            self.breaker.release_trial()
+            raise
+
+    def client_stats(self) -> JSONDict:
+        """Returns circuit breaker state and request coalescing counters."""
+        return {
+            "circuit": self.breaker.stats(),
+            "upstream_requests": self.upstream_requests,
+            "coalesced_requests": self.coalesced_requests,
+            "in_flight": len(self._inflight),
+        }
+
     async def _get(self, path: str) -> JSONDict:
         """
         Perform HTTP GET and always return dict.
         Errors return dict with "error".
         """
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(f"{self.base_url}{path}")
-                response.raise_for_status()
-                data = response.json()
-                if isinstance(data, dict):
-                    return data
-                # If API returned a list, wrap in dict to satisfy typing
-                return {"data": data}
-            except httpx.RequestError as exc:
-                return {"error": f"Connection error: {exc}"}
-            except httpx.HTTPStatusError as exc:
-                return {"error": f"HTTP error {exc.response.status_code}"}
+        try:
+            response = await self._request(path)
+            response.raise_for_status()
+            data = response.json()
+            if isinstance(data, dict):
+                return data
+            # If API returned a list, wrap in dict to satisfy typing
+            return {"data": data}
+        except httpx.RequestError as exc:
+            return {"error": f"Connection error: {exc}"}
+        except httpx.HTTPStatusError as exc:
+            return {"error": f"HTTP error {exc.response.status_code}"}
 
     async def _get_list(self, path: str) -> List[JSONDict]:
         """
         Perform GET and return list of dicts.
         On error or empty response, return empty list.
         """
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(f"{self.base_url}/api{path}")
-                response.raise_for_status()
-                data = response.json()
-                if isinstance(data, list):
-                    return data
-                elif isinstance(data, dict):
-                    # Sometimes Traefik returns dict of routers/services, convert to list of dicts
-                    return list(data.values())
-            except httpx.RequestError:
-                print("Request error", httpx.RequestError)
-                return []
-            except httpx.HTTPStatusError:
-                print("Request error", httpx.HTTPStatusError)
-                return []
+        try:
+            return await self.fetch_list(path)
+        except (httpx.RequestError, httpx.HTTPStatusError) as e:
+            logger.warning("Error fetching %s: %s", path, e)
+            return []
+
+    async def fetch_list(self, path: str) -> List[JSONDict]:
+        """Like _get_list, but raises httpx.HTTPError instead of returning []."""
+        response = await self._request(f"/api{path}")
+        response.raise_for_status()
+        data = response.json()
+        if isinstance(data, list):
+            return data
+        elif isinstance(data, dict):
+            # Sometimes Traefik returns dict of routers/services, convert to list of dicts
+            return list(data.values())
         return []
 
     # -------------------- STATUS / HEALTH --------------------
     async def get_status(self) -> JSONDict:
         """
         Returns Traefik status: DOWN, BROKEN, EMPTY, RUNNING
+
+        /ping, /api/rawdata and /api/overview are probed concurrently, each
+        under `traefik_status_probe_timeout`, and the whole check under
+        `traefik_status_timeout`. A DOWN or BROKEN verdict returns as soon as
+        it is known, cancelling the other probes. `probes` holds each probe's
+        outcome and duration.
         """
-        # 1. Liveness
+        probes: Dict[str, JSONDict] = {}
+        tasks = {
+            asyncio.create_task(self._probe(name, path, probes)): name
+            for name, path in STATUS_PROBES.items()
+        }
+        results: Dict[str, Any] = {}
+        pending = set(tasks)
+        deadline = time.perf_counter() + settings.traefik_status_timeout
+        verdict = None
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.base_url}/ping")
-                if response.status_code != 200 or response.text.strip() != "OK":
-                    return {"status": "DOWN", "details": {"text": response.text}}
-        except Exception as exc:
-            return {"status": "DOWN", "details": {"error": str(exc)}}
+            while pending and verdict is None:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    results[tasks[task]] = task.result()
+                verdict = self._status_verdict(results, probes)
+        finally:
+            for task in pending:
+                task.cancel()
+            # Let cancelled probes record themselves before `probes` is returned
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        if verdict is None:
+            # Out of time: decide with what we have
+            verdict = self._status_verdict(results, probes, final=True)
+        return {**verdict, "probes": probes, **self.client_stats()}
+
+    async def _probe(self, name: str, path: str, probes: Dict[str, JSONDict]) -> Any:
+        """
+        GETs one status probe; records its outcome and duration in `probes`.
+        Returns the response, or for rawdata (only read for provider errors)
+        its RawdataSummary.
+        """
+        started = time.perf_counter()
+        outcome: JSONDict = {"status": "cancelled"}
+        timeout = settings.traefik_status_probe_timeout
+        try:
+            if name == "rawdata":
+                summary = await asyncio.wait_for(
+                    self._request_summary(path), timeout=timeout
+                )
+                outcome = {"status": "ok", "http_status": 200}
+                return summary
+            response = await asyncio.wait_for(self._request(path), timeout=timeout)
+            outcome = {"status": "ok", "http_status": response.status_code}
+            return response
+        except asyncio.TimeoutError:
+            outcome = {"status": "timeout"}
+        except httpx.HTTPStatusError as exc:
+            outcome = {"status": "ok", "http_status": exc.response.status_code}
+        except ValueError as exc:
+            outcome = {"status": "error", "error": str(exc)}
+        except httpx.HTTPError as exc:
+            outcome = {"status": "error", "error": str(exc) or repr(exc)}
+        finally:
+            outcome["ms"] = round((time.perf_counter() - started) * 1000, 2)
+            probes[name] = outcome
+        return None
+
+    @staticmethod
+    def _status_verdict(
+        results: Dict[str, Any],
+        probes: Dict[str, JSONDict],
+        final: bool = False,
+    ) -> Optional[JSONDict]:
+        """
+        Returns the status once the probes finished so far are enough to
+        decide it, else None. With `final`, missing probes count as failed.
+        """
+        # 1. Liveness
+        if "ping" in results or final:
+            ping = results.get("ping")
+            if ping is None:
+                error = probes.get("ping", {}).get("error") or "ping timed out"
+                return {"status": "DOWN", "details": {"error": error}}
+            if ping.status_code != 200 or ping.text.strip() != "OK":
+                return {"status": "DOWN", "details": {"text": ping.text}}
 
         # 2. Raw config validation
-        raw = await self._get("/rawdata")
-        providers = raw.get("providers", {})
-        for name, provider in providers.items():
-            if provider.get("error"):
-                return {
-                    "status": "BROKEN",
-                    "provider": name,
-                    "error": provider["error"],
-                }
+        raw: Optional[RawdataSummary] = results.get("rawdata")
+        for name, errors in (raw.provider_errors if raw else {}).items():
+            return {
+                "status": "BROKEN",
+                "provider": name,
+                "error": errors[0] if len(errors) == 1 else errors,
+            }
 
         # 3. Readiness
-        overview = await self._get("/overview")
+        if not final and len(results) < len(STATUS_PROBES):
+            return None
+        if results.get("overview") is None:
+            # Alive and no provider errors, but readiness could not be read
+            return {"status": "RUNNING", "details": "overview unavailable"}
+        overview = _json_body(results.get("overview"))
         http_data = overview.get("http", {})
         if not http_data.get("routers"):
             return {"status": "RUNNING", "details": "EMPTY"}
 
         return {"status": "RUNNING"}
 
+    async def get_lists(self) -> Dict[str, List[JSONDict]]:
+        """Fetches every live entry list concurrently, keyed as LIVE_LISTS."""
+        lists = await asyncio.gather(
+            *(self._get_list(path) for path in LIVE_LISTS.values())
+        )
+        return dict(zip(LIVE_LISTS, lists))
+
+    async def get_counts(self) -> Dict[str, int]:
+        """Fetches every live entry list concurrently and returns their sizes."""
+        lists = await self.get_lists()
+        return {key: len(entries) for key, entries in lists.items()}
+
     # -------------------- API ENDPOINTS --------------------
     async def get_overview(self) -> JSONDict:
-        return await self._get("/overview")
+        return await self._get("/api/overview")
 
     async def get_rawdata(self) -> JSONDict:
-        return await self._get("/rawdata")
+        return await self._get("/api/rawdata")
+
+    async def get_rawdata_summary(self) -> RawdataSummary:
+        """
+        Per-entry status and errors, counts and provider errors of
+        /api/rawdata, projected while it streams in. Raises httpx.HTTPError
+        or ValueError on failure.
+        """
+        return await self._request_summary("/api/rawdata")
 
     async def get_routers(self) -> List[JSONDict]:
         return await self._get_list("/http/routers")
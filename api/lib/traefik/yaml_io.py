@@ -0,0 +1,41 @@
+from typing import IO, Any, Optional
+
+import yaml
+
+# LibYAML's C loader/dumper are several times faster than the pure-Python
+# ones. PyYAML only ships them when it was built against libyaml.
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+
+    LIBYAML = True
+except ImportError:  # pragma: no cover - depends on the PyYAML build
+    from yaml import SafeDumper, SafeLoader  # type: ignore[assignment]
+
+    LIBYAML = False
+
+BACKEND = "libyaml" if LIBYAML else "python"
+
+
+def load(stream: str | IO[str], loader: Any = None) -> Any:
+    """Parses one YAML document with the fastest safe loader available."""
+    return yaml.load(stream, Loader=loader or SafeLoader)
+
+
+def dump(
+    data: Any,
+    stream: Optional[IO[str]] = None,
+    sort_keys: bool = True,
+    dumper: Any = None,
+) -> Optional[str]:
+    """
+    Serializes `data` in block style with the fastest safe dumper available.
+    Returns the YAML text when no stream is given.
+    """
+    return yaml.dump(
+        data,
+        stream,
+        Dumper=dumper or SafeDumper,
+        default_flow_style=False,
+        sort_keys=sort_keys,
+    )
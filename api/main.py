@@ -7,6 +7,9 @@ from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
+from lib.etag import ETagMiddleware
+from lib.traefik.async_io import shutdown_executor
+from lib.traefik.publisher import publisher
 from routers import auth, traefik, users
 from scripts.configure_traefik_api import ensure_traefik_api_config
 
@@ -38,6 +41,19 @@ app = FastAPI(title="TPM Panel")
 async def startup_event():
     logger.info("Checking for initial user...")
     init_db()
+    publisher.start()
+    await traefik.fleet.start()
+    traefik.snapshot_poller.start()
+    traefik.events.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await publisher.stop()
+    await traefik.events.stop()
+    await traefik.snapshot_poller.stop()
+    await traefik.fleet.close()
+    shutdown_executor()
 
 
 # CORS
@@ -49,6 +65,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# ETag / 304 Not Modified for the Traefik API reads
+app.add_middleware(ETagMiddleware, prefix="/api/traefik/")
 
 # API Routers
 api_router = APIRouter(prefix="/api")
@@ -1,20 +1,49 @@
-from typing import Any, Dict, List
+import asyncio
+from functools import partial
+from typing import Any, Dict, List, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import httpx
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 
 from core.models import (
     ManualCertificateCreate,
+    TraefikBatchRequest,
     TraefikCertResolver,
+    TraefikListPage,
     TraefikMiddleware,
     TraefikRouter,
     TraefikService,
+    TraefikSimulationRequest,
+    TraefikTcpRouter,
+    TraefikTcpService,
+    TraefikUdpRouter,
+    TraefikUdpService,
 )
 from lib.dependencies import get_current_active_user
+from lib.etag import versioned_etag
+from lib.traefik.async_io import run_blocking
 from lib.traefik.certificate_resolver_manager import CertificatesResolversManager
+from lib.traefik.changes import EntryChange
+from lib.traefik.config_index import ConfigCatalog, Source
+from lib.traefik.dispatch import RouteDispatcher
+from lib.traefik.drift import DriftDetector
+from lib.traefik.events import EventBroadcaster
+from lib.traefik.fleet import TraefikFleet
+from lib.traefik.host_index import HostIndex
 from lib.traefik.http_manager import HttpManager
+from lib.traefik.list_index import ListIndex
 from lib.traefik.manual_certificates_manager import ManualCertificatesManager
+from lib.traefik.middleware_chains import MiddlewareChains
+from lib.traefik.publisher import publisher
+from lib.traefik.ref_graph import ReferenceCheck, ReferenceConflict, ReferenceGraph
+from lib.traefik.route_analysis import analyze_routers
+from lib.traefik.rule_parser import Request as RuleRequest
+from lib.traefik.search_index import SearchIndex
+from lib.traefik.snapshot import HEALTH, SnapshotPoller
 from lib.traefik.tcp_udp_manager import TcpUdpManager
-from lib.traefik.traefik_api import TraefikApiService
+from lib.traefik.traefik_api import LIVE_LISTS, TraefikApiService
 
 router = APIRouter(
     prefix="/traefik",
@@ -28,46 +57,339 @@ tcp_udp_manager = TcpUdpManager()
 certificates_manager = CertificatesResolversManager()
 manual_certs_manager = ManualCertificatesManager()
 api_service = TraefikApiService()
+fleet = TraefikFleet.from_settings(api_service)
+snapshot_poller = SnapshotPoller(api_service)
+events = EventBroadcaster()
+catalog = ConfigCatalog(
+    manager, tcp_udp_manager, certificates_manager, manual_certs_manager
+)
+list_index = ListIndex(catalog)
+host_index = HostIndex(catalog)
+search_index = SearchIndex(catalog)
+ref_graph = ReferenceGraph(catalog)
+route_dispatcher = RouteDispatcher(catalog)
+middleware_chains = MiddlewareChains(catalog)
+drift_detector = DriftDetector(catalog)
+snapshot_poller.add_listener(events.on_snapshot)
+events.watch_config("http", manager.config_version)
+events.watch_config("tcp", partial(tcp_udp_manager.config_version, "tcp"))
+events.watch_config("udp", partial(tcp_udp_manager.config_version, "udp"))
+events.watch_config("resolvers", certificates_manager.config_version)
+
+
+# ---------------- List Pagination ----------------
+DEFAULT_PAGE_SIZE = 100
+
+
+class ListQuery:
+    """Pagination, filters and sparse fieldsets of the config list endpoints."""
+
+    def __init__(
+        self,
+        limit: Optional[int] = Query(None, ge=1, le=1000),
+        cursor: Optional[str] = None,
+        prefix: Optional[str] = None,
+        entryPoint: Optional[str] = None,
+        service: Optional[str] = None,
+        middleware: Optional[str] = None,
+        tlsResolver: Optional[str] = None,
+        fields: Optional[str] = None,
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.prefix = prefix
+        self.filters = {
+            "entryPoint": entryPoint,
+            "service": service,
+            "middleware": middleware,
+            "tlsResolver": tlsResolver,
+        }
+        self.fields = (
+            [field.strip() for field in fields.split(",") if field.strip()]
+            if fields
+            else None
+        )
+
+    @property
+    def paginated(self) -> bool:
+        # Without any of these, the full name -> entry map is returned
+        return any(
+            [self.limit, self.cursor, self.prefix, self.fields, *self.filters.values()]
+        )
+
+
+async def _list_page(source: Source, query: ListQuery) -> Dict[str, Any]:
+    try:
+        return await run_blocking(
+            list_index.page,
+            source,
+            query.limit or DEFAULT_PAGE_SIZE,
+            cursor=query.cursor,
+            prefix=query.prefix,
+            filters=query.filters,
+            fields=query.fields,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/lists/index", response_model=Dict[str, Any])
+async def get_list_index_stats():
+    return list_index.stats()
+
+
+# ---------------- Host Lookup ----------------
+@router.get("/hosts/lookup", response_model=Dict[str, Any])
+async def lookup_host(host: str = Query(..., min_length=1)):
+    """HTTP and TCP routers whose Host/HostRegexp/HostSNI rules match `host`."""
+    try:
+        return await run_blocking(host_index.lookup, host)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/hosts/index", response_model=Dict[str, Any])
+async def get_host_index_stats():
+    return host_index.stats()
+
+
+# ---------------- Search ----------------
+@router.get("/search", response_model=Dict[str, Any])
+async def search_config(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=200),
+    protocol: Optional[str] = Query(None, pattern="^(http|tcp|udp|tls)$"),
+):
+    """Routers, services, middlewares, resolvers and certificates matching `q`."""
+    try:
+        return await run_blocking(search_index.search, q, limit, protocol)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/search/index", response_model=Dict[str, Any])
+async def get_search_index_stats():
+    return search_index.stats()
+
+
+# ---------------- Reference Graph ----------------
+def _reference_check(
+    protocol: str, changes: List[EntryChange], force: bool = False
+) -> ReferenceCheck:
+    """
+    A check for the manager to run inside the write: it rejects deleting
+    services or middlewares still in use, unless `force`, and collects
+    warnings for what the write leaves dangling.
+    """
+    return ReferenceCheck(ref_graph, protocol, changes, force)
+
+
+def _conflict(e: ReferenceConflict) -> HTTPException:
+    return HTTPException(
+        status_code=409, detail=f"{e} (pass force=true to delete anyway)"
+    )
+
+
+def _with_warnings(body: Dict[str, Any], warnings: List[str]) -> Dict[str, Any]:
+    return {**body, "warnings": warnings} if warnings else body
+
+
+def _batch_changes(batch: TraefikBatchRequest) -> List[EntryChange]:
+    """The batch as changes; invalid upserts are left to apply_batch."""
+    changes: List[EntryChange] = []
+    for operation in batch.operations:
+        section, model = HttpManager.SECTIONS[operation.kind]
+        if operation.op == "delete":
+            changes.append((section, operation.name, None))
+        elif operation.data is not None:
+            try:
+                changes.append(
+                    (section, operation.name, model.model_validate(operation.data))
+                )
+            except ValidationError:
+                continue
+    return changes
+
+
+@router.get("/graph/dangling", response_model=List[Dict[str, Any]])
+async def get_dangling_references():
+    """Services and middlewares used by routers but not defined."""
+    try:
+        return await run_blocking(ref_graph.dangling)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/graph/orphans", response_model=List[Dict[str, Any]])
+async def get_orphans():
+    """Services and middlewares no router uses."""
+    try:
+        return await run_blocking(ref_graph.orphans)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/graph/index", response_model=Dict[str, Any])
+async def get_reference_graph_stats():
+    return ref_graph.stats()
+
+
+@router.get("/graph/{protocol}/{section}/{name}", response_model=Dict[str, Any])
+async def get_references(protocol: str, section: str, name: str):
+    """What an entry uses and what uses it."""
+    if (protocol, section) not in ReferenceGraph.SOURCES:
+        raise HTTPException(status_code=404, detail="Unknown config section")
+    try:
+        return await run_blocking(ref_graph.node, protocol, section, name)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# ---------------- Router Simulation ----------------
+@router.post("/simulate", response_model=Dict[str, Any])
+async def simulate_request(simulation: TraefikSimulationRequest):
+    """Which HTTP router Traefik would pick for a request, and the runners-up."""
+    request = RuleRequest(
+        host=simulation.host,
+        path=simulation.path,
+        method=simulation.method,
+        headers=simulation.headers,
+        query=simulation.query,
+        client_ip=simulation.client_ip,
+    )
+    try:
+        return await run_blocking(
+            route_dispatcher.simulate,
+            request,
+            simulation.entryPoint,
+            simulation.tls,
+            simulation.limit,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/simulate/invalid", response_model=Dict[str, str])
+async def get_unsimulated_routers():
+    """Routers whose rule cannot be compiled, with the reason."""
+    return await run_blocking(route_dispatcher.invalid)
+
+
+@router.get("/simulate/index", response_model=Dict[str, Any])
+async def get_route_dispatcher_stats():
+    return route_dispatcher.stats()
+
+
+@router.get("/analysis/routers", response_model=Dict[str, Any])
+async def analyze_http_routers():
+    """Shadowed, duplicate and ambiguous HTTP routers."""
+    try:
+        routers = await manager.aio.get_routers()
+        return await run_blocking(analyze_routers, routers)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# ---------------- Middleware Chains ----------------
+@router.get("/chains/routers", response_model=Dict[str, Any])
+async def get_router_chains():
+    """Every HTTP router's effective middlewares, chains expanded."""
+    try:
+        return await run_blocking(middleware_chains.routers)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/chains/routers/{name}", response_model=Dict[str, Any])
+async def get_router_chain(name: str):
+    chain = await run_blocking(middleware_chains.router, name)
+    if chain is None:
+        raise HTTPException(status_code=404, detail="Router not found")
+    return chain
+
+
+@router.get("/chains/middlewares/{name}", response_model=Dict[str, Any])
+async def get_middleware_chain(name: str):
+    """What a middleware expands to."""
+    chain = await run_blocking(middleware_chains.middleware, name)
+    if chain is None:
+        raise HTTPException(status_code=404, detail="Middleware not found")
+    return chain
+
+
+@router.get("/chains/index", response_model=Dict[str, Any])
+async def get_middleware_chains_stats():
+    return middleware_chains.stats()
 
 
 # ---------------- HTTP Configuration ----------------
-@router.get("/config", response_model=Dict[str, Any])
+@router.get(
+    "/config",
+    response_model=Dict[str, Any],
+    dependencies=[versioned_etag(manager.aio.config_version)],
+)
 async def get_config():
     try:
-        return manager._read_config()
+        return await manager.aio.get_config()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/routers", response_model=Dict[str, TraefikRouter])
-async def get_routers():
+@router.get("/config/cache", response_model=Dict[str, int])
+async def get_config_cache_stats():
+    return manager.cache_stats()
+
+
+@router.get("/config/writer", response_model=Dict[str, Any])
+async def get_config_writer_stats():
+    return {
+        "http": manager.writer_stats(),
+        "tcp_udp": tcp_udp_manager.writer_stats(),
+    }
+
+
+@router.get(
+    "/routers",
+    response_model=Union[Dict[str, TraefikRouter], TraefikListPage],
+    dependencies=[versioned_etag(manager.aio.config_version)],
+)
+async def get_routers(query: ListQuery = Depends()):
+    if query.paginated:
+        return await _list_page(("http", "routers"), query)
     try:
-        return manager.get_routers()
+        return await manager.aio.get_routers()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/routers/{name}", response_model=Dict[str, str])
+@router.post("/routers/{name}", response_model=Dict[str, Any])
 async def update_router(name: str, router_data: TraefikRouter):
+    check = _reference_check("http", [("routers", name, router_data)])
     try:
-        manager.update_router(name, router_data)
-        return {"msg": "Router updated"}
+        await manager.aio.update_router(name, router_data, check=check)
+        return _with_warnings({"msg": "Router updated"}, check.warnings)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.delete("/routers/{name}", response_model=Dict[str, str])
 async def delete_router(name: str):
-    if not manager.delete_router(name):
+    if not await manager.aio.delete_router(name):
         raise HTTPException(status_code=404, detail="Router not found")
     return {"msg": "Router deleted"}
 
 
 # ---------------- HTTP Services ----------------
-@router.get("/services", response_model=Dict[str, TraefikService])
-async def get_services():
+@router.get(
+    "/services",
+    response_model=Union[Dict[str, TraefikService], TraefikListPage],
+    dependencies=[versioned_etag(manager.aio.config_version)],
+)
+async def get_services(query: ListQuery = Depends()):
+    if query.paginated:
+        return await _list_page(("http", "services"), query)
     try:
-        return manager.get_services()
+        return await manager.aio.get_services()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -75,49 +397,102 @@ async def get_services():
 @router.post("/services/{name}", response_model=Dict[str, str])
 async def update_service(name: str, service_data: TraefikService):
     try:
-        manager.update_service(name, service_data)
+        await manager.aio.update_service(name, service_data)
         return {"msg": "Service updated"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.delete("/services/{name}", response_model=Dict[str, str])
-async def delete_service(name: str):
-    if not manager.delete_service(name):
+@router.delete("/services/{name}", response_model=Dict[str, Any])
+async def delete_service(name: str, force: bool = False):
+    check = _reference_check("http", [("services", name, None)], force)
+    try:
+        deleted = await manager.aio.delete_service(name, check=check)
+    except ReferenceConflict as e:
+        raise _conflict(e)
+    if not deleted:
         raise HTTPException(status_code=404, detail="Service not found")
-    return {"msg": "Service deleted"}
+    return _with_warnings({"msg": "Service deleted"}, check.warnings)
 
 
 # ---------------- Middlewares ----------------
-@router.get("/middlewares", response_model=Dict[str, TraefikMiddleware])
-async def get_middlewares():
+@router.get(
+    "/middlewares",
+    response_model=Union[Dict[str, TraefikMiddleware], TraefikListPage],
+    dependencies=[versioned_etag(manager.aio.config_version)],
+)
+async def get_middlewares(query: ListQuery = Depends()):
+    if query.paginated:
+        return await _list_page(("http", "middlewares"), query)
     try:
-        return manager.get_middlewares()
+        return await manager.aio.get_middlewares()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/middlewares/{name}", response_model=Dict[str, str])
+@router.post("/middlewares/{name}", response_model=Dict[str, Any])
 async def update_middleware(name: str, middleware_data: TraefikMiddleware):
+    check = _reference_check("http", [("middlewares", name, middleware_data)])
     try:
-        manager.update_middleware(name, middleware_data)
-        return {"msg": "Middleware updated"}
+        await manager.aio.update_middleware(name, middleware_data, check=check)
+        return _with_warnings({"msg": "Middleware updated"}, check.warnings)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.delete("/middlewares/{name}", response_model=Dict[str, str])
-async def delete_middleware(name: str):
-    if not manager.delete_middleware(name):
+@router.delete("/middlewares/{name}", response_model=Dict[str, Any])
+async def delete_middleware(name: str, force: bool = False):
+    check = _reference_check("http", [("middlewares", name, None)], force)
+    try:
+        deleted = await manager.aio.delete_middleware(name, check=check)
+    except ReferenceConflict as e:
+        raise _conflict(e)
+    if not deleted:
         raise HTTPException(status_code=404, detail="Middleware not found")
-    return {"msg": "Middleware deleted"}
+    return _with_warnings({"msg": "Middleware deleted"}, check.warnings)
+
+
+# ---------------- Batch ----------------
+@router.post("/batch", response_model=Dict[str, Any])
+async def apply_batch(batch: TraefikBatchRequest, force: bool = False):
+    """Applies router/service/middleware upserts and deletes with one write."""
+    check = _reference_check("http", _batch_changes(batch), force)
+    try:
+        result = await manager.aio.apply_batch(batch.operations, check=check)
+        return _with_warnings({"msg": "Batch applied", **result}, check.warnings)
+    except ReferenceConflict as e:
+        raise _conflict(e)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# ---------------- Publishing ----------------
+@router.get("/publish", response_model=Dict[str, Any])
+async def get_publish_stats():
+    return publisher.stats()
+
+
+@router.post("/publish", response_model=Dict[str, Any])
+async def publish_now():
+    """Pushes staged config edits to Traefik's watched directory immediately."""
+    try:
+        result = await run_blocking(publisher.publish)
+        return {**result, "stats": publisher.stats()}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
 
 # ---------------- Certificate Resolvers ----------------
-@router.get("/certificates-resolvers", response_model=Dict[str, Any])
+@router.get(
+    "/certificates-resolvers",
+    response_model=Dict[str, Any],
+    dependencies=[versioned_etag(certificates_manager.aio.config_version)],
+)
 async def get_certificate_resolvers():
     try:
-        return certificates_manager.get_certificate_resolvers()
+        return await certificates_manager.aio.get_certificate_resolvers()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -125,7 +500,7 @@ async def get_certificate_resolvers():
 @router.post("/certificates-resolvers/{name}", response_model=Dict[str, str])
 async def update_certificate_resolver(name: str, resolver_data: TraefikCertResolver):
     try:
-        certificates_manager.update_certificate_resolver(
+        await certificates_manager.aio.update_certificate_resolver(
             name, resolver_data.model_dump(exclude_none=True)
         )
         return {"msg": "Certificate Resolver updated"}
@@ -135,7 +510,7 @@ async def update_certificate_resolver(name: str, resolver_data: TraefikCertResol
 
 @router.delete("/certificates-resolvers/{name}", response_model=Dict[str, str])
 async def delete_certificate_resolver(name: str):
-    if not certificates_manager.delete_certificate_resolver(name):
+    if not await certificates_manager.aio.delete_certificate_resolver(name):
         raise HTTPException(status_code=404, detail="Certificate Resolver not found")
     return {"msg": "Certificate Resolver deleted"}
 
@@ -144,7 +519,7 @@ async def delete_certificate_resolver(name: str):
 @router.get("/certificates/manual", response_model=List[Dict[str, Any]])
 async def list_manual_certificates():
     try:
-        return manual_certs_manager.special_list_certificates()
+        return await manual_certs_manager.aio.special_list_certificates()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -158,7 +533,7 @@ async def create_or_update_manual_certificate(
     name: str, payload: ManualCertificateCreate
 ):
     try:
-        manual_certs_manager.add_certificate(
+        await manual_certs_manager.aio.add_certificate(
             domain=name,
             cert_pem=payload.certificate_pem.encode(),
             key_pem=payload.private_key_pem.encode(),
@@ -171,7 +546,7 @@ async def create_or_update_manual_certificate(
 @router.delete("/certificates/manual/{name}", response_model=Dict[str, str])
 async def delete_manual_certificate(name: str):
     try:
-        manual_certs_manager.remove_certificate(name)
+        await manual_certs_manager.aio.remove_certificate(name)
         return {"msg": "Manual certificate deleted"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -180,7 +555,7 @@ async def delete_manual_certificate(name: str):
 @router.get("/certificates/manual/{name}/exists", response_model=Dict[str, Any])
 async def manual_certificate_exists(name: str):
     try:
-        certs = manual_certs_manager.list_certificates()
+        certs = await manual_certs_manager.aio.list_certificates()
         exists = any(c.domain == name for c in certs)  # use attribute access
         return {"name": name, "exists": exists}
     except Exception as e:
@@ -188,150 +563,288 @@ async def manual_certificate_exists(name: str):
 
 
 # ---------------- TCP/UDP Routers & Services ----------------
-def _wrap_tcp_udp_call(func, *args, **kwargs):
+async def _wrap_tcp_udp_call(func, *args, **kwargs):
     """Helper to wrap tcp/udp manager calls with error handling"""
     try:
-        return func(*args, **kwargs)
+        return await func(*args, **kwargs)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/tcp/routers", response_model=Dict[str, Any])
-async def get_tcp_routers():
-    return _wrap_tcp_udp_call(tcp_udp_manager.get_tcp_routers)
+async def _tcp_config_version():
+    return await tcp_udp_manager.aio.config_version("tcp")
 
 
-@router.post("/tcp/routers/{name}", response_model=Dict[str, str])
-async def update_tcp_router(name: str, router_data: Dict[str, Any]):
-    return _wrap_tcp_udp_call(tcp_udp_manager.update_tcp_router, name, router_data) or {
-        "msg": "TCP Router updated"
-    }
+async def _udp_config_version():
+    return await tcp_udp_manager.aio.config_version("udp")
+
+
+@router.get(
+    "/tcp/routers",
+    response_model=Union[Dict[str, TraefikTcpRouter], TraefikListPage],
+    dependencies=[versioned_etag(_tcp_config_version)],
+)
+async def get_tcp_routers(query: ListQuery = Depends()):
+    if query.paginated:
+        return await _list_page(("tcp", "routers"), query)
+    return await _wrap_tcp_udp_call(tcp_udp_manager.aio.get_tcp_routers)
+
+
+@router.post("/tcp/routers/{name}", response_model=Dict[str, Any])
+async def update_tcp_router(name: str, router_data: TraefikTcpRouter):
+    check = _reference_check("tcp", [("routers", name, router_data)])
+    return await _wrap_tcp_udp_call(
+        tcp_udp_manager.aio.update_tcp_router, name, router_data, check=check
+    ) or _with_warnings({"msg": "TCP Router updated"}, check.warnings)
 
 
 @router.delete("/tcp/routers/{name}", response_model=Dict[str, str])
 async def delete_tcp_router(name: str):
-    if not tcp_udp_manager.delete_tcp_router(name):
+    if not await tcp_udp_manager.aio.delete_tcp_router(name):
         raise HTTPException(status_code=404, detail="TCP Router not found")
     return {"msg": "TCP Router deleted"}
 
 
-@router.get("/tcp/services", response_model=Dict[str, Any])
-async def get_tcp_services():
-    return _wrap_tcp_udp_call(tcp_udp_manager.get_tcp_services)
+@router.get(
+    "/tcp/services",
+    response_model=Union[Dict[str, TraefikTcpService], TraefikListPage],
+    dependencies=[versioned_etag(_tcp_config_version)],
+)
+async def get_tcp_services(query: ListQuery = Depends()):
+    if query.paginated:
+        return await _list_page(("tcp", "services"), query)
+    return await _wrap_tcp_udp_call(tcp_udp_manager.aio.get_tcp_services)
 
 
 @router.post("/tcp/services/{name}", response_model=Dict[str, str])
-async def update_tcp_service(name: str, service_data: Dict[str, Any]):
-    return _wrap_tcp_udp_call(
-        tcp_udp_manager.update_tcp_service, name, service_data
+async def update_tcp_service(name: str, service_data: TraefikTcpService):
+    return await _wrap_tcp_udp_call(
+        tcp_udp_manager.aio.update_tcp_service, name, service_data
     ) or {"msg": "TCP Service updated"}
 
 
-@router.delete("/tcp/services/{name}", response_model=Dict[str, str])
-async def delete_tcp_service(name: str):
-    if not tcp_udp_manager.delete_tcp_service(name):
+@router.delete("/tcp/services/{name}", response_model=Dict[str, Any])
+async def delete_tcp_service(name: str, force: bool = False):
+    check = _reference_check("tcp", [("services", name, None)], force)
+    try:
+        deleted = await tcp_udp_manager.aio.delete_tcp_service(name, check=check)
+    except ReferenceConflict as e:
+        raise _conflict(e)
+    if not deleted:
         raise HTTPException(status_code=404, detail="TCP Service not found")
-    return {"msg": "TCP Service deleted"}
+    return _with_warnings({"msg": "TCP Service deleted"}, check.warnings)
 
 
-@router.get("/udp/routers", response_model=Dict[str, Any])
-async def get_udp_routers():
-    return _wrap_tcp_udp_call(tcp_udp_manager.get_udp_routers)
+@router.get(
+    "/udp/routers",
+    response_model=Union[Dict[str, TraefikUdpRouter], TraefikListPage],
+    dependencies=[versioned_etag(_udp_config_version)],
+)
+async def get_udp_routers(query: ListQuery = Depends()):
+    if query.paginated:
+        return await _list_page(("udp", "routers"), query)
+    return await _wrap_tcp_udp_call(tcp_udp_manager.aio.get_udp_routers)
 
 
-@router.post("/udp/routers/{name}", response_model=Dict[str, str])
-async def update_udp_router(name: str, router_data: Dict[str, Any]):
-    return _wrap_tcp_udp_call(tcp_udp_manager.update_udp_router, name, router_data) or {
-        "msg": "UDP Router updated"
-    }
+@router.post("/udp/routers/{name}", response_model=Dict[str, Any])
+async def update_udp_router(name: str, router_data: TraefikUdpRouter):
+    check = _reference_check("udp", [("routers", name, router_data)])
+    return await _wrap_tcp_udp_call(
+        tcp_udp_manager.aio.update_udp_router, name, router_data, check=check
+    ) or _with_warnings({"msg": "UDP Router updated"}, check.warnings)
 
 
 @router.delete("/udp/routers/{name}", response_model=Dict[str, str])
 async def delete_udp_router(name: str):
-    if not tcp_udp_manager.delete_udp_router(name):
+    if not await tcp_udp_manager.aio.delete_udp_router(name):
         raise HTTPException(status_code=404, detail="UDP Router not found")
     return {"msg": "UDP Router deleted"}
 
 
-@router.get("/udp/services", response_model=Dict[str, Any])
-async def get_udp_services():
-    return _wrap_tcp_udp_call(tcp_udp_manager.get_udp_services)
+@router.get(
+    "/udp/services",
+    response_model=Union[Dict[str, TraefikUdpService], TraefikListPage],
+    dependencies=[versioned_etag(_udp_config_version)],
+)
+async def get_udp_services(query: ListQuery = Depends()):
+    if query.paginated:
+        return await _list_page(("udp", "services"), query)
+    return await _wrap_tcp_udp_call(tcp_udp_manager.aio.get_udp_services)
 
 
 @router.post("/udp/services/{name}", response_model=Dict[str, str])
-async def update_udp_service(name: str, service_data: Dict[str, Any]):
-    return _wrap_tcp_udp_call(
-        tcp_udp_manager.update_udp_service, name, service_data
+async def update_udp_service(name: str, service_data: TraefikUdpService):
+    return await _wrap_tcp_udp_call(
+        tcp_udp_manager.aio.update_udp_service, name, service_data
     ) or {"msg": "UDP Service updated"}
 
 
-@router.delete("/udp/services/{name}", response_model=Dict[str, str])
-async def delete_udp_service(name: str):
-    if not tcp_udp_manager.delete_udp_service(name):
+@router.delete("/udp/services/{name}", response_model=Dict[str, Any])
+async def delete_udp_service(name: str, force: bool = False):
+    check = _reference_check("udp", [("services", name, None)], force)
+    try:
+        deleted = await tcp_udp_manager.aio.delete_udp_service(name, check=check)
+    except ReferenceConflict as e:
+        raise _conflict(e)
+    if not deleted:
         raise HTTPException(status_code=404, detail="UDP Service not found")
-    return {"msg": "UDP Service deleted"}
+    return _with_warnings({"msg": "UDP Service deleted"}, check.warnings)
 
 
-# ---------------- Traefik API Status (Proxy) ----------------
-@router.get("/status/healthy", response_model=Dict[str, Any])
-async def get_status():
+# ---------------- Dashboard ----------------
+@router.get("/dashboard", response_model=Dict[str, Any])
+async def get_dashboard():
+    """Health plus configured and live entry counts in one payload."""
+    async def live_counts():
+        snapshot = await snapshot_poller.get()
+        if snapshot is None:
+            return await asyncio.gather(
+                api_service.get_status(), api_service.get_counts()
+            )
+        return dict(snapshot.health), dict(snapshot.counts)
+
     try:
-        return await api_service.get_status()
+        (healthy, real), http_counts, tcp_udp_counts = await asyncio.gather(
+            live_counts(),
+            manager.aio.count_entries(),
+            tcp_udp_manager.aio.count_entries(),
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    return {
+        "healthy": healthy,
+        "config": {
+            "routers": http_counts["routers"],
+            "services": http_counts["services"],
+            "middlewares": http_counts["middlewares"],
+            "tcpRouters": tcp_udp_counts["tcp"]["routers"],
+            "tcpServices": tcp_udp_counts["tcp"]["services"],
+            "udpRouters": tcp_udp_counts["udp"]["routers"],
+            "udpServices": tcp_udp_counts["udp"]["services"],
+        },
+        "real": real,
+    }
 
-@router.get("/status/routers", response_model=List[Dict[str, Any]])
-async def get_routers_status():
+
+# ---------------- Live Events (SSE) ----------------
+@router.get("/events")
+async def stream_events():
+    """
+    Server-Sent Events: `status` diffs of the Traefik snapshot, `config`
+    changes of the local files, and `resync` when a client fell behind.
+    """
+    snapshot = snapshot_poller.snapshot
+    hello = {"version": snapshot.version if snapshot else None}
+    return StreamingResponse(
+        events.subscribe(hello),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/events/stats", response_model=Dict[str, Any])
+async def get_events_stats():
+    return events.stats()
+
+
+# ---------------- Drift ----------------
+@router.get("/drift", response_model=Dict[str, Any])
+async def get_drift():
+    """
+    Entries that differ between the config files and what Traefik loaded
+    from its file provider: missing, extra, erroring and disabled.
+    """
     try:
-        return await api_service.get_routers()
+        rawdata = await api_service.get_rawdata_summary()
+    except (httpx.HTTPError, ValueError) as e:
+        raise HTTPException(status_code=502, detail=str(e) or repr(e))
+    try:
+        report = await run_blocking(drift_detector.detect, rawdata)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return {**report, "stats": drift_detector.stats()}
 
 
-@router.get("/status/services", response_model=List[Dict[str, Any]])
-async def get_services_status():
+# ---------------- Traefik Fleet ----------------
+@router.get("/fleet/healthy", response_model=Dict[str, Any])
+async def get_fleet_status():
+    """Health of every Traefik replica, checked concurrently."""
+    return await fleet.get_status()
+
+
+@router.get("/fleet/{kind}", response_model=Dict[str, Any])
+async def get_fleet_list(kind: str):
+    """One status list from every replica, merged and tagged per instance."""
+    if kind not in LIVE_LISTS:
+        raise HTTPException(status_code=404, detail=f"Unknown list '{kind}'")
+    return await fleet.get_list(kind)
+
+
+# ---------------- Traefik API Status (Proxy) ----------------
+async def _serve_status(request: Request, kind: str, live):
+    """Serves a status kind from the poller's snapshot, or live if disabled."""
     try:
-        return await api_service.get_services()
+        snapshot = await snapshot_poller.get()
+        if snapshot is None:
+            return await live()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return snapshot_poller.response(
+        snapshot, kind, request.headers.get("if-none-match")
+    )
 
 
-@router.get("/status/middlewares", response_model=List[Dict[str, Any]])
-async def get_middlewares_status():
+@router.get("/status/snapshot", response_model=Dict[str, Any])
+async def get_status_snapshot_stats():
+    return snapshot_poller.stats()
+
+
+@router.get("/status/healthy", response_model=Dict[str, Any])
+async def get_status(request: Request):
+    return await _serve_status(request, HEALTH, api_service.get_status)
+
+
+@router.get("/status/rawdata", response_model=Dict[str, Any])
+async def get_rawdata_summary():
+    """Counts, per-entry status/errors and provider errors from /api/rawdata."""
     try:
-        return await api_service.get_middlewares()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        summary = await api_service.get_rawdata_summary()
+    except (httpx.HTTPError, ValueError) as e:
+        raise HTTPException(status_code=502, detail=str(e) or repr(e))
+    return summary.to_dict()
+
+
+@router.get("/status/routers", response_model=List[Dict[str, Any]])
+async def get_routers_status(request: Request):
+    return await _serve_status(request, "routers", api_service.get_routers)
+
+
+@router.get("/status/services", response_model=List[Dict[str, Any]])
+async def get_services_status(request: Request):
+    return await _serve_status(request, "services", api_service.get_services)
+
+
+@router.get("/status/middlewares", response_model=List[Dict[str, Any]])
+async def get_middlewares_status(request: Request):
+    return await _serve_status(request, "middlewares", api_service.get_middlewares)
 
 
 @router.get("/status/tcp/routers", response_model=List[Dict[str, Any]])
-async def get_tcp_routers_status():
-    try:
-        return await api_service.get_tcp_routers()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+async def get_tcp_routers_status(request: Request):
+    return await _serve_status(request, "tcpRouters", api_service.get_tcp_routers)
 
 
 @router.get("/status/tcp/services", response_model=List[Dict[str, Any]])
-async def get_tcp_services_status():
-    try:
-        return await api_service.get_tcp_services()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+async def get_tcp_services_status(request: Request):
+    return await _serve_status(request, "tcpServices", api_service.get_tcp_services)
 
 
 @router.get("/status/udp/routers", response_model=List[Dict[str, Any]])
-async def get_udp_routers_status():
-    try:
-        return await api_service.get_udp_routers()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+async def get_udp_routers_status(request: Request):
+    return await _serve_status(request, "udpRouters", api_service.get_udp_routers)
 
 
 @router.get("/status/udp/services", response_model=List[Dict[str, Any]])
-async def get_udp_services_status():
-    try:
-        return await api_service.get_udp_services()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+async def get_udp_services_status(request: Request):
+    return await _serve_status(request, "udpServices", api_service.get_udp_services)
@@ -0,0 +1,57 @@
+"""
+Reports shadowed, duplicate and ambiguous HTTP routers in the panel's config.
+
+Shadowed routers can never match: a router of higher priority matches every
+request they do. Duplicates have the same rule on the same entryPoints.
+Ambiguous routers share a priority and could match the same request, so
+which one wins is down to their names.
+
+    cd api && python -m scripts.analyze_routes [--json] [--strict]
+"""
+
+import argparse
+import json
+import sys
+
+from lib.traefik.http_manager import HttpManager
+from lib.traefik.route_analysis import analyze_routers
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--json", action="store_true", help="print the full report")
+    parser.add_argument(
+        "--strict", action="store_true", help="exit with status 1 on any finding"
+    )
+    args = parser.parse_args()
+
+    report = analyze_routers(HttpManager().get_routers())
+    findings = len(report["shadowed"]) + len(report["duplicates"])
+    findings += len(report["ambiguous"])
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(
+            f"{report['analyzed']}/{report['routers']} routers analyzed in "
+            f"{report['partitions']} host/entryPoint partitions "
+            f"({report['comparisons']} comparisons)"
+        )
+        for name, error in sorted(report["skipped"].items()):
+            print(f"skipped    {name}: {error}")
+        for item in report["shadowed"]:
+            print(
+                f"shadowed   {item['router']} ({item['priority']}) by "
+                f"{item['shadowed_by']} ({item['shadowed_by_priority']})"
+            )
+        for item in report["duplicates"]:
+            print(f"duplicate  {' = '.join(item['routers'])}: {item['rule']}")
+        for item in report["ambiguous"]:
+            print(f"ambiguous  {' ~ '.join(item['routers'])} ({item['priority']})")
+
+    if args.strict and findings:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark: summarizing a large Traefik /api/rawdata document.
+
+Generates a rawdata document with N routers (plus one service per router and
+a few middlewares), then builds the RawdataSummary (statuses, errors, counts,
+provider errors) two ways:
+
+- json: decode the whole body with json.loads, then walk it (what
+  `response.json()` followed by `summarize()` costs);
+- stream: feed the body in CHUNK-byte pieces through RawdataProjector
+  (needs ijson), as TraefikApiService does while the response streams in.
+
+Peak memory is the Python heap high-water mark reported by tracemalloc,
+taken in a second run so tracing does not skew the timings. The body itself
+is generated beforehand and is not counted. When fetched over HTTP the json
+path also holds the whole body, while the stream path only holds one chunk.
+
+    cd api && python -m scripts.bench_rawdata --routers 1000 10000 50000
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Tuple
+
+from lib.traefik import rawdata
+
+CHUNK = 64 * 1024
+
+
+def generate(routers: int) -> bytes:
+    data: Dict[str, Any] = {
+        "routers": {
+            f"router-{i}@file": {
+                "entryPoints": ["websecure"],
+                "middlewares": ["secure-headers@file"],
+                "service": f"service-{i}",
+                "rule": f"Host(`app-{i}.example.com`) && PathPrefix(`/api`)",
+                "priority": 48,
+                "tls": {"certResolver": "letsencrypt"},
+                "status": "disabled" if i % 100 == 0 else "enabled",
+                **({"error": [f"service-{i} not found"]} if i % 100 == 0 else {}),
+                "using": ["websecure"],
+            }
+            for i in range(routers)
+        },
+        "services": {
+            f"service-{i}@file": {
+                "loadBalancer": {
+                    "servers": [{"url": f"http://10.0.{i // 256}.{i % 256}:80"}],
+                    "passHostHeader": True,
+                },
+                "status": "enabled",
+                "usedBy": [f"router-{i}@file"],
+                "serverStatus": {f"http://10.0.{i // 256}.{i % 256}:80": "UP"},
+            }
+            for i in range(routers)
+        },
+        "middlewares": {
+            "secure-headers@file": {
+                "headers": {"stsSeconds": 31536000},
+                "status": "enabled",
+                "usedBy": [f"router-{i}@file" for i in range(routers)],
+            },
+        },
+    }
+    return json.dumps(data).encode()
+
+
+def parse_json(body: bytes) -> rawdata.RawdataSummary:
+    return rawdata.summarize(json.loads(body))
+
+
+def parse_stream(body: bytes) -> rawdata.RawdataSummary:
+    projector = rawdata.RawdataProjector()
+    view = memoryview(body)
+    for start in range(0, len(body), CHUNK):
+        projector.feed(bytes(view[start : start + CHUNK]))
+    return projector.close()
+
+
+def measure(func: Callable[[], Any]) -> Tuple[Any, float, float]:
+    """Returns (result, seconds, peak MiB) of `func`."""
+    gc.collect()
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / (1024 * 1024)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--routers", type=int, nargs="+", default=[1000, 10000, 50000]
+    )
+    args = parser.parse_args()
+
+    methods = [("json", parse_json)]
+    if rawdata.STREAMING:
+        methods.append(("stream", parse_stream))
+    else:
+        print("ijson is not installed: only the json method runs.")
+
+    header = f"{'routers':>8} {'method':>8} {'body MiB':>9} {'s':>8} {'peak MiB':>9}"
+    print(header)
+    print("-" * len(header))
+    for routers in args.routers:
+        body = generate(routers)
+        expected = None
+        for name, parse in methods:
+            summary, seconds, peak = measure(lambda: parse(body))
+            if expected is None:
+                expected = summary
+            assert summary == expected, f"{name} summary differs"
+            print(
+                f"{routers:>8} {name:>8} {len(body) / (1024 * 1024):>9.1f} "
+                f"{seconds:>8.2f} {peak:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark: Traefik API calls with a client per request vs the shared pool.
+
+Starts a stub Traefik API on localhost (uvicorn, plain HTTP), then issues
+concurrent `get_routers()` calls two ways: opening a new httpx.AsyncClient
+for every call (the old behaviour) and through TraefikApiService's shared,
+keep-alive client. Reports latency percentiles and throughput. Against a
+TLS endpoint the gap is larger, since every new connection also pays a
+handshake.
+
+    cd api && python -m scripts.bench_traefik_client --requests 2000 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import logging
+import socket
+import statistics
+import threading
+import time
+from typing import Awaitable, Callable, List, Tuple
+
+import httpx
+import uvicorn
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+from lib.traefik.traefik_api import TraefikApiService
+
+
+def stub_app(entries: int) -> Starlette:
+    routers = [
+        {
+            "name": f"router-{i}@file",
+            "rule": f"Host(`app-{i}.example.com`)",
+            "service": f"service-{i}",
+            "status": "enabled",
+        }
+        for i in range(entries)
+    ]
+
+    async def ping(request):
+        return PlainTextResponse("OK")
+
+    async def http_routers(request):
+        return JSONResponse(routers)
+
+    return Starlette(
+        routes=[Route("/ping", ping), Route("/api/http/routers", http_routers)]
+    )
+
+
+def start_stub(entries: int) -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    config = uvicorn.Config(
+        stub_app(entries), host="127.0.0.1", port=port, log_level="warning"
+    )
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+async def run(
+    call: Callable[[], Awaitable[List]], requests: int, concurrency: int
+) -> Tuple[float, float, float]:
+    """Returns (p50 ms, p99 ms, requests per second)."""
+    latencies: List[float] = []
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            await call()
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return statistics.median(ordered), p99, len(latencies) / elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--entries", type=int, default=50, help="routers returned")
+    args = parser.parse_args()
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    base_url = start_stub(args.entries)
+    print(
+        f"Stub Traefik API at {base_url}: {args.requests} requests, "
+        f"concurrency {args.concurrency}, {args.entries} routers per response"
+    )
+
+    async def per_request_client() -> List:
+        async with httpx.AsyncClient() as client:
+            response = await client.get(f"{base_url}/api/http/routers")
+            response.raise_for_status()
+            return response.json()
+
+    service = TraefikApiService()
+    service.base_url = base_url
+    await service.start()
+
+    for label, call in (
+        ("new client per request", per_request_client),
+        ("shared pooled client", service.get_routers),
+    ):
+        # Warm up, so the pooled client starts with open connections
+        await run(call, args.concurrency, args.concurrency)
+        p50, p99, rate = await run(call, args.requests, args.concurrency)
+        print(
+            f"  {label:<24} p50 {p50:7.2f} ms   p99 {p99:7.2f} ms   "
+            f"{rate:8.0f} req/s"
+        )
+
+    await service.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
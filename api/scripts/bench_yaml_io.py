@@ -0,0 +1,102 @@
+"""
+Benchmark: YAML load/dump of large HTTP configs, pure Python vs LibYAML.
+
+Generates configs with N routers (plus one service per router and a shared
+middleware), then times dumping and loading them with each backend
+available in lib.traefik.yaml_io. Peak memory is the Python heap high-water
+mark reported by tracemalloc, taken in a second run so tracing does not
+skew the timings.
+
+    cd api && python -m scripts.bench_yaml_io --routers 1000 10000 50000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+import yaml
+
+from lib.traefik import yaml_io
+
+BACKENDS: List[Tuple[str, Any, Any]] = [("python", yaml.SafeLoader, yaml.SafeDumper)]
+if yaml_io.LIBYAML:
+    BACKENDS.append(("libyaml", yaml.CSafeLoader, yaml.CSafeDumper))
+
+
+def generate(routers: int) -> Dict[str, Any]:
+    return {
+        "http": {
+            "routers": {
+                f"router-{i}": {
+                    "entryPoints": ["websecure"],
+                    "rule": f"Host(`app-{i}.example.com`) && PathPrefix(`/api`)",
+                    "service": f"service-{i}",
+                    "middlewares": ["secure-headers"],
+                    "tls": {"certResolver": "letsencrypt"},
+                }
+                for i in range(routers)
+            },
+            "services": {
+                f"service-{i}": {
+                    "loadBalancer": {
+                        "servers": [{"url": f"http://10.0.{i // 256}.{i % 256}:80"}]
+                    }
+                }
+                for i in range(routers)
+            },
+            "middlewares": {
+                "secure-headers": {"headers": {"stsSeconds": 31536000}},
+            },
+        }
+    }
+
+
+def measure(func: Callable[[], Any]) -> Tuple[Any, float, float]:
+    """Returns (result, seconds, peak MiB) of `func`."""
+    gc.collect()
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / (1024 * 1024)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--routers", type=int, nargs="+", default=[1000, 10000, 50000]
+    )
+    args = parser.parse_args()
+
+    if not yaml_io.LIBYAML:
+        print("PyYAML was built without libyaml: only the Python backend runs.")
+
+    header = (
+        f"{'routers':>8} {'backend':>8} {'size MiB':>9} "
+        f"{'dump s':>8} {'dump MiB':>9} {'load s':>8} {'load MiB':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+    for routers in args.routers:
+        data = generate(routers)
+        for name, loader, dumper in BACKENDS:
+            text, dump_s, dump_mib = measure(
+                lambda: yaml_io.dump(data, dumper=dumper)
+            )
+            loaded, load_s, load_mib = measure(lambda: yaml_io.load(text, loader))
+            assert loaded == data, f"{name} round trip changed the config"
+            print(
+                f"{routers:>8} {name:>8} {len(text) / (1024 * 1024):>9.1f} "
+                f"{dump_s:>8.2f} {dump_mib:>9.1f} {load_s:>8.2f} {load_mib:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Checks that TCP/UDP config keys the panel does not edit survive a write.
+
+Writes TCP and UDP files holding middlewares, weighted services,
+proxyProtocol, serversTransports and tls.domains to a throwaway config
+directory, reads them through TcpUdpManager, updates one router and one
+service per protocol, and compares every other key with the original.
+Exits with status 1 when anything was lost.
+
+    cd api && python -m scripts.check_tcp_udp_roundtrip
+"""
+
+import copy
+import os
+import sys
+import tempfile
+
+# Point the managers at a throwaway directory before they read settings
+os.environ["TRAEFIK_CONFIG_PATH"] = tempfile.mkdtemp(prefix="tcp-udp-roundtrip-")
+os.environ["TRAEFIK_CONFIG_LAYOUT"] = "monolithic"
+os.environ["TRAEFIK_PUBLISH_INTERVAL"] = "0"
+
+from core.models import TraefikTcpRouter, TraefikUdpService  # noqa: E402
+from lib.traefik import yaml_io  # noqa: E402
+from lib.traefik.tcp_udp_manager import TcpUdpManager  # noqa: E402
+
+EXISTING = {
+    "tcp": {
+        "routers": {
+            "db": {
+                "entryPoints": ["postgres"],
+                "rule": "HostSNI(`db.example.com`)",
+                "service": "db-weighted",
+                "middlewares": ["db-allowlist"],
+                "tls": {
+                    "passthrough": True,
+                    "domains": [{"main": "example.com", "sans": ["*.example.com"]}],
+                },
+            },
+        },
+        "services": {
+            "db-a": {
+                "loadBalancer": {
+                    "proxyProtocol": {"version": 2},
+                    "serversTransport": "db-transport",
+                    "servers": [{"address": "10.0.0.1:5432"}],
+                }
+            },
+            "db-weighted": {
+                "weighted": {"services": [{"name": "db-a", "weight": 3}]}
+            },
+        },
+        "middlewares": {
+            "db-allowlist": {"ipAllowList": {"sourceRange": ["10.0.0.0/8"]}}
+        },
+        "serversTransports": {"db-transport": {"dialTimeout": "5s"}},
+    },
+    "udp": {
+        "routers": {"dns": {"entryPoints": ["dns"], "service": "dns-weighted"}},
+        "services": {
+            "dns-a": {"loadBalancer": {"servers": [{"address": "10.0.0.2:53"}]}},
+            "dns-weighted": {
+                "weighted": {"services": [{"name": "dns-a", "weight": 1}]}
+            },
+        },
+    },
+}
+
+
+def main() -> None:
+    manager = TcpUdpManager()
+    for protocol, config_file in manager.config_files.items():
+        with open(config_file, "w") as f:
+            yaml_io.dump({protocol: EXISTING[protocol]}, f)
+
+    expected = copy.deepcopy(EXISTING)
+    # Reads must not fail on weighted services
+    manager.get_tcp_services()
+    manager.get_udp_services()
+
+    tcp_router = {"rule": "HostSNI(`*`)", "service": "db-a"}
+    manager.update_tcp_router("other", TraefikTcpRouter.model_validate(tcp_router))
+    expected["tcp"]["routers"]["other"] = tcp_router
+    udp_service = {"weighted": {"services": [{"name": "dns-a", "weight": 2}]}}
+    manager.update_udp_service("dns-b", TraefikUdpService.model_validate(udp_service))
+    expected["udp"]["services"]["dns-b"] = udp_service
+
+    failed = False
+    for protocol, config_file in manager.config_files.items():
+        with open(config_file, "r") as f:
+            written = (yaml_io.load(f) or {}).get(protocol)
+        if written == expected[protocol]:
+            print(f"{protocol}: ok")
+        else:
+            failed = True
+            print(f"{protocol}: keys lost or changed")
+            print(f"  expected: {expected[protocol]}")
+            print(f"  written:  {written}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Splits the monolithic dynamic config files into the sharded layout
+(one file per router/service/middleware under dynamic/<protocol>/<section>/).
+
+The original files are renamed to *.bak so Traefik stops loading them.
+When staging is enabled, the staged copies are split as well.
+Set TRAEFIK_CONFIG_LAYOUT=sharded once the migration is done.
+
+    cd api && python -m scripts.migrate_sharded_layout [--dry-run]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+from lib.traefik import yaml_io
+from lib.traefik.publisher import publisher
+from lib.traefik.sharded_store import ShardedConfigStore
+
+MONOLITHIC_FILES = [
+    "traefik-http-configs.yaml",
+    "traefik-tcp-configs.yaml",
+    "traefik-udp-configs.yaml",
+    # Shared TCP/UDP file from before the per-protocol split
+    "traefik-tcp-udp-configs.yaml",
+]
+
+
+def migrate_file(config_file: Path, dry_run: bool) -> int:
+    """
+    Splits one file. Every name is checked before anything is written, and
+    the shards are written to a staging directory next to dynamic/ that is
+    only moved in once all of them succeeded, so a failure leaves the
+    monolithic file as the only copy of its entries.
+    """
+    with open(config_file, "r") as f:
+        data = yaml_io.load(f) or {}
+
+    entries = []
+    for protocol, block in data.items():
+        store = ShardedConfigStore(config_file.parent, protocol)
+        for section, section_entries in (block or {}).items():
+            for name, entry in (section_entries or {}).items():
+                # Raises on names that cannot be a shard file
+                store.entry_path(section, name)
+                entries.append((protocol, section, name, entry))
+
+    for protocol, section, name, _ in entries:
+        print(f"  {protocol}/{section}/{name}")
+    if dry_run:
+        return len(entries)
+
+    staging = Path(tempfile.mkdtemp(dir=config_file.parent.parent, prefix=".shard-"))
+    try:
+        for protocol, section, name, entry in entries:
+            ShardedConfigStore(staging, protocol).write_entry(section, name, entry)
+        _move_shards(staging, config_file.parent)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    os.replace(config_file, config_file.with_name(config_file.name + ".bak"))
+    return len(entries)
+
+
+def _move_shards(staging: Path, dynamic_dir: Path) -> None:
+    """Moves staged <protocol>/ trees into dynamic/, whole when possible."""
+    for protocol in sorted(os.listdir(staging)):
+        target = dynamic_dir / protocol
+        if not target.exists():
+            os.rename(staging / protocol, target)
+            continue
+        for section in sorted(os.listdir(staging / protocol)):
+            (target / section).mkdir(parents=True, exist_ok=True)
+            for file_name in sorted(os.listdir(staging / protocol / section)):
+                os.replace(
+                    staging / protocol / section / file_name,
+                    target / section / file_name,
+                )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--dry-run", action="store_true", help="list entries without writing"
+    )
+    args = parser.parse_args()
+
+    dynamic_dirs = [publisher.live_dir]
+    if publisher.enabled:
+        dynamic_dirs.append(publisher.staging_dir)
+
+    failed = False
+    for dynamic_dir in dynamic_dirs:
+        for file_name in MONOLITHIC_FILES:
+            config_file = dynamic_dir / file_name
+            if not config_file.exists():
+                print(f"{config_file}: not found, skipping")
+                continue
+            print(f"{config_file}:")
+            try:
+                count = migrate_file(config_file, args.dry_run)
+            except ValueError as e:
+                print(f"{config_file}: {e}, left as is")
+                failed = True
+                continue
+            action = "found" if args.dry_run else "split"
+            print(f"{config_file}: {count} entries {action}")
+
+    if failed:
+        sys.exit(1)
+    if not args.dry_run:
+        print("Done. Set TRAEFIK_CONFIG_LAYOUT=sharded and restart the panel.")
+
+
+if __name__ == "__main__":
+    main()
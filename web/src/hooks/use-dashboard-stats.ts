@@ -1,12 +1,22 @@
+import useTraefikEvents from "@/hooks/use-traefik-events";
 import api from "@/lib/api";
-import { useEffect, useState } from "react";
+import { useCallback, useEffect, useState } from "react";
 import { toast } from "sonner";
 
 // Create types for better type safety
+export interface HealthProbe {
+  status: "ok" | "timeout" | "error" | "cancelled";
+  ms: number;
+  http_status?: number;
+  error?: string;
+}
+
 export interface HealthStatus {
   status: "RUNNING" | "DOWN" | "BROKEN" | "Checking";
   details: string;
   error: string;
+  // Per-probe outcome and timing (ping, rawdata, overview)
+  probes?: Record<string, HealthProbe>;
 }
 
 export interface ServiceCounts {
@@ -52,87 +62,37 @@ const useDashboardStats = () => {
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
 
-  useEffect(() => {
-    const fetchStats = async () => {
-      try {
-        setIsLoading(true);
-
-        // Group API endpoints logically
-        const endpoints = {
-          config: {
-            services: "/traefik/services",
-            routers: "/traefik/routers",
-            middlewares: "/traefik/middlewares",
-            tcpRouters: "/traefik/tcp/routers",
-            tcpServices: "/traefik/tcp/services",
-            udpRouters: "/traefik/udp/routers",
-            udpServices: "/traefik/udp/services",
-          },
-          status: {
-            healthy: "/traefik/status/healthy",
-            services: "/traefik/status/services",
-            routers: "/traefik/status/routers",
-            middlewares: "/traefik/status/middlewares",
-            tcpRouters: "/traefik/status/tcp/routers",
-            tcpServices: "/traefik/status/tcp/services",
-            udpRouters: "/traefik/status/udp/routers",
-            udpServices: "/traefik/status/udp/services",
-          },
-        };
-
-        // Create all promises at once
-        const promises = {
-          config: Object.values(endpoints.config).map((endpoint) =>
-            api.get(endpoint)
-          ),
-          status: Object.values(endpoints.status).map((endpoint) =>
-            api.get(endpoint)
-          ),
-        };
-
-        const [configResponses, statusResponses] = await Promise.all([
-          Promise.all(promises.config),
-          Promise.all(promises.status),
-        ]);
-
-        setStats({
-          healthy: statusResponses[0].data,
-          config: {
-            services: Object.keys(configResponses[0].data).length,
-            routers: Object.keys(configResponses[1].data).length,
-            middlewares: Object.keys(configResponses[2].data).length,
-            tcpRouters: Object.keys(configResponses[3].data).length,
-            tcpServices: Object.keys(configResponses[4].data).length,
-            udpRouters: Object.keys(configResponses[5].data).length,
-            udpServices: Object.keys(configResponses[6].data).length,
-          },
-          real: {
-            services: Object.keys(statusResponses[1].data).length,
-            routers: Object.keys(statusResponses[2].data).length,
-            middlewares: Object.keys(statusResponses[3].data).length,
-            tcpRouters: Object.keys(statusResponses[4].data).length,
-            tcpServices: Object.keys(statusResponses[5].data).length,
-            udpRouters: Object.keys(statusResponses[6].data).length,
-            udpServices: Object.keys(statusResponses[7].data).length,
-          },
-        });
+  const fetchStats = useCallback(async (silent = false) => {
+    try {
+      if (!silent) setIsLoading(true);
+
+      // Health, config counts and live counts are computed server-side
+      const response = await api.get<DashboardStats>("/traefik/dashboard");
+      setStats(response.data);
+
+      setError(null);
+    } catch (error) {
+      setError("Failed to fetch dashboard statistics");
+      toast.error("Error fetching dashboard stats");
+    } finally {
+      setIsLoading(false);
+    }
+  }, []);
 
-        setError(null);
-      } catch (error) {
-        setError("Failed to fetch dashboard statistics");
-        toast.error("Error fetching dashboard stats");
-      } finally {
-        setIsLoading(false);
-      }
-    };
+  // Refresh as soon as the server reports a status or config change
+  const { connected } = useTraefikEvents(() => fetchStats(true));
 
+  useEffect(() => {
     fetchStats();
+  }, [fetchStats]);
 
-    // Optional: Add polling/auto-refresh
-    const intervalId = setInterval(fetchStats, 30000); // Refresh every 30 seconds
+  useEffect(() => {
+    // Fall back to polling only while the event stream is down
+    if (connected) return;
+    const intervalId = setInterval(() => fetchStats(true), 30000); // Refresh every 30 seconds
 
     return () => clearInterval(intervalId);
-  }, []);
+  }, [connected, fetchStats]);
 
   return { stats, isLoading, error };
 };
@@ -0,0 +1,82 @@
+import { useEffect, useRef, useState } from "react";
+
+export interface TraefikEvent {
+  event: "ready" | "status" | "config" | "resync";
+  data: Record<string, unknown>;
+}
+
+const API_URL = import.meta.env.VITE_API_URL || "/api";
+const RECONNECT_DELAY = 5000;
+
+// Splits an SSE stream into events (comment/keepalive lines are skipped)
+const parseEvent = (block: string): TraefikEvent | null => {
+  let event = "message";
+  let data = "";
+  for (const line of block.split("\n")) {
+    if (line.startsWith("event:")) event = line.slice(6).trim();
+    else if (line.startsWith("data:")) data += line.slice(5).trim();
+  }
+  if (!data) return null;
+  try {
+    return { event, data: JSON.parse(data) } as TraefikEvent;
+  } catch {
+    return null;
+  }
+};
+
+// Subscribes to GET /traefik/events. EventSource cannot send the bearer
+// token, so the stream is read with fetch and reconnects when it drops.
+const useTraefikEvents = (onEvent: (event: TraefikEvent) => void) => {
+  const [connected, setConnected] = useState(false);
+  const handler = useRef(onEvent);
+  handler.current = onEvent;
+
+  useEffect(() => {
+    const controller = new AbortController();
+    let retry: ReturnType<typeof setTimeout> | undefined;
+
+    const connect = async () => {
+      try {
+        const token = localStorage.getItem("access_token");
+        const response = await fetch(`${API_URL}/traefik/events`, {
+          headers: token ? { Authorization: `Bearer ${token}` } : {},
+          signal: controller.signal,
+        });
+        if (!response.ok || !response.body) throw new Error("stream failed");
+
+        setConnected(true);
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = "";
+        for (;;) {
+          const { value, done } = await reader.read();
+          if (done) break;
+          buffer += decoder.decode(value, { stream: true });
+          let end;
+          while ((end = buffer.indexOf("\n\n")) !== -1) {
+            const event = parseEvent(buffer.slice(0, end));
+            buffer = buffer.slice(end + 2);
+            if (event) handler.current(event);
+          }
+        }
+      } catch {
+        // Aborted on unmount, or the connection failed: retry below
+      }
+      setConnected(false);
+      if (!controller.signal.aborted) {
+        retry = setTimeout(connect, RECONNECT_DELAY);
+      }
+    };
+
+    connect();
+
+    return () => {
+      controller.abort();
+      clearTimeout(retry);
+    };
+  }, []);
+
+  return { connected };
+};
+
+export default useTraefikEvents;